@@ -1,136 +1,185 @@
 """Animation system for Launchpad MK2.
 
 This module contains all LED animation functions and related utilities.
+Animations are registered as lightweight descriptors and their modules are
+imported on first use (see registry.py).
 """
 
-from .basic import (
-    rainbow_wave,
-    matrix_rain,
-    pulse_rings,
-    random_sparkle,
-    color_wipe,
-    snake,
-    fireworks,
-    rain,
-    wave_collision
+from .protocol import (
+    Animation,
+    AnimationState,
+    LegacyAnimation,
+    as_animation,
+    run_animation,
 )
 
-from .genre_based import (
-    electronic_animation,
-    classical_animation,
-    rock_animation,
-    jazz_animation,
-    ambient_animation
-)
+from .frame_cache import FrameCache, cached_animation, frame_cache
 
-from .mood_based import (
-    synthwave_animation,
-    lofi_animation,
-    meditation_animation,
-    party_animation,
-    focus_animation
+from .registry import (
+    DETECT_PERIOD,
+    AnimationDescriptor,
+    AnimationRegistry,
 )
 
-from .visualizers import (
-    equalizer_animation,
-    equalizer_animation_microphone
-)
+# Built-in animations. target_fps: frame clock rate for animations with one
+# steady frame period (others follow their own delays; override per
+# animation with "animation_fps" in config/app_settings.json).
+# period=DETECT_PERIOD: deterministic loops the frame cache replays once
+# their cycle is found (render-style animations declare ``period`` themselves).
+BUILTIN_ANIMATIONS = (
+    AnimationDescriptor('rainbow', '.basic', 'rainbow_wave', target_fps=20),
+    AnimationDescriptor('matrix', '.basic', 'matrix_rain', target_fps=20),
+    AnimationDescriptor('pulse', '.basic', 'pulse_rings', target_fps=20),
+    AnimationDescriptor('sparkle', '.basic', 'random_sparkle', target_fps=20),
+    AnimationDescriptor('wipe', '.basic', 'color_wipe'),
+    AnimationDescriptor('snake', '.basic', 'snake'),
+    AnimationDescriptor('fireworks', '.basic', 'fireworks'),
+    AnimationDescriptor('rain', '.basic', 'rain', target_fps=20),
+    AnimationDescriptor('wave', '.basic', 'wave_collision', target_fps=20),
+    AnimationDescriptor('equalizer', '.visualizers', 'equalizer_animation'),
+    AnimationDescriptor('equalizer_microphone', '.visualizers', 'equalizer_animation_microphone', needs_audio=True),
 
-from .artistic import (
-    starfield_animation,
-    geometric_animation,
-    sunset_animation,
-    heartbeat_animation,
-    bloom_animation,
-    aurora_animation,
-    galaxy_animation,
-    neon_grid_animation,
-    lava_lamp_animation,
-    prism_animation
-)
+    # Genre-based animations
+    AnimationDescriptor('electronic', '.genre_based', 'electronic_animation'),
+    AnimationDescriptor('classical', '.genre_based', 'classical_animation'),
+    AnimationDescriptor('rock', '.genre_based', 'rock_animation'),
+    AnimationDescriptor('jazz', '.genre_based', 'jazz_animation'),
+    AnimationDescriptor('ambient', '.genre_based', 'ambient_animation'),
+
+    # Mood-based animations
+    AnimationDescriptor('synthwave', '.mood_based', 'synthwave_animation', target_fps=20),
+    AnimationDescriptor('lofi', '.mood_based', 'lofi_animation'),
+    AnimationDescriptor('meditation', '.mood_based', 'meditation_animation', target_fps=20),
+    AnimationDescriptor('party', '.mood_based', 'party_animation', target_fps=20),
+    AnimationDescriptor('focus', '.mood_based', 'focus_animation'),
+
+    # Artistic animations
+    AnimationDescriptor('starfield', '.artistic', 'starfield_animation'),
+    AnimationDescriptor('geometric', '.artistic', 'geometric_animation'),
+    AnimationDescriptor('sunset', '.artistic', 'sunset_animation'),
+    AnimationDescriptor('heartbeat', '.artistic', 'heartbeat_animation'),
+    AnimationDescriptor('bloom', '.artistic', 'bloom_animation'),
+    AnimationDescriptor('aurora', '.artistic', 'aurora_animation'),
+    AnimationDescriptor('galaxy', '.artistic', 'galaxy_animation'),
+    AnimationDescriptor('neon_grid', '.artistic', 'neon_grid_animation'),
+    AnimationDescriptor('lava_lamp', '.artistic', 'lava_lamp_animation'),
+    AnimationDescriptor('prism', '.artistic', 'prism_animation'),
 
-from .spectrum import (
-    spotify_spectrum_analyzer,
-    energy_bars,
-    tempo_pulse
+    # Extra pack
+    AnimationDescriptor('checker_pulse', '.extra', 'checker_pulse'),
+    AnimationDescriptor('spiral_trail', '.extra', 'spiral_trail', period=DETECT_PERIOD),
+    AnimationDescriptor('meteor_shower', '.extra', 'meteor_shower', target_fps=20),
+    AnimationDescriptor('plasma_field', '.extra', 'plasma_field'),
+    AnimationDescriptor('binary_cascade', '.extra', 'binary_cascade', target_fps=20),
+    AnimationDescriptor('orbital_dots', '.extra', 'orbital_dots', target_fps=20),
+    AnimationDescriptor('scan_sweep', '.extra', 'scan_sweep', target_fps=20, period=DETECT_PERIOD),
+    AnimationDescriptor('ember_rise', '.extra', 'ember_rise'),
+    AnimationDescriptor('ripple_pool', '.extra', 'ripple_pool', target_fps=20),
+    AnimationDescriptor('vortex_spin', '.extra', 'vortex_spin', target_fps=20),
+
+    # Audio-reactive animations (take audio_analyzer / spotify_manager; live
+    # microphone analysis or Spotify audio features)
+    AnimationDescriptor('spotify_spectrum', '.spectrum', 'spotify_spectrum_analyzer', needs_analyzer=True),
+    AnimationDescriptor('energy_bars', '.spectrum', 'energy_bars', needs_analyzer=True),
+    AnimationDescriptor('tempo_pulse', '.spectrum', 'tempo_pulse', needs_analyzer=True),
 )
 
-from .extra import (
-    checker_pulse,
-    spiral_trail,
-    meteor_shower,
-    plasma_field,
-    binary_cascade,
-    orbital_dots,
-    scan_sweep,
-    ember_rise,
-    ripple_pool,
-    vortex_spin,
+# Adaptive animations need continuous features, which Spotify often refuses
+# (403); they are registered only with the live microphone source (see
+# register_live_analysis_animations), so default Session-grid slots stay put.
+LIVE_ANALYSIS_ANIMATIONS = (
+    AnimationDescriptor('adaptive_rainbow', '.adaptive', 'adaptive_rainbow', needs_analyzer=True),
+    AnimationDescriptor('adaptive_pulse', '.adaptive', 'adaptive_pulse', needs_analyzer=True),
+    AnimationDescriptor('adaptive_sparkle', '.adaptive', 'adaptive_sparkle', needs_analyzer=True),
+    AnimationDescriptor('adaptive_matrix', '.adaptive', 'adaptive_matrix', needs_analyzer=True),
 )
 
-# Adaptive animations are disabled — Spotify audio-features often 403;
-# kept in adaptive.py but not registered for selection.
-
-# Animation registry - all available animations
-ANIMATIONS = {
-    'rainbow': rainbow_wave,
-    'matrix': matrix_rain,
-    'pulse': pulse_rings,
-    'sparkle': random_sparkle,
-    'wipe': color_wipe,
-    'snake': snake,
-    'fireworks': fireworks,
-    'rain': rain,
-    'wave': wave_collision,
-    'equalizer': equalizer_animation,
-    'equalizer_microphone': equalizer_animation_microphone,
+# Animation registry - all available animations (plus installed packs)
+ANIMATIONS = AnimationRegistry(BUILTIN_ANIMATIONS)
+
+
+def register_live_analysis_animations():
+    """Add the adaptive animations (call when the microphone analyzer is selected)."""
+    for descriptor in LIVE_ANALYSIS_ANIMATIONS:
+        ANIMATIONS.register(descriptor)
+
+# Module of each animation function, for ``from src.animations import rainbow_wave``
+_LAZY_EXPORTS = {
+    'rainbow_wave': '.basic',
+    'matrix_rain': '.basic',
+    'pulse_rings': '.basic',
+    'random_sparkle': '.basic',
+    'color_wipe': '.basic',
+    'snake': '.basic',
+    'fireworks': '.basic',
+    'rain': '.basic',
+    'wave_collision': '.basic',
+    'equalizer_animation': '.visualizers',
+    'equalizer_animation_microphone': '.visualizers',
+    'electronic_animation': '.genre_based',
+    'classical_animation': '.genre_based',
+    'rock_animation': '.genre_based',
+    'jazz_animation': '.genre_based',
+    'ambient_animation': '.genre_based',
+    'synthwave_animation': '.mood_based',
+    'lofi_animation': '.mood_based',
+    'meditation_animation': '.mood_based',
+    'party_animation': '.mood_based',
+    'focus_animation': '.mood_based',
+    'starfield_animation': '.artistic',
+    'geometric_animation': '.artistic',
+    'sunset_animation': '.artistic',
+    'heartbeat_animation': '.artistic',
+    'bloom_animation': '.artistic',
+    'aurora_animation': '.artistic',
+    'galaxy_animation': '.artistic',
+    'neon_grid_animation': '.artistic',
+    'lava_lamp_animation': '.artistic',
+    'prism_animation': '.artistic',
+    'checker_pulse': '.extra',
+    'spiral_trail': '.extra',
+    'meteor_shower': '.extra',
+    'plasma_field': '.extra',
+    'binary_cascade': '.extra',
+    'orbital_dots': '.extra',
+    'scan_sweep': '.extra',
+    'ember_rise': '.extra',
+    'ripple_pool': '.extra',
+    'vortex_spin': '.extra',
+    'spotify_spectrum_analyzer': '.spectrum',
+    'energy_bars': '.spectrum',
+    'tempo_pulse': '.spectrum',
+    'adaptive_rainbow': '.adaptive',
+    'adaptive_pulse': '.adaptive',
+    'adaptive_sparkle': '.adaptive',
+    'adaptive_matrix': '.adaptive',
+}
 
-    # Genre-based animations
-    'electronic': electronic_animation,
-    'classical': classical_animation,
-    'rock': rock_animation,
-    'jazz': jazz_animation,
-    'ambient': ambient_animation,
 
-    # Mood-based animations
-    'synthwave': synthwave_animation,
-    'lofi': lofi_animation,
-    'meditation': meditation_animation,
-    'party': party_animation,
-    'focus': focus_animation,
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
 
-    # Artistic animations
-    'starfield': starfield_animation,
-    'geometric': geometric_animation,
-    'sunset': sunset_animation,
-    'heartbeat': heartbeat_animation,
-    'bloom': bloom_animation,
-    'aurora': aurora_animation,
-    'galaxy': galaxy_animation,
-    'neon_grid': neon_grid_animation,
-    'lava_lamp': lava_lamp_animation,
-    'prism': prism_animation,
+    return getattr(importlib.import_module(module, __name__), name)
 
-    # Extra pack
-    'checker_pulse': checker_pulse,
-    'spiral_trail': spiral_trail,
-    'meteor_shower': meteor_shower,
-    'plasma_field': plasma_field,
-    'binary_cascade': binary_cascade,
-    'orbital_dots': orbital_dots,
-    'scan_sweep': scan_sweep,
-    'ember_rise': ember_rise,
-    'ripple_pool': ripple_pool,
-    'vortex_spin': vortex_spin,
-
-    # Spotify-powered spectrum animations
-    'spotify_spectrum': spotify_spectrum_analyzer,
-    'energy_bars': energy_bars,
-    'tempo_pulse': tempo_pulse,
-}
 
 __all__ = [
     'ANIMATIONS',
+    'BUILTIN_ANIMATIONS',
+    'LIVE_ANALYSIS_ANIMATIONS',
+    'DETECT_PERIOD',
+    'AnimationDescriptor',
+    'AnimationRegistry',
+    'Animation',
+    'AnimationState',
+    'LegacyAnimation',
+    'as_animation',
+    'run_animation',
+    'FrameCache',
+    'cached_animation',
+    'frame_cache',
     'rainbow_wave',
     'matrix_rain',
     'pulse_rings',
@@ -162,7 +211,6 @@ __all__ = [
     'neon_grid_animation',
     'lava_lamp_animation',
     'prism_animation',
-    'checker_pulse',
     'spiral_trail',
     'meteor_shower',
     'plasma_field',
@@ -175,4 +223,9 @@ __all__ = [
     'spotify_spectrum_analyzer',
     'energy_bars',
     'tempo_pulse',
+    'adaptive_rainbow',
+    'adaptive_pulse',
+    'adaptive_sparkle',
+    'adaptive_matrix',
+    'register_live_analysis_animations',
 ]
@@ -1,19 +1,36 @@
-"""Adaptive animations that respond to Spotify audio features."""
+"""Adaptive animations that respond to audio features (live or Spotify)."""
 
 import time
 import math
-import colorsys
 import random
 
+import numpy as np
+
+from ..hardware.frame_encoder import send_frame
+from ..hardware.launchpad import present_frame
+from .kernels import distance_from, hsv_to_rgb, tint, to_frame
+
+
+def _run_fallback(name, midi_out, should_run, current_animation):
+    """Run the plain animation ``name`` for as long as the adaptive one is selected."""
+    from . import ANIMATIONS
+
+    adaptive_name = current_animation()
+    return ANIMATIONS[name](
+        midi_out,
+        should_run,
+        lambda: name if current_animation() == adaptive_name else None,
+    )
+
 
 def adaptive_rainbow(midi_out, should_run, current_animation, audio_analyzer=None):
     """Rainbow animation that adapts to tempo and energy."""
     if not audio_analyzer:
         # Fallback to regular rainbow
-        from .basic import rainbow_wave
-        return rainbow_wave(midi_out, should_run, current_animation)
+        return _run_fallback('rainbow', midi_out, should_run, current_animation)
 
     offset = 0
+    ring = distance_from(3.5, 3.5) * 10
     while should_run() and current_animation() == 'adaptive_rainbow':
         try:
             params = audio_analyzer.get_animation_parameters()
@@ -24,96 +41,66 @@ def adaptive_rainbow(midi_out, should_run, current_animation, audio_analyzer=Non
             # Adjust animation speed based on tempo
             increment = max(1, int(speed * 2))
 
-            for y in range(9):
-                for x in range(9):
-                    center_x, center_y = 3.5, 3.5
-                    distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-
-                    # Apply color shift based on valence
-                    hue = ((offset + distance * 10) % 100 / 100.0 + color_shift * 0.3) % 1.0
-                    saturation = 0.8 + intensity * 0.2
-                    value = 0.7 + intensity * 0.3
-
-                    r, g, b = [int(c * 255) for c in colorsys.hsv_to_rgb(hue, saturation, value)]
-                    from ..hardware.launchpad import set_color
-                    set_color(midi_out, x, y, r, g, b)
+            # Apply color shift based on valence
+            hue = ((offset + ring) % 100 / 100.0 + color_shift * 0.3) % 1.0
+            saturation = 0.8 + intensity * 0.2
+            value = 0.7 + intensity * 0.3
+            send_frame(midi_out, to_frame(hsv_to_rgb(hue, saturation, value)))
 
             offset += increment
-            time.sleep(max(0.02, 0.1 / speed))  # Faster updates for higher tempo
+            present_frame(midi_out, max(0.02, 0.1 / speed))  # Faster updates for higher tempo
 
         except Exception as e:
             print(f"Adaptive rainbow error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def adaptive_pulse(midi_out, should_run, current_animation, audio_analyzer=None):
     """Pulse animation synchronized to beat."""
     if not audio_analyzer:
-        from .basic import pulse_rings
-        return pulse_rings(midi_out, should_run, current_animation)
+        return _run_fallback('pulse', midi_out, should_run, current_animation)
 
     phase = 0
     while should_run() and current_animation() == 'adaptive_pulse':
         try:
-            tempo = audio_analyzer.get_tempo()
             energy = audio_analyzer.get_energy_level()
             valence = audio_analyzer.get_valence()
             danceability = audio_analyzer.get_danceability()
 
             # Calculate beat-synchronized pulse
-            beat_duration = 60.0 / tempo
-            beat_phase = (time.time() % beat_duration) / beat_duration
-            pulse = (math.sin(beat_phase * 2 * math.pi) + 1) / 2
+            beat_phase = audio_analyzer.get_beat_phase()
+            pulse = (math.cos(beat_phase * 2 * math.pi) + 1) / 2  # Peaks on the beat
 
             # Energy affects pulse intensity and size
             max_radius = 6 + energy * 2
             pulse_intensity = energy * pulse
 
-            from ..hardware.launchpad import clear_all, set_color
-            clear_all(midi_out)
+            # Distance-based intensity (pads beyond max_radius stay dark)
+            intensity = np.maximum(0.0, 1.0 - distance_from(4, 4) / max_radius) * pulse_intensity
 
-            center_x, center_y = 4, 4
-
-            for y in range(9):
-                for x in range(9):
-                    dx = x - center_x
-                    dy = y - center_y
-                    distance = math.sqrt(dx*dx + dy*dy)
-
-                    if distance <= max_radius:
-                        # Distance-based intensity
-                        intensity = max(0, 1.0 - (distance / max_radius)) * pulse_intensity
-
-                        # Color based on valence
-                        if valence > 0.6:  # Happy - warm colors
-                            r = int(255 * intensity)
-                            g = int((100 + valence * 155) * intensity)
-                            b = int(50 * intensity)
-                        elif valence < 0.4:  # Sad - cool colors
-                            r = int(50 * intensity)
-                            g = int(100 * intensity)
-                            b = int(255 * intensity)
-                        else:  # Neutral - purple/pink
-                            r = int(200 * intensity)
-                            g = int(100 * intensity)
-                            b = int(200 * intensity)
+            # Color based on valence
+            if valence > 0.6:  # Happy - warm colors
+                color = (255, 100 + valence * 155, 50)
+            elif valence < 0.4:  # Sad - cool colors
+                color = (50, 100, 255)
+            else:  # Neutral - purple/pink
+                color = (200, 100, 200)
 
-                        set_color(midi_out, x, y, r, g, b)
+            send_frame(midi_out, tint(color, intensity))
 
             # Danceability affects update rate
             sleep_time = max(0.02, 0.1 / (1 + danceability))
-            time.sleep(sleep_time)
+            present_frame(midi_out, sleep_time)
 
         except Exception as e:
             print(f"Adaptive pulse error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def adaptive_sparkle(midi_out, should_run, current_animation, audio_analyzer=None):
     """Sparkle animation that responds to energy and danceability."""
     if not audio_analyzer:
-        from .basic import random_sparkle
-        return random_sparkle(midi_out, should_run, current_animation)
+        return _run_fallback('sparkle', midi_out, should_run, current_animation)
 
     sparkles = []
 
@@ -164,18 +151,17 @@ def adaptive_sparkle(midi_out, should_run, current_animation, audio_analyzer=Non
 
             # Update rate based on tempo
             sleep_time = max(0.02, 0.08 - (tempo - 60) / 180 * 0.03)
-            time.sleep(sleep_time)
+            present_frame(midi_out, sleep_time)
 
         except Exception as e:
             print(f"Adaptive sparkle error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def adaptive_matrix(midi_out, should_run, current_animation, audio_analyzer=None):
     """Matrix rain that responds to track characteristics."""
     if not audio_analyzer:
-        from .basic import matrix_rain
-        return matrix_rain(midi_out, should_run, current_animation)
+        return _run_fallback('matrix', midi_out, should_run, current_animation)
 
     drops = []
 
@@ -230,11 +216,11 @@ def adaptive_matrix(midi_out, should_run, current_animation, audio_analyzer=None
 
             # Update rate based on danceability
             sleep_time = max(0.03, 0.08 - danceability * 0.03)
-            time.sleep(sleep_time)
+            present_frame(midi_out, sleep_time)
 
         except Exception as e:
             print(f"Adaptive matrix error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def _get_valence_color(valence):
@@ -295,11 +281,11 @@ def auto_select_animation(midi_out, should_run, current_animation, audio_analyze
                     for y in range(height):
                         set_color(midi_out, x, y, 100, 150, 200)
 
-            time.sleep(1)  # Check every second
+            present_frame(midi_out, 1)  # Check every second
 
         except Exception as e:
             print(f"Auto select error: {e}")
-            time.sleep(1)
+            present_frame(midi_out, 1)
 
 
 
@@ -1,9 +1,10 @@
 """Artistic and creative animation patterns."""
 
-import time
 import math
 import random
 
+from ..hardware.launchpad import present_frame
+
 
 def starfield_animation(midi_out, should_run, current_animation):
     """Starfield effect with twinkling stars."""
@@ -23,7 +24,7 @@ def starfield_animation(midi_out, should_run, current_animation):
             from ..hardware.launchpad import set_color
             set_color(midi_out, x, y, *color)
 
-        time.sleep(0.15)
+        present_frame(midi_out, 0.15)
 
         # Dim some random stars
         for _ in range(random.randint(2, 4)):
@@ -48,7 +49,7 @@ def geometric_animation(midi_out, should_run, current_animation):
             # Left and right edges
             set_color(midi_out, 4-size//2, 4-size//2+i, 255, 0, 255)
             set_color(midi_out, 4+size//2-1, 4-size//2+i, 255, 0, 255)
-        time.sleep(0.15)  # Faster transition (was 0.3)
+        present_frame(midi_out, 0.15)  # Faster transition (was 0.3)
         clear_all(midi_out)
 
     # Draw diamond - faster transitions
@@ -59,7 +60,7 @@ def geometric_animation(midi_out, should_run, current_animation):
         set_color(midi_out, 4+size, 4, 0, 255, 255)
         set_color(midi_out, 4, 4+size, 0, 255, 255)
         set_color(midi_out, 4-size, 4, 0, 255, 255)
-        time.sleep(0.15)  # Faster transition (was 0.3)
+        present_frame(midi_out, 0.15)  # Faster transition (was 0.3)
         clear_all(midi_out)
 
     # Add rapid triangle rotation
@@ -74,7 +75,7 @@ def geometric_animation(midi_out, should_run, current_animation):
                 y = int(4 + r * math.sin(ang))
                 if 0 <= x < 8 and 0 <= y < 8:
                     set_color(midi_out, x, y, 255, 255, 0)
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
         clear_all(midi_out)
 
 
@@ -101,7 +102,7 @@ def sunset_animation(midi_out, should_run, current_animation):
             break
         for x in range(8):
             set_color(midi_out, x, y, *colors[7-y])
-    time.sleep(0.5)  # Shorter time (was 2.0)
+    present_frame(midi_out, 0.5)  # Shorter time (was 2.0)
 
     # Fade to night - fewer steps, faster transition
     for step in range(5):  # Fewer steps (was 10)
@@ -112,7 +113,7 @@ def sunset_animation(midi_out, should_run, current_animation):
                 r, g, b = colors[7-y]
                 factor = 1.0 - (step / 5.0)
                 set_color(midi_out, x, y, int(r*factor), int(g*factor), int(b*factor))
-        time.sleep(0.1)  # Faster transition (was 0.2)
+        present_frame(midi_out, 0.1)  # Faster transition (was 0.2)
 
     # Add rapid sunrise effect
     for step in range(5):
@@ -123,7 +124,7 @@ def sunset_animation(midi_out, should_run, current_animation):
                 r, g, b = colors[7-y]
                 factor = step / 5.0
                 set_color(midi_out, x, y, int(r*factor), int(g*factor), int(b*factor))
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
 
 
 def heartbeat_animation(midi_out, should_run, current_animation):
@@ -148,9 +149,9 @@ def heartbeat_animation(midi_out, should_run, current_animation):
             for x, y in heart_shape:
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, intensity, 0, 0)
-            time.sleep(0.03)
+            present_frame(midi_out, 0.03)
 
-        time.sleep(0.1)  # Short pause
+        present_frame(midi_out, 0.1)  # Short pause
 
         # Second pulse (weaker)
         for intensity in range(0, 180, 20):
@@ -159,7 +160,7 @@ def heartbeat_animation(midi_out, should_run, current_animation):
             for x, y in heart_shape:
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, intensity, 0, 0)
-            time.sleep(0.03)
+            present_frame(midi_out, 0.03)
 
         # Fade out slowly
         for intensity in range(180, 0, -10):
@@ -168,9 +169,9 @@ def heartbeat_animation(midi_out, should_run, current_animation):
             for x, y in heart_shape:
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, intensity, 0, 0)
-            time.sleep(0.05)
+            present_frame(midi_out, 0.05)
 
-        time.sleep(0.6)  # Pause between beats
+        present_frame(midi_out, 0.6)  # Pause between beats
 
 
 def bloom_animation(midi_out, should_run, current_animation):
@@ -202,7 +203,7 @@ def bloom_animation(midi_out, should_run, current_animation):
             break
         for dx, dy in petals[stage]:
             set_color(midi_out, 4+dx, 4+dy, *colors[stage])
-        time.sleep(0.2)  # Faster bloom (was 0.4)
+        present_frame(midi_out, 0.2)  # Faster bloom (was 0.4)
 
     # Add rapid pulse effect
     for _ in range(3):
@@ -216,7 +217,7 @@ def bloom_animation(midi_out, should_run, current_animation):
                 for dx, dy in petals[stage]:
                     r, g, b = colors[stage]
                     set_color(midi_out, 4+dx, 4+dy, int(r*intensity), int(g*intensity), int(b*intensity))
-            time.sleep(0.15)  # Faster transition (was 0.3)
+            present_frame(midi_out, 0.15)  # Faster transition (was 0.3)
 
 
 def aurora_animation(midi_out, should_run, current_animation):
@@ -248,7 +249,7 @@ def aurora_animation(midi_out, should_run, current_animation):
                 set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
         
         phase += 0.5
-        time.sleep(0.08)
+        present_frame(midi_out, 0.08)
 
 
 def galaxy_animation(midi_out, should_run, current_animation):
@@ -288,7 +289,7 @@ def galaxy_animation(midi_out, should_run, current_animation):
                     set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
         
         rotation += 0.1
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
 
 
 def neon_grid_animation(midi_out, should_run, current_animation):
@@ -332,7 +333,7 @@ def neon_grid_animation(midi_out, should_run, current_animation):
                     set_color(midi_out, x, y, r, g, b)
         
         phase += 0.15
-        time.sleep(0.08)
+        present_frame(midi_out, 0.08)
 
 
 def lava_lamp_animation(midi_out, should_run, current_animation):
@@ -397,7 +398,7 @@ def lava_lamp_animation(midi_out, should_run, current_animation):
                         set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
         
         frame += 1
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
 
 
 def prism_animation(midi_out, should_run, current_animation):
@@ -439,4 +440,4 @@ def prism_animation(midi_out, should_run, current_animation):
             set_color(midi_out, beam_x, y, r, g, b)
         
         phase += 0.2
-        time.sleep(0.08)
+        present_frame(midi_out, 0.08)
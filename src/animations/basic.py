@@ -1,26 +1,34 @@
 """Basic animation patterns."""
 
-import time
-import colorsys
 import math
 import random
 
+import numpy as np
 
-def rainbow_wave(midi_out, should_run, current_animation):
+from ..hardware.launchpad import present_frame
+from .kernels import distance_from, hsv_to_rgb, tint, to_frame
+from .protocol import Animation
+
+
+class RainbowWave(Animation):
     """Rainbow wave animation spreading from center."""
-    while should_run() and current_animation() == 'rainbow':
-        for offset in range(0, 100, 2):
-            if current_animation() != 'rainbow':
-                break
-            for y in range(9):
-                for x in range(9):
-                    center_x, center_y = 3.5, 3.5
-                    distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-                    hue = (offset + distance * 10) % 100 / 100.0
-                    r, g, b = [int(c * 255) for c in colorsys.hsv_to_rgb(hue, 1.0, 1.0)]
-                    from ..hardware.launchpad import set_color
-                    set_color(midi_out, x, y, r, g, b)
-            time.sleep(0.05)
+
+    name = 'rainbow'
+    target_fps = 20
+    # Hue offset (0-100) advanced per second: 2 per frame at 20 FPS
+    speed = 40.0
+    period = 100 / speed
+
+    def __init__(self):
+        self.ring = distance_from(3.5, 3.5) * 10
+
+    def render(self, t, dt, state):
+        offset = (t * self.speed) % 100
+        hue = (offset + self.ring) % 100 / 100.0
+        return to_frame(hsv_to_rgb(hue, 1.0, 1.0))
+
+
+rainbow_wave = RainbowWave()
 
 
 def matrix_rain(midi_out, should_run, current_animation):
@@ -56,50 +64,33 @@ def matrix_rain(midi_out, should_run, current_animation):
                     new_drops.append(drop)
 
         drops = new_drops
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
-def pulse_rings(midi_out, should_run, current_animation):
+class PulseRings(Animation):
     """Pulsing rings from center."""
-    center_x = 4
-    center_y = 4
+
+    name = 'pulse'
+    target_fps = 20
+    center = (4, 4)
     max_radius = 8
-    phase = 0
+    color = (255, 100, 200)
+    # Pulse phase advanced per second (one full pulse every ~3.1 s)
+    speed = 2.0
+    period = 2 * math.pi / speed
 
-    while should_run() and current_animation() == 'pulse':
-        # Clear grid
-        from ..hardware.launchpad import clear_all
-        clear_all(midi_out)
+    def __init__(self):
+        # Intensity falls off with distance from the center
+        self.falloff = np.maximum(0.0, 1.0 - distance_from(*self.center) / self.max_radius)
 
+    def render(self, t, dt, state):
         # Calculate pulse intensity (0 to 1)
-        pulse = (math.sin(phase / 10) + 1) / 2
-
-        # Draw concentric rings
-        for y in range(9):
-            for x in range(9):
-                # Calculate distance from center
-                dx = x - center_x
-                dy = y - center_y
-                distance = math.sqrt(dx*dx + dy*dy)
+        pulse = (math.sin(t * self.speed) + 1) / 2
+        # Draw concentric rings (whole frame replaces the previous one)
+        return tint(self.color, self.falloff * pulse)
 
-                # Calculate color intensity based on distance and pulse
-                intensity = 1.0 - (distance / max_radius)
-                if intensity < 0:
-                    intensity = 0
 
-                # Modulate intensity with pulse
-                intensity *= pulse
-
-                # Set color
-                r = int(255 * intensity)
-                g = int(100 * intensity)
-                b = int(200 * intensity)
-
-                from ..hardware.launchpad import set_color
-                set_color(midi_out, x, y, r, g, b)
-
-        phase += 1
-        time.sleep(0.05)
+pulse_rings = PulseRings()
 
 
 def random_sparkle(midi_out, should_run, current_animation):
@@ -144,7 +135,7 @@ def random_sparkle(midi_out, should_run, current_animation):
                     new_sparkles.append(sparkle)
 
         sparkles = new_sparkles
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def color_wipe(midi_out, should_run, current_animation):
@@ -166,8 +157,8 @@ def color_wipe(midi_out, should_run, current_animation):
                 for x in range(9):
                     from ..hardware.launchpad import set_color
                     set_color(midi_out, x, y, *color)
-                    time.sleep(0.02)
-        time.sleep(0.5)
+                    present_frame(midi_out, 0.02)
+        present_frame(midi_out, 0.5)
 
 
 def snake(midi_out, should_run, current_animation):
@@ -202,7 +193,7 @@ def snake(midi_out, should_run, current_animation):
         if random.random() < 0.1:  # 10% chance to change direction
             direction = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
 
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
 
 
 def fireworks(midi_out, should_run, current_animation):
@@ -241,8 +232,8 @@ def fireworks(midi_out, should_run, current_animation):
                             from ..hardware.launchpad import set_color
                             set_color(midi_out, x, y, r, g, b)
 
-            time.sleep(0.1)
-        time.sleep(0.2)
+            present_frame(midi_out, 0.1)
+        present_frame(midi_out, 0.2)
 
 
 def rain(midi_out, should_run, current_animation):
@@ -274,7 +265,7 @@ def rain(midi_out, should_run, current_animation):
                 new_drops.append(drop)
 
         drops = new_drops
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def wave_collision(midi_out, should_run, current_animation):
@@ -314,4 +305,4 @@ def wave_collision(midi_out, should_run, current_animation):
                 set_color(midi_out, x, y, r, g, b)
 
         phase += 1
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
@@ -5,7 +5,12 @@ import math
 import random
 import time
 
-from ..hardware.launchpad import clear_all, set_color
+import numpy as np
+
+from ..hardware.frame_encoder import new_frame, send_frame
+from ..hardware.launchpad import clear_all, present_frame, set_color
+from .kernels import XS, YS, angle_from, distance_from, hsv_to_rgb, to_frame
+from .protocol import Animation
 
 
 def checker_pulse(midi_out, should_run, current_animation):
@@ -24,7 +29,7 @@ def checker_pulse(midi_out, should_run, current_animation):
                     r, g, b = 10, int(180 * (1 - pulse * 0.4)), int(200 * (1 - pulse * 0.3))
                 set_color(midi_out, x, y, r, g, b)
         phase += 0.12
-        time.sleep(0.06)
+        present_frame(midi_out, 0.06)
 
 
 def spiral_trail(midi_out, should_run, current_animation):
@@ -61,7 +66,7 @@ def spiral_trail(midi_out, should_run, current_animation):
             r, g, b = colorsys.hsv_to_rgb(hue, 0.9, fade)
             set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
         head = (head + 1) % len(cells)
-        time.sleep(0.045)
+        present_frame(midi_out, 0.045)
 
 
 def meteor_shower(midi_out, should_run, current_animation):
@@ -92,27 +97,36 @@ def meteor_shower(midi_out, should_run, current_animation):
                         set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
                 alive.append(m)
         meteors = alive
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
-def plasma_field(midi_out, should_run, current_animation):
+class PlasmaField(Animation):
     """Classic plasma / lava-noise color field."""
+
     name = 'plasma_field'
-    t = 0.0
-    while should_run() and current_animation() == name:
-        for y in range(9):
-            for x in range(9):
-                v = (
-                    math.sin(x * 0.45 + t)
-                    + math.sin(y * 0.55 - t * 1.2)
-                    + math.sin((x + y) * 0.35 + t * 0.7)
-                    + math.sin(math.hypot(x - 4, y - 4) * 0.5 - t)
-                )
-                hue = (v + 4) / 8.0
-                r, g, b = colorsys.hsv_to_rgb(hue % 1.0, 0.85, 0.9)
-                set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
-        t += 0.18
-        time.sleep(0.055)
+    target_fps = 18
+    # Field phase advanced per second (0.18 per 55 ms frame)
+    speed = 0.18 / 0.055
+
+    def __init__(self):
+        self.xs = XS * 0.45
+        self.ys = YS * 0.55
+        self.diagonal = (XS + YS) * 0.35
+        self.radial = distance_from(4, 4) * 0.5
+
+    def render(self, t, dt, state):
+        phase = t * self.speed
+        v = (
+            np.sin(self.xs + phase)
+            + np.sin(self.ys - phase * 1.2)
+            + np.sin(self.diagonal + phase * 0.7)
+            + np.sin(self.radial - phase)
+        )
+        hue = (v + 4) / 8.0
+        return to_frame(hsv_to_rgb(hue % 1.0, 0.85, 0.9))
+
+
+plasma_field = PlasmaField()
 
 
 def binary_cascade(midi_out, should_run, current_animation):
@@ -133,7 +147,7 @@ def binary_cascade(midi_out, should_run, current_animation):
                     fade = 1.0 - trail * 0.22
                     r, g, b = colorsys.hsv_to_rgb(col['hue'], 0.95, fade)
                     set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def orbital_dots(midi_out, should_run, current_animation):
@@ -163,7 +177,7 @@ def orbital_dots(midi_out, should_run, current_animation):
                 if 0 <= x2 <= 8 and 0 <= y2 <= 8:
                     set_color(midi_out, x2, y2, int(r * 120), int(g * 120), int(b * 120))
         angle += 0.14
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def scan_sweep(midi_out, should_run, current_animation):
@@ -188,7 +202,7 @@ def scan_sweep(midi_out, should_run, current_animation):
         if pos >= 8 or pos <= 0:
             direction *= -1
             pos = max(0, min(8, pos))
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def ember_rise(midi_out, should_run, current_animation):
@@ -219,7 +233,7 @@ def ember_rise(midi_out, should_run, current_animation):
                     set_color(midi_out, x, y, int(255 * h), int(160 * h * h), int(20 * h))
                 alive.append(e)
         embers = alive
-        time.sleep(0.055)
+        present_frame(midi_out, 0.055)
 
 
 def ripple_pool(midi_out, should_run, current_animation):
@@ -234,39 +248,41 @@ def ripple_pool(midi_out, should_run, current_animation):
                 'r': 0.0,
                 'hue': random.uniform(0.45, 0.85),
             })
-        clear_all(midi_out)
+        frame = new_frame()
         alive = []
         for d in drops:
             d['r'] += 0.28
             if d['r'] < 10:
-                for y in range(9):
-                    for x in range(9):
-                        dist = math.hypot(x - d['x'], y - d['y'])
-                        band = abs(dist - d['r'])
-                        if band < 0.85:
-                            intensity = 1.0 - band / 0.85
-                            intensity *= max(0.0, 1.0 - d['r'] / 10)
-                            r, g, b = colorsys.hsv_to_rgb(d['hue'], 0.75, intensity)
-                            # Additive-ish: keep brighter of current write in this frame
-                            set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
+                band = np.abs(distance_from(d['x'], d['y']) - d['r'])
+                ring = band < 0.85
+                if ring.any():
+                    intensity = (1.0 - band[ring] / 0.85) * max(0.0, 1.0 - d['r'] / 10)
+                    # Later drops draw over earlier ones
+                    frame[ring] = to_frame(hsv_to_rgb(d['hue'], 0.75, intensity))
                 alive.append(d)
+        send_frame(midi_out, frame)
         drops = alive or [{'x': 4, 'y': 4, 'r': 0.0, 'hue': 0.55}]
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
-def vortex_spin(midi_out, should_run, current_animation):
+class VortexSpin(Animation):
     """Rotating color vortex around the center."""
+
     name = 'vortex_spin'
-    angle = 0.0
-    while should_run() and current_animation() == name:
-        for y in range(9):
-            for x in range(9):
-                dx, dy = x - 4, y - 4
-                dist = math.hypot(dx, dy) + 0.001
-                theta = math.atan2(dy, dx) + angle + dist * 0.55
-                hue = (theta / (2 * math.pi) + 1) % 1.0
-                value = max(0.15, 1.0 - dist / 6.5)
-                r, g, b = colorsys.hsv_to_rgb(hue, 0.95, value)
-                set_color(midi_out, x, y, int(r * 255), int(g * 255), int(b * 255))
-        angle += 0.16
-        time.sleep(0.05)
+    target_fps = 20
+    # Rotation in radians per second (0.16 per 50 ms frame)
+    speed = 3.2
+    period = 2 * math.pi / speed
+
+    def __init__(self):
+        dist = distance_from(4, 4) + 0.001
+        self.twist = angle_from(4, 4) + dist * 0.55
+        self.value = np.maximum(0.15, 1.0 - dist / 6.5)
+
+    def render(self, t, dt, state):
+        angle = t * self.speed
+        hue = ((self.twist + angle) / (2 * math.pi) + 1) % 1.0
+        return to_frame(hsv_to_rgb(hue, 0.95, self.value))
+
+
+vortex_spin = VortexSpin()
@@ -0,0 +1,279 @@
+"""Replay cache for periodic animations.
+
+A periodic animation shows the same cycle of frames forever, so after one
+cycle it can be replayed from memory instead of being rendered again.
+Cycles come from two places:
+
+  * declared: an Animation with a ``period`` (seconds) is rendered at
+    ``round(period * fps)`` evenly spaced times, so the loop is seamless
+  * detected: a deterministic loop-style animation (registered with
+    ``period=DETECT_PERIOD``) is
+    watched until its frames and delays repeat for a whole cycle
+
+Cycles are stored as packed 6-bit colors (uint32, 324 bytes per frame) in
+an LRU cache shared by all animations, bounded by a memory cap, so
+switching back to a recently shown animation costs nothing to render.
+"""
+
+import collections
+import math
+import threading
+
+import numpy as np
+
+from ..hardware.frame_encoder import pack_frame, quantize_frame
+from ..hardware.launchpad import PAD_COUNT
+from .protocol import Animation
+
+# Memory cap for all cached cycles together
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Give up looking for a cycle in a loop-style animation after this many frames
+MAX_DETECT_FRAMES = 1200
+# Shortest cycle accepted from detection (avoids mistaking a held frame for a loop)
+MIN_DETECT_PERIOD = 4
+
+
+class FrameCycle:
+    """One cycle of packed frames with the delay after each frame."""
+
+    def __init__(self, frames, delays):
+        """
+        Args:
+            frames: (n, 81) uint32 array of packed colors
+            delays: n frame delays in seconds
+        """
+        self.frames = frames
+        self.delays = list(delays)
+
+    def __len__(self):
+        return len(self.delays)
+
+    @property
+    def nbytes(self):
+        return self.frames.nbytes + 8 * len(self.delays)
+
+
+class FrameCache:
+    """LRU cache of FrameCycles with a memory cap."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._cycles = collections.OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cycle for ``key`` (marking it recently used) or None."""
+        with self._lock:
+            cycle = self._cycles.get(key)
+            if cycle is None:
+                self.misses += 1
+                return None
+            self._cycles.move_to_end(key)
+            self.hits += 1
+            return cycle
+
+    def put(self, key, cycle):
+        """Store a cycle, evicting the least recently used ones over the cap."""
+        if cycle.nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            previous = self._cycles.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._cycles[key] = cycle
+            self._bytes += cycle.nbytes
+            while self._bytes > self.max_bytes:
+                _key, evicted = self._cycles.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        """Drop every cached cycle."""
+        with self._lock:
+            self._cycles.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        """Cache occupancy and hit counters."""
+        with self._lock:
+            return {
+                'cycles': {str(key[0]): len(cycle) for key, cycle in self._cycles.items()},
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class CachedAnimation(Animation):
+    """Wraps an animation so its cycle is recorded once and then replayed."""
+
+    def __init__(self, animation, cache=None, detect=False, fps=None):
+        """
+        Args:
+            animation: Animation with a ``period``, or a deterministic one
+                to watch for a repeating cycle
+            cache: FrameCache to use (default: the shared frame_cache)
+            detect: Look for a cycle instead of using ``animation.period``
+            fps: Frame rate the cycle is rendered at (default: its target FPS)
+        """
+        self.animation = animation
+        self.name = animation.name
+        self.target_fps = fps or animation.target_fps
+        self.cache = cache if cache is not None else frame_cache
+        self.detect = detect
+        if detect:
+            self.frame_count = None
+            self.key = (self.name, 'detected')
+        else:
+            self.frame_count = max(1, round(animation.period * self.target_fps))
+            self.key = (self.name, self.frame_count)
+
+    def init(self, state):
+        state.cache_cycle = self.cache.get(self.key)
+        state.cache_position = 0
+        state.cache_delay = None
+        state.cache_live = state.cache_cycle is None
+        if state.cache_live:
+            if self.detect:
+                state.cache_recorder = _CycleDetector()
+            else:
+                state.cache_frames = np.empty((self.frame_count, PAD_COUNT), dtype=np.uint32)
+            self.animation.init(state)
+
+    def render(self, t, dt, state):
+        cycle = state.cache_cycle
+        if cycle is not None:
+            index = state.cache_position % len(cycle)
+            state.cache_position += 1
+            state.cache_delay = cycle.delays[index]
+            return cycle.frames[index].tolist()
+        if self.detect:
+            return self._render_detecting(t, dt, state)
+        return self._render_declared(state)
+
+    def _render_declared(self, state):
+        index = state.cache_position
+        step = self.animation.period / self.frame_count
+        frame = self.animation.render(index * step, step, state)
+        if frame is None:
+            return None
+        packed = _to_packed(frame)
+        state.cache_frames[index] = packed
+        state.cache_position += 1
+        state.cache_delay = step
+        if state.cache_position == self.frame_count:
+            cycle = FrameCycle(state.cache_frames, [step] * self.frame_count)
+            self._start_replay(state, cycle)
+        return packed.tolist()
+
+    def _render_detecting(self, t, dt, state):
+        frame = self.animation.render(t, dt, state)
+        if frame is None:
+            return None
+        delay = self.animation.frame_delay(state)
+        state.cache_delay = delay
+        recorder = state.cache_recorder
+        if recorder is not None:
+            cycle = recorder.add(_to_packed(frame), delay)
+            if cycle is not None:
+                # The next frame would start the cycle over
+                self._start_replay(state, cycle)
+            elif recorder.gave_up:
+                state.cache_recorder = None
+        return frame
+
+    def _start_replay(self, state, cycle):
+        self.cache.put(self.key, cycle)
+        state.cache_cycle = cycle
+        state.cache_position = 0
+        state.cache_recorder = None
+        state.cache_frames = None
+        if state.cache_live:
+            state.cache_live = False
+            # Nothing left to render live (stops a legacy helper thread)
+            self.animation.close(state)
+
+    def frame_delay(self, state):
+        if state.cache_delay is not None:
+            return state.cache_delay
+        return self.animation.frame_delay(state)
+
+    def close(self, state):
+        if getattr(state, 'cache_live', False):
+            state.cache_live = False
+            self.animation.close(state)
+
+
+class _CycleDetector:
+    """Finds the shortest cycle that repeats from the first frame on."""
+
+    def __init__(self):
+        self.frames = []
+        self.keys = []
+        self.period = None
+        self.gave_up = False
+
+    def add(self, packed, delay):
+        """Record a frame; returns the FrameCycle once a full repeat is seen."""
+        key = (packed.tobytes(), delay)
+        self.keys.append(key)
+        self.frames.append(packed)
+        index = len(self.keys) - 1
+        if self.period is not None:
+            if key != self.keys[index - self.period]:
+                # Candidate broken; shorter ones were already ruled out
+                self.period = self._find_period(index, self.period + 1)
+        elif index >= MIN_DETECT_PERIOD and key == self.keys[0]:
+            self.period = index
+
+        if self.period is not None and index + 1 == 2 * self.period:
+            return FrameCycle(np.array(self.frames[:self.period]), [k[1] for k in self.keys[:self.period]])
+        if index + 1 >= MAX_DETECT_FRAMES:
+            self.gave_up = True
+            self.frames = []
+            self.keys = []
+        return None
+
+    def _find_period(self, index, start):
+        # Smallest p >= start such that frames p..index repeat frames 0..index-p
+        keys = self.keys
+        for period in range(start, index + 1):
+            if keys[period:index + 1] == keys[:index + 1 - period]:
+                return period
+        return None
+
+
+def _to_packed(frame):
+    """Packed uint32 array for a rendered frame (RGB array or packed list)."""
+    if isinstance(frame, np.ndarray) and frame.ndim == 3:
+        return pack_frame(quantize_frame(frame, apply_locks=False))
+    return np.asarray(frame, dtype=np.uint32)
+
+
+def cached_animation(animation, detect=False, fps=None, cache=None):
+    """Wrap ``animation`` for replay if it is periodic, else return it as-is.
+
+    Args:
+        animation: Animation from as_animation()
+        detect: True for deterministic loop-style animations whose cycle
+            should be detected (descriptor period DETECT_PERIOD)
+        fps: Frame rate the engine paces it at
+        cache: FrameCache (default: the shared frame_cache)
+    """
+    period = getattr(animation, 'period', None)
+    if period and math.isfinite(period) and period > 0:
+        return CachedAnimation(animation, cache=cache, fps=fps)
+    if detect:
+        return CachedAnimation(animation, cache=cache, detect=True, fps=fps)
+    return animation
+
+
+# Global cache shared by all animations
+frame_cache = FrameCache()
@@ -5,6 +5,8 @@ import colorsys
 import math
 import random
 
+from ..hardware.launchpad import present_frame
+
 
 def electronic_animation(midi_out, should_run, current_animation):
     """Fast, geometric patterns for electronic music."""
@@ -37,7 +39,7 @@ def electronic_animation(midi_out, should_run, current_animation):
                         from ..hardware.launchpad import set_color
                         set_color(midi_out, grid_x, grid_y, r, g, b)
 
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def classical_animation(midi_out, should_run, current_animation):
@@ -53,7 +55,7 @@ def classical_animation(midi_out, should_run, current_animation):
                 b = int(wave * 255)  # Strong blue
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, r, g, b)
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def rock_animation(midi_out, should_run, current_animation):
@@ -87,16 +89,16 @@ def rock_animation(midi_out, should_run, current_animation):
                     b = min(255, intensity//6 + random.randint(-5, 5))
                     from ..hardware.launchpad import set_color
                     set_color(midi_out, x, y, r, g, b)
-                time.sleep(0.05)
+                present_frame(midi_out, 0.05)
 
             # Add random sparks
             for _ in range(3):
                 x, y = random.randint(0, 8), random.randint(0, 8)
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, 255, 200, 0)  # Bright flash
-                time.sleep(0.02)
+                present_frame(midi_out, 0.02)
 
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def jazz_animation(midi_out, should_run, current_animation):
@@ -132,7 +134,7 @@ def jazz_animation(midi_out, should_run, current_animation):
             points[i] = ((x + random.uniform(-0.2, 0.2)) % 9,
                         (y + random.uniform(-0.2, 0.2)) % 9)
 
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def ambient_animation(midi_out, should_run, current_animation):
@@ -146,4 +148,4 @@ def ambient_animation(midi_out, should_run, current_animation):
                 r, g, b = [int(c * 100) for c in colorsys.hsv_to_rgb(hue, 0.5, 0.8)]
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, r, g, b)
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
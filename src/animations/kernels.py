@@ -0,0 +1,74 @@
+"""Vectorized building blocks for whole-frame animations.
+
+Geometric animations used to recompute distances, angles and HSV colors
+per pixel in Python on every frame. The grids here are computed once;
+an animation combines them with a few NumPy expressions and hands the
+resulting (9, 9, 3) frame to send_frame().
+
+All grids are indexed ``[y, x]`` like frames (y = 0 is the bottom row).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+GRID_SIZE = 9
+
+# Pad coordinates: YS[y, x] == y, XS[y, x] == x
+YS, XS = np.mgrid[0:GRID_SIZE, 0:GRID_SIZE].astype(np.float64)
+YS.flags.writeable = False
+XS.flags.writeable = False
+
+
+@lru_cache(maxsize=None)
+def distance_from(cx, cy):
+    """Euclidean distance of every pad from (cx, cy); cached, read-only."""
+    grid = np.hypot(XS - cx, YS - cy)
+    grid.flags.writeable = False
+    return grid
+
+
+@lru_cache(maxsize=None)
+def angle_from(cx, cy):
+    """Angle (radians, atan2) of every pad around (cx, cy); cached, read-only."""
+    grid = np.arctan2(YS - cy, XS - cx)
+    grid.flags.writeable = False
+    return grid
+
+
+# Channel offsets for the closed-form HSV ramp (r, g, b)
+_HSV_OFFSETS = np.array([5.0, 3.0, 1.0])
+
+
+def hsv_to_rgb(h, s, v):
+    """Vectorized colorsys.hsv_to_rgb.
+
+    Uses the closed form ``v - v*s*clamp(min(k, 4-k), 0, 1)`` with
+    ``k = (n + 6h) mod 6`` per channel, which avoids per-sector selects.
+
+    Args:
+        h, s, v: Arrays or scalars in 0-1 (broadcast to a common shape)
+
+    Returns:
+        np.ndarray: RGB in 0-1 with a trailing axis of 3
+    """
+    h = np.asarray(h, dtype=np.float64)
+    s = np.asarray(s, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    k = (h[..., None] * 6.0 + _HSV_OFFSETS) % 6.0
+    ramp = np.clip(np.minimum(k, 4.0 - k), 0.0, 1.0)
+    return v[..., None] - (v * s)[..., None] * ramp
+
+
+def to_frame(rgb, scale=255):
+    """Scale 0-1 RGB to a uint8 frame, truncating like ``int(c * 255)``."""
+    return np.clip(rgb * scale, 0, 255).astype(np.uint8)
+
+
+def tint(color, intensity):
+    """Frame of one RGB color (0-255) scaled per pad by ``intensity`` (0-1).
+
+    Truncates like ``int(channel * intensity)``.
+    """
+    intensity = np.asarray(intensity, dtype=np.float64)
+    return np.clip(intensity[..., None] * np.asarray(color, dtype=np.float64), 0, 255).astype(np.uint8)
@@ -1,29 +1,41 @@
 """Mood-based animations for different emotional contexts."""
 
-import time
 import colorsys
 import math
 import random
+import time
+
+import numpy as np
 
+from ..hardware.launchpad import present_frame
+from .kernels import XS, YS
+from .protocol import Animation
 
-def synthwave_animation(midi_out, should_run, current_animation):
+
+class SynthwaveAnimation(Animation):
     """Retro synthwave style animation with sunset colors."""
-    while should_run() and current_animation() == 'synthwave':
-        phase = time.time() * 0.5
-        for y in range(9):
-            for x in range(9):
-                # Create sunset gradient (pink to purple to blue)
-                height_factor = y / 8.0
-                wave = math.sin(phase + x/3.0 + y/5.0) * 0.5 + 0.5
 
-                # Sunset colors
-                r = int((255 * (1 - height_factor) + 150 * height_factor) * wave)
-                g = int((100 * (1 - height_factor) + 50 * height_factor) * wave)
-                b = int((150 * (1 - height_factor) + 255 * height_factor) * wave)
+    name = 'synthwave'
+    target_fps = 20
+    # Wave phase advances 0.5 rad/s
+    period = 4 * math.pi
 
-                from ..hardware.launchpad import set_color
-                set_color(midi_out, x, y, r, g, b)
-        time.sleep(0.05)
+    def __init__(self):
+        # Sunset gradient per row (pink to purple to blue), shape (9, 9, 3)
+        height_factor = (YS / 8.0)[..., None]
+        self.sunset = (
+            np.array([255, 100, 150], dtype=np.float64) * (1 - height_factor)
+            + np.array([150, 50, 255], dtype=np.float64) * height_factor
+        )
+        self.ripple = XS / 3.0 + YS / 5.0
+
+    def render(self, t, dt, state):
+        phase = t * 0.5
+        wave = np.sin(phase + self.ripple) * 0.5 + 0.5
+        return (self.sunset * wave[..., None]).astype(np.uint8)
+
+
+synthwave_animation = SynthwaveAnimation()
 
 
 def lofi_animation(midi_out, should_run, current_animation):
@@ -68,7 +80,7 @@ def lofi_animation(midi_out, should_run, current_animation):
             points[i] = ((x + random.uniform(-0.1, 0.1)) % 9,
                         (y + random.uniform(-0.1, 0.1)) % 9)
 
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
 
 
 def meditation_animation(midi_out, should_run, current_animation):
@@ -95,7 +107,7 @@ def meditation_animation(midi_out, should_run, current_animation):
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, r, g, b)
 
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def party_animation(midi_out, should_run, current_animation):
@@ -130,7 +142,7 @@ def party_animation(midi_out, should_run, current_animation):
                 from ..hardware.launchpad import set_color
                 set_color(midi_out, x, y, r, g, b)
 
-        time.sleep(0.05)
+        present_frame(midi_out, 0.05)
 
 
 def focus_animation(midi_out, should_run, current_animation):
@@ -152,4 +164,4 @@ def focus_animation(midi_out, should_run, current_animation):
                 set_color(midi_out, x, y, r, g, b)
 
         phase += 0.1
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
@@ -0,0 +1,313 @@
+"""Render-function animation protocol.
+
+An Animation renders one frame at a time instead of running its own loop:
+
+    class Glow(Animation):
+        name = 'glow'
+        target_fps = 20
+
+        def init(self, state):
+            state.level = 0.0
+
+        def render(self, t, dt, state):
+            state.level = (math.sin(t) + 1) / 2
+            return tint((255, 120, 0), np.full((9, 9), state.level))
+
+``t`` is seconds since the run started on the engine's frame clock, ``dt``
+the time since the previous frame. Everything that changes between frames
+lives on ``state`` (an AnimationState), so the engine can pause, snapshot,
+pre-render or run an animation headless. A frame is either a (9, 9, 3)
+RGB array (see frame_encoder) or 81 packed colors (see pack_color);
+returning None ends the animation.
+
+Legacy loop-style functions (``func(midi_out, should_run, current_animation)``)
+run through LegacyAnimation, which steps them one present_frame() at a time.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from ..hardware.frame_encoder import send_frame, unpack_frame
+from ..hardware.launchpad import AnimationCancelled, LaunchpadFrameBuffer, present_frame
+
+# Frame period for animations that don't declare a target FPS
+DEFAULT_FRAME_DELAY = 0.05
+# How often a blocked legacy step re-checks whether the run should stop
+_LEGACY_POLL_INTERVAL = 0.05
+
+
+class AnimationState:
+    """Per-run context handed to init() and render().
+
+    The engine sets ``name``, ``audio_analyzer``, ``spotify_manager`` and
+    ``frame_index``; animations keep their own variables as extra attributes.
+    """
+
+    def __init__(self, name, audio_analyzer=None, spotify_manager=None, should_run=None):
+        self.name = name
+        self.audio_analyzer = audio_analyzer
+        self.spotify_manager = spotify_manager
+        self.frame_index = 0
+        self._should_run = should_run
+
+    def should_run(self):
+        """False once the engine wants this run to stop."""
+        return self._should_run is None or self._should_run()
+
+    def snapshot(self):
+        """Copy of the animation's own variables (engine fields excluded)."""
+        return {
+            key: (value.copy() if isinstance(value, (list, dict, set, np.ndarray)) else value)
+            for key, value in vars(self).items()
+            if key not in _ENGINE_FIELDS
+        }
+
+    def restore(self, snapshot):
+        """Put back variables saved with snapshot()."""
+        for key, value in snapshot.items():
+            setattr(self, key, value.copy() if isinstance(value, (list, dict, set, np.ndarray)) else value)
+
+
+_ENGINE_FIELDS = frozenset(vars(AnimationState('')).keys())
+
+
+class Animation:
+    """Base class for render-function animations.
+
+    Subclasses set ``name`` (the ANIMATIONS key) and ``target_fps`` and
+    implement render(); init() and close() are optional. Instances hold no
+    per-run data, so one instance can back any number of runs. An
+    animation whose frames repeat exactly every ``period`` seconds
+    (render(t) == render(t + period)) declares it so the engine can replay
+    one cached cycle instead of rendering (see frame_cache).
+    """
+
+    name = None
+    target_fps = 1.0 / DEFAULT_FRAME_DELAY
+    period = None
+
+    def init(self, state):
+        """Set up ``state`` before the first frame."""
+
+    def render(self, t, dt, state):
+        """Return the frame for time ``t`` (or None to stop).
+
+        Args:
+            t: Seconds since the run started (frame clock time)
+            dt: Seconds since the previous frame
+            state: AnimationState for this run
+
+        Returns:
+            np.ndarray | list | None: (9, 9, 3) RGB frame or 81 packed colors
+        """
+        raise NotImplementedError
+
+    def close(self, state):
+        """Release anything init() acquired."""
+
+    def frame_delay(self, state):
+        """Seconds until the next frame (passed to present_frame)."""
+        return 1.0 / self.target_fps if self.target_fps else DEFAULT_FRAME_DELAY
+
+    def __call__(self, midi_out, should_run, current_animation, audio_analyzer=None, spotify_manager=None):
+        """Run like a legacy loop-style animation (blocks until stopped)."""
+        state = AnimationState(
+            self.name,
+            audio_analyzer=audio_analyzer,
+            spotify_manager=spotify_manager,
+            should_run=lambda: should_run() and current_animation() == self.name,
+        )
+        try:
+            run_animation(self, midi_out, state)
+        except AnimationCancelled:
+            pass
+
+
+class LegacyAnimation(Animation):
+    """Adapter stepping a loop-style animation function one frame at a time.
+
+    The function runs on a helper thread against a capturing frame buffer;
+    each present_frame() it makes hands the drawn frame to render() and
+    blocks until the engine asks for the next one. Its requested delay
+    becomes frame_delay(), so pacing stays with the engine's frame clock.
+    """
+
+    def __init__(self, name, func, descriptor=None):
+        """
+        Args:
+            name: Animation name
+            func: Loop-style function
+            descriptor: AnimationDescriptor; decides which keyword arguments
+                (audio_analyzer, spotify_manager) the function gets
+        """
+        self.name = name
+        self.func = func
+        self.descriptor = descriptor
+        self.target_fps = None
+
+    def init(self, state):
+        kwargs = {}
+        if self.descriptor is not None:
+            kwargs = self.descriptor.call_kwargs(state.audio_analyzer, state.spotify_manager)
+        run = _LegacyRun(self.name, self.func, state, kwargs)
+        state.legacy_run = run
+        run.start()
+
+    def render(self, t, dt, state):
+        return state.legacy_run.step(state)
+
+    def frame_delay(self, state):
+        return state.legacy_run.delay
+
+    def close(self, state):
+        run = getattr(state, 'legacy_run', None)
+        if run is not None:
+            run.stop()
+
+
+class _CaptureFrameBuffer(LaunchpadFrameBuffer):
+    """Frame buffer whose commits and waits feed a _LegacyRun."""
+
+    def __init__(self, run):
+        super().__init__(None, sink=run._capture)
+        self._run = run
+
+    def wait(self, delay):
+        self._run._handoff(delay)
+
+
+class _LegacyRun:
+    """One run of a legacy animation function on its own thread."""
+
+    def __init__(self, name, func, state, kwargs=None):
+        self.name = name
+        self.func = func
+        self.kwargs = kwargs or {}
+        self.delay = DEFAULT_FRAME_DELAY
+        self._state = state
+        self._frame_buffer = _CaptureFrameBuffer(self)
+        self._frame_buffer.cancel_event = threading.Event()
+        self._pending = None
+        self._frame = None
+        self._produced = threading.Semaphore(0)
+        self._resume = threading.Semaphore(0)
+        self._stepped = False
+        self._done = False
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f'animation-{self.name}', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=0.5):
+        # Normally the thread is parked in _handoff() and exits at once; one
+        # stuck in a slow call is a daemon and exits when it returns
+        self._frame_buffer.cancel_event.set()
+        self._resume.release()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def step(self, state):
+        """Let the function draw its next frame and return it (None when done)."""
+        if self._stepped:
+            self._resume.release()
+        self._stepped = True
+        while not self._produced.acquire(timeout=_LEGACY_POLL_INTERVAL):
+            if not state.should_run():
+                return None
+        if self._done:
+            return None
+        return self._frame
+
+    def _cancelled(self):
+        return self._frame_buffer.cancel_event.is_set()
+
+    def _run(self):
+        state = self._state
+        frame_buffer = self._frame_buffer
+        should_run = lambda: not self._cancelled() and state.should_run()
+        current_animation = lambda: None if self._cancelled() else self.name
+        try:
+            self.func(frame_buffer, should_run, current_animation, **self.kwargs)
+        except AnimationCancelled:
+            pass
+        except Exception as e:
+            print(f"Error in animation {self.name}: {e}")
+        finally:
+            self._done = True
+            self._produced.release()
+
+    def _capture(self, packed):
+        self._pending = packed
+
+    def _handoff(self, delay):
+        # Called from present_frame() on the animation thread
+        self._frame = self._pending
+        self.delay = delay
+        self._produced.release()
+        self._resume.acquire()
+        if self._cancelled():
+            raise AnimationCancelled()
+
+
+def as_animation(name, entry, descriptor=None):
+    """Return an Animation for an ANIMATIONS entry.
+
+    Args:
+        name: Animation name
+        entry: Animation instance / subclass, or a legacy loop function
+        descriptor: The entry's AnimationDescriptor (legacy call arguments)
+
+    Returns:
+        Animation: Ready to pass to run_animation()
+    """
+    if isinstance(entry, Animation):
+        return entry
+    if isinstance(entry, type) and issubclass(entry, Animation):
+        return entry()
+    return LegacyAnimation(name, entry, descriptor)
+
+
+def show_frame(frame_buffer, frame):
+    """Draw a rendered frame (RGB array or 81 packed colors) into the back buffer."""
+    if isinstance(frame, np.ndarray) and frame.ndim == 3:
+        send_frame(frame_buffer, frame)
+    elif isinstance(frame_buffer, LaunchpadFrameBuffer):
+        frame_buffer.set_packed(list(frame))
+    else:
+        send_frame(frame_buffer, unpack_frame(frame))
+
+
+def run_animation(animation, frame_buffer, state):
+    """Drive an animation with the frame buffer's clock until it stops.
+
+    Renders a frame, shows it and waits via present_frame(), so the frame
+    clock paces it and the cancel token interrupts it.
+
+    Args:
+        animation: Animation to run
+        frame_buffer: LaunchpadFrameBuffer (or a plain MIDI port)
+        state: AnimationState for this run
+
+    Raises:
+        AnimationCancelled: The frame buffer's run was cancelled
+    """
+    animation.init(state)
+    try:
+        started = time.monotonic()
+        previous = 0.0
+        while state.should_run():
+            clock = getattr(frame_buffer, 'clock', None)
+            now = clock.frame_time() if clock is not None else time.monotonic() - started
+            frame = animation.render(now, now - previous if state.frame_index else 0.0, state)
+            if frame is None:
+                break
+            previous = now
+            show_frame(frame_buffer, frame)
+            state.frame_index += 1
+            present_frame(frame_buffer, animation.frame_delay(state))
+    finally:
+        animation.close(state)
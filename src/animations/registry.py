@@ -0,0 +1,230 @@
+"""Lazy animation registry.
+
+Every animation is described by an AnimationDescriptor: where it lives
+(module + attribute) and what it needs (microphone, audio analyzer),
+its frame rate, cycle period and Session-grid position. Modules are only
+imported when an animation is first looked up, so start-up does not pay
+for scipy and the other audio dependencies unless an audio animation runs.
+
+Third-party packs register through the ``launchpad_mk2.animations`` entry
+point group; each entry point names one animation::
+
+    [project.entry-points."launchpad_mk2.animations"]
+    lava_storm = "my_pack.storm:LavaStorm"
+
+The target may be an Animation (class or instance) or a loop-style
+function. Optional attributes on it (``needs_audio``, ``needs_analyzer``,
+``target_fps``, ``period``, ``grid_order``) fill in the descriptor when it
+is loaded.
+"""
+
+import importlib
+import inspect
+import threading
+from collections.abc import Mapping
+
+ENTRY_POINT_GROUP = 'launchpad_mk2.animations'
+
+# ``period`` value asking the frame cache to find the cycle at runtime
+DETECT_PERIOD = 'detect'
+
+# Keyword arguments the controller can hand to audio-reactive animations
+_ANALYZER_KWARGS = ('audio_analyzer', 'spotify_manager')
+
+
+class AnimationDescriptor:
+    """Metadata for one animation; load() imports it on demand."""
+
+    def __init__(self, name, module, attr, needs_audio=False, needs_analyzer=False,
+                 target_fps=None, period=None, grid_order=None):
+        """
+        Args:
+            name: Registry key (what set_animation() and mappings use)
+            module: Module path; relative paths resolve against this package
+            attr: Attribute in the module (function or Animation)
+            needs_audio: Reads the microphone
+            needs_analyzer: Reads the audio analyzer (Spotify features or live
+                microphone analysis); gets audio_analyzer / spotify_manager arguments
+            target_fps: Frame rate the frame clock paces it at (None = its own delays)
+            period: Cycle length in seconds, DETECT_PERIOD for a deterministic
+                loop whose cycle the frame cache should find, or None (the
+                Animation's own ``period``, if any)
+            grid_order: Session-grid slot; unordered animations follow
+                alphabetically
+        """
+        self.name = name
+        self.module = module
+        self.attr = attr
+        self.needs_audio = needs_audio
+        self.needs_analyzer = needs_analyzer
+        self.target_fps = target_fps
+        self.period = period
+        self.grid_order = grid_order
+        self._target = None
+        self._accepted_kwargs = None
+        self._lock = threading.Lock()
+        self.load_error = None  # exception from a failed load(); the registry then skips it
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    def load(self):
+        """Import the module (first call only) and return the animation.
+
+        Raises:
+            Exception: Whatever importing failed with; it is kept in
+                ``load_error`` and not retried
+        """
+        if self._target is None:
+            with self._lock:
+                if self.load_error is not None:
+                    raise self.load_error
+                if self._target is None:
+                    try:
+                        package = __package__ if self.module.startswith('.') else None
+                        target = getattr(importlib.import_module(self.module, package), self.attr)
+                    except Exception as e:
+                        self.load_error = e
+                        raise
+                    self._adopt_metadata(target)
+                    self._target = target
+        return self._target
+
+    def call_kwargs(self, audio_analyzer=None, spotify_manager=None):
+        """Keyword arguments a loop-style function should be called with.
+
+        Only audio-reactive animations get them, only when the analyzer is
+        enabled, and only the ones the function's signature accepts.
+        """
+        if not self.needs_analyzer or not audio_analyzer or not audio_analyzer.is_enabled():
+            return {}
+        if self._accepted_kwargs is None:
+            self._accepted_kwargs = _accepted_kwargs(self.load())
+        available = {'audio_analyzer': audio_analyzer, 'spotify_manager': spotify_manager}
+        return {key: available[key] for key in self._accepted_kwargs}
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'module': self.module,
+            'needs_audio': self.needs_audio,
+            'needs_analyzer': self.needs_analyzer,
+            'target_fps': self.target_fps,
+            'period': self.period,
+            'grid_order': self.grid_order,
+            'loaded': self.loaded,
+        }
+
+    def _adopt_metadata(self, target):
+        # Plugins may describe themselves on the object they export
+        for field in ('needs_audio', 'needs_analyzer', 'target_fps', 'period', 'grid_order'):
+            if getattr(self, field) in (None, False):
+                value = getattr(target, field, None)
+                if value is not None and not callable(value):
+                    setattr(self, field, value)
+
+
+def _accepted_kwargs(func):
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return ()
+    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        return _ANALYZER_KWARGS
+    return tuple(key for key in _ANALYZER_KWARGS if key in parameters)
+
+
+class AnimationRegistry(Mapping):
+    """Read-only mapping of animation name -> animation, loaded lazily.
+
+    Iterating, ``len()`` and ``in`` only touch descriptors; indexing imports
+    the animation's module. Entry-point packs are discovered on first use.
+    """
+
+    def __init__(self, descriptors=(), entry_point_group=ENTRY_POINT_GROUP):
+        self._descriptors = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+        self._lock = threading.Lock()
+        for descriptor in descriptors:
+            self._descriptors[descriptor.name] = descriptor
+
+    def register(self, descriptor, replace=False):
+        """Add a descriptor (ignored if the name is taken, unless ``replace``)."""
+        with self._lock:
+            if descriptor.name in self._descriptors and not replace:
+                return False
+            self._descriptors[descriptor.name] = descriptor
+            return True
+
+    def descriptor(self, name):
+        """Return the descriptor for ``name`` or None (also if it failed to load)."""
+        self._discover()
+        descriptor = self._descriptors.get(name)
+        if descriptor is None or descriptor.load_error is not None:
+            return None
+        return descriptor
+
+    def descriptors(self):
+        """All loadable descriptors in registration order."""
+        self._discover()
+        return [d for d in self._descriptors.values() if d.load_error is None]
+
+    def grid_names(self):
+        """Animation names in Session-grid order.
+
+        Animations that failed to load keep their slot (the pad then does
+        nothing) so the others do not move.
+        """
+        self._discover()
+        return [
+            d.name for d in sorted(
+                self._descriptors.values(),
+                key=lambda d: (d.grid_order is None, d.grid_order or 0, d.name),
+            )
+        ]
+
+    def __getitem__(self, name):
+        descriptor = self.descriptor(name)
+        if descriptor is None:
+            raise KeyError(name)
+        return descriptor.load()
+
+    def __iter__(self):
+        return iter([d.name for d in self.descriptors()])
+
+    def __len__(self):
+        return len(self.descriptors())
+
+    def __contains__(self, name):
+        return self.descriptor(name) is not None
+
+    def _discover(self):
+        if self._discovered:
+            return
+        with self._lock:
+            if self._discovered:
+                return
+            self._discovered = True
+            entries = _entry_points(self._entry_point_group)
+        for entry in entries:
+            module, _, attr = entry.value.partition(':')
+            added = self.register(AnimationDescriptor(entry.name, module.strip(), attr.strip()))
+            if not added:
+                print(f"Warning: animation '{entry.name}' from an installed pack clashes with an existing one; skipped")
+
+
+def _entry_points(group):
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    try:
+        eps = entry_points()
+        if hasattr(eps, 'select'):
+            return list(eps.select(group=group))
+        return list(eps.get(group, []))
+    except Exception as e:
+        print(f"Warning: could not scan animation packs: {e}")
+        return []
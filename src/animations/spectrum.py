@@ -1,14 +1,19 @@
-"""Spectrum-based animations using Spotify audio analysis."""
+"""Spectrum-based animations using live or Spotify audio analysis."""
 
 import time
 import math
 import colorsys
 from typing import Optional
 
+from ..hardware.launchpad import present_frame
+from ..services.playback_state import playback_state
+from .timeline import present_timeline_frame
+
 
 def spotify_spectrum_analyzer(midi_out, should_run, current_animation, audio_analyzer=None, spotify_manager=None):
-    """Spectrum analyzer using Spotify's audio analysis data."""
-    if not audio_analyzer or not spotify_manager:
+    """Spectrum analyzer using live or Spotify audio analysis data."""
+    live = bool(audio_analyzer and audio_analyzer.is_live)
+    if not audio_analyzer or not (spotify_manager or live):
         # Fallback to basic pattern if no audio data
         return basic_spectrum_fallback(midi_out, should_run, current_animation)
 
@@ -18,20 +23,27 @@ def spotify_spectrum_analyzer(midi_out, should_run, current_animation, audio_ana
 
     while should_run() and current_animation() == 'spotify_spectrum':
         try:
-            current_time = time.time()
-
-            # Get current playback info
-            current = spotify_manager.spotify.current_playback()
-            if not current or not current['is_playing'] or not current['item']:
-                # Show idle pattern
-                basic_spectrum_fallback(midi_out, should_run, current_animation, idle=True)
-                time.sleep(0.1)
+            # Pre-rendered from the track's analysis when available
+            if present_timeline_frame(midi_out, audio_analyzer, 'spotify_spectrum'):
                 continue
 
-            progress_ms = current['progress_ms']
+            current_time = time.time()
 
-            # Update spectrum data every 100ms
-            if current_time - last_update_time > 0.1:
+            if live:
+                # Live analysis follows whatever is playing; no position needed
+                progress_ms = None
+            else:
+                # Shared playback state, extrapolated locally (no API call)
+                progress_ms = playback_state.progress_ms()
+                snapshot = playback_state.snapshot()
+                if progress_ms is None or not snapshot.has_track:
+                    # Show idle pattern
+                    basic_spectrum_fallback(midi_out, should_run, current_animation, idle=True)
+                    present_frame(midi_out, 0.1)
+                    continue
+
+            # Update spectrum data every 100ms (every frame when live)
+            if live or current_time - last_update_time > 0.1:
                 spectrum_info = audio_analyzer.get_spectrum_data(progress_ms)
 
                 if spectrum_info:
@@ -113,11 +125,11 @@ def spotify_spectrum_analyzer(midi_out, should_run, current_animation, audio_ana
                 if peak_height > height and peak_height < 8:
                     set_color(midi_out, x, int(peak_height), 255, 255, 255)
 
-            time.sleep(0.05)  # ~20fps
+            present_frame(midi_out, 0.05)  # ~20fps
 
         except Exception as e:
             print(f"Spotify spectrum error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def energy_bars(midi_out, should_run, current_animation, audio_analyzer=None, spotify_manager=None):
@@ -130,6 +142,9 @@ def energy_bars(midi_out, should_run, current_animation, audio_analyzer=None, sp
 
     while should_run() and current_animation() == 'energy_bars':
         try:
+            if present_timeline_frame(midi_out, audio_analyzer, 'energy_bars'):
+                continue
+
             # Get current track features
             features = audio_analyzer.get_current_features()
             params = audio_analyzer.get_animation_parameters()
@@ -188,11 +203,11 @@ def energy_bars(midi_out, should_run, current_animation, audio_analyzer=None, sp
                     intensity = (y + 1) / height if height > 0 else 1
                     set_color(midi_out, x, y, int(r * intensity), int(g * intensity), int(b * intensity))
 
-            time.sleep(0.05)
+            present_frame(midi_out, 0.05)
 
         except Exception as e:
             print(f"Energy bars error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def tempo_pulse(midi_out, should_run, current_animation, audio_analyzer=None):
@@ -202,16 +217,17 @@ def tempo_pulse(midi_out, should_run, current_animation, audio_analyzer=None):
 
     while should_run() and current_animation() == 'tempo_pulse':
         try:
-            tempo = audio_analyzer.get_tempo()
+            if present_timeline_frame(midi_out, audio_analyzer, 'tempo_pulse'):
+                continue
+
             energy = audio_analyzer.get_energy_level()
             valence = audio_analyzer.get_valence()
 
-            # Calculate pulse timing
-            beat_duration = 60.0 / tempo  # seconds per beat
-            pulse_phase = (time.time() % beat_duration) / beat_duration
+            # Calculate pulse timing (locked to detected beats when live)
+            pulse_phase = audio_analyzer.get_beat_phase()
 
-            # Create pulsing effect
-            pulse_intensity = (math.sin(pulse_phase * 2 * math.pi) + 1) / 2
+            # Create pulsing effect (brightest on the beat)
+            pulse_intensity = (math.cos(pulse_phase * 2 * math.pi) + 1) / 2
             pulse_intensity = pulse_intensity ** 2  # Sharper pulse
 
             # Color based on valence
@@ -228,15 +244,15 @@ def tempo_pulse(midi_out, should_run, current_animation, audio_analyzer=None):
             for y in range(8):
                 for x in range(8):
                     distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-                    if distance <= max_radius:
+                    if max_radius > 0 and distance <= max_radius:
                         intensity = max(0, 1 - distance / max_radius) * pulse_intensity
                         set_color(midi_out, x, y, int(r * intensity), int(g * intensity), int(b * intensity))
 
-            time.sleep(0.02)  # High refresh rate for smooth pulse
+            present_frame(midi_out, 0.02)  # High refresh rate for smooth pulse
 
         except Exception as e:
             print(f"Tempo pulse error: {e}")
-            time.sleep(0.1)
+            present_frame(midi_out, 0.1)
 
 
 def basic_spectrum_fallback(midi_out, should_run, current_animation, idle=False):
@@ -253,7 +269,7 @@ def basic_spectrum_fallback(midi_out, should_run, current_animation, idle=False)
                     intensity = 0.3
                     set_color(midi_out, x, y, int(50 * intensity), int(100 * intensity), int(150 * intensity))
 
-        time.sleep(0.1)
+        present_frame(midi_out, 0.1)
 
 
 
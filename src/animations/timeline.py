@@ -0,0 +1,374 @@
+"""Pre-rendered per-track LED timelines from Spotify audio analysis.
+
+With an audio analysis the spectrum, energy and tempo animations are a pure
+function of the playback position, so on track change a background worker
+renders each of them for the whole track at TIMELINE_FPS and stores the
+frames as packed 6-bit colors (see frame_encoder.pack_frame). While the
+track plays the animation only indexes its timeline with the analyzer's
+extrapolated ``progress_ms`` (see playback_state): constant, tiny frame cost, and every frame
+lines up with the analysis (segments and beats) instead of a 100 ms poll.
+
+Without analysis, or while paused, the animations fall back to their live
+loops.
+"""
+
+import collections
+import colorsys
+import math
+import threading
+
+import numpy as np
+
+from ..hardware.frame_encoder import FRAME_SHAPE, pack_frame, quantize_frame
+from ..hardware.launchpad import PAD_COUNT, present_frame
+from ..services.playback_state import playback_state
+from .protocol import show_frame
+
+# Frame rate timelines are rendered and played back at
+TIMELINE_FPS = 30
+# Memory cap for all stored timelines together (~2.3 MiB per animation per 4 min track)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Frames rendered per vectorized batch (bounds the float working set)
+_RENDER_CHUNK = 1024
+# Spectrum peak dots fall to 95% every 100 ms, like the live analyzer
+_PEAK_DECAY_PER_SECOND = 0.95 ** 10
+
+
+class TrackTimeline:
+    """Packed frames for one animation over one whole track."""
+
+    def __init__(self, track_id, name, frames, fps=TIMELINE_FPS):
+        """
+        Args:
+            track_id: Spotify track ID
+            name: Animation name
+            frames: (n, 81) uint32 array of packed colors, frame i at i / fps
+            fps: Frame rate of ``frames``
+        """
+        self.track_id = track_id
+        self.name = name
+        self.frames = frames
+        self.fps = fps
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def nbytes(self):
+        return self.frames.nbytes
+
+    def frame_at(self, progress_ms):
+        """Packed frame for a playback position, or None past either end."""
+        index = int(progress_ms * self.fps / 1000.0)
+        if index < 0 or index >= len(self.frames):
+            return None
+        return self.frames[index].tolist()
+
+
+def _track_parameters(features):
+    """Per-track inputs, with the AudioAnalyzer getter defaults."""
+    features = features or {}
+    return {
+        'energy': features.get('energy', 0.5),
+        'danceability': features.get('danceability', 0.5),
+        'valence': features.get('valence', 0.5),
+        'tempo': features.get('tempo', 120.0) or 120.0,
+        'loudness': features.get('loudness', -30.0),
+        'acousticness': features.get('acousticness', 0.5),
+        'instrumentalness': features.get('instrumentalness', 0.5),
+        # get_animation_parameters() has no color shift without features
+        'color_shift': features.get('valence', 0.5) if features else 0.0,
+    }
+
+
+def _beat_phases(analysis, times, tempo):
+    """Position within the current beat for each time (0.0-1.0).
+
+    Uses the analysis beats; outside them the phase runs on at ``tempo``.
+    """
+    beats = analysis.beats
+    indices = beats.indices_at(times)
+    period = 60.0 / tempo
+    phases = (times % period) / period
+    covered = indices >= 0
+    if covered.any():
+        hit = indices[covered]
+        durations = np.maximum(beats.duration[hit].astype(np.float64), 1e-6)
+        phases[covered] = np.clip((times[covered] - beats.start[hit]) / durations, 0.0, 1.0)
+    return phases
+
+
+def _rgb(hue, saturation, value):
+    """0-255 color like the live animations (int truncation of colorsys)."""
+    return [int(c * 255) for c in colorsys.hsv_to_rgb(hue, saturation, value)]
+
+
+def _bar_masks(heights):
+    """(n, 8, 8) bool: pad (y, x) lit when y < int(heights[:, x])."""
+    rows = np.arange(8)
+    return rows[None, :, None] < heights.astype(np.intp)[:, None, :]
+
+
+def render_spectrum(analysis, features, times):
+    """spotify_spectrum: 8 bars from segment chroma/timbre scaled by loudness."""
+    params = _track_parameters(features)
+    segments = analysis.segments
+    frames = np.zeros((len(times),) + FRAME_SHAPE, dtype=np.uint8)
+    if not len(segments):
+        return frames
+
+    # Latest segment at each time (gaps keep the previous bars, like live)
+    indices = np.clip(np.searchsorted(segments.start, times, side='right') - 1, 0, len(segments) - 1)
+    pitch_columns = [int(i * 12 / 8) for i in range(8)]
+    pitches = segments.pitches[indices][:, pitch_columns]
+    timbre = np.abs(segments.timbre[indices][:, :8])
+    loudness = np.maximum(0.0, (segments.loudness_max[indices] + 60) / 60)
+    heights = np.clip((pitches + timbre / 100) * 0.5 * 8 * loudness[:, None], 0, 8)
+
+    # Peaks hold the highest bar and decay: peak_k = max_j<=k h_j * d^(k-j)
+    log_decay = math.log(_PEAK_DECAY_PER_SECOND) / TIMELINE_FPS
+    steps = np.arange(len(times))[:, None] * log_decay
+    with np.errstate(divide='ignore'):
+        peaks = np.exp(np.maximum.accumulate(np.log(heights) - steps, axis=0) + steps)
+
+    # Row colors depend only on the track's color shift
+    shift = params['color_shift']
+    palette = np.zeros((8, 3), dtype=np.uint8)
+    for y in range(8):
+        intensity = (y + 1) / 8.0
+        if intensity < 0.33:
+            palette[y] = _rgb(0.5 + shift * 0.2, 0.8, intensity)
+        elif intensity < 0.66:
+            palette[y] = _rgb(0.2 + shift * 0.1, 1.0, 1.0)
+        else:
+            palette[y] = _rgb(shift * 0.1, 1.0, 1.0)
+
+    lit = _bar_masks(heights)
+    grid = frames[:, :8, :8]
+    grid[lit] = np.broadcast_to(palette[None, :, None, :], lit.shape + (3,))[lit]
+
+    bar_tops = heights.astype(np.intp)
+    peak_rows = peaks.astype(np.intp)
+    frame_ix, column = np.nonzero((peak_rows > bar_tops) & (peak_rows < 8))
+    grid[frame_ix, peak_rows[frame_ix, column], column] = 255
+    return frames
+
+
+def render_energy_bars(analysis, features, times):
+    """energy_bars: one bar per track feature, pulsing on the analysis beats."""
+    params = _track_parameters(features)
+    energy = params['energy']
+    danceability = params['danceability']
+    targets = np.array([
+        energy * 8,
+        danceability * 8,
+        params['valence'] * 8,
+        min(8, (params['tempo'] / 200) * 8),
+        max(0, (params['loudness'] + 60) / 60 * 8),
+        params['acousticness'] * 8,
+        params['instrumentalness'] * 8,
+        (energy + danceability) / 2 * 8,
+    ])
+    colors = np.array([
+        (255, 0, 0), (0, 255, 0), (255, 255, 0), (0, 0, 255),
+        (255, 0, 255), (0, 255, 255), (255, 165, 0), (255, 255, 255),
+    ], dtype=np.float64)
+
+    pulse = (np.cos(_beat_phases(analysis, times, params['tempo']) * 2 * math.pi) + 1) / 2
+    heights = np.clip(targets[None, :] + pulse[:, None] * 1.5, 0, 8)
+    bar_tops = heights.astype(np.intp)
+
+    # Each bar fades in from the bottom: (y + 1) / height
+    rows = np.arange(1, 9)[None, :, None]
+    fade = np.where(_bar_masks(heights), rows / np.maximum(bar_tops, 1)[:, None, :], 0.0)
+    frames = np.zeros((len(times),) + FRAME_SHAPE, dtype=np.uint8)
+    frames[:, :8, :8] = (fade[..., None] * colors[None, None, :, :]).astype(np.uint8)
+    return frames
+
+
+def render_tempo_pulse(analysis, features, times):
+    """tempo_pulse: a ring from the center, brightest on each analysis beat."""
+    params = _track_parameters(features)
+    energy = params['energy']
+    pulse = ((np.cos(_beat_phases(analysis, times, params['tempo']) * 2 * math.pi) + 1) / 2) ** 2
+
+    # Saturation 1: the color scales linearly with the HSV value
+    base = np.array(colorsys.hsv_to_rgb(params['valence'] * 0.8, 1.0, 1.0))
+    colors = np.floor(base[None, :] * (pulse * energy)[:, None] * 255)
+    radius = (6 * pulse * energy).astype(np.intp)
+
+    ys, xs = np.mgrid[0:8, 0:8]
+    distance = np.sqrt((xs - 4) ** 2 + (ys - 4) ** 2)
+    safe_radius = np.maximum(radius, 1)[:, None, None]
+    inside = (radius[:, None, None] > 0) & (distance[None] <= radius[:, None, None])
+    intensity = np.where(inside, np.maximum(0, 1 - distance[None] / safe_radius) * pulse[:, None, None], 0.0)
+
+    frames = np.zeros((len(times),) + FRAME_SHAPE, dtype=np.uint8)
+    frames[:, :8, :8] = (colors[:, None, None, :] * intensity[..., None]).astype(np.uint8)
+    return frames
+
+
+# Animations with a timeline: name -> renderer(analysis, features, times)
+TIMELINE_RENDERERS = {
+    'spotify_spectrum': render_spectrum,
+    'energy_bars': render_energy_bars,
+    'tempo_pulse': render_tempo_pulse,
+}
+
+
+def _track_duration(analysis):
+    duration = analysis.track.get('duration')
+    if duration:
+        return float(duration)
+    segments = analysis.segments
+    if not len(segments):
+        return 0.0
+    return float(segments.start[-1] + segments.duration[-1])
+
+
+def render_timeline(track_id, name, analysis, features=None, fps=TIMELINE_FPS):
+    """Render one animation over a whole track.
+
+    Args:
+        track_id: Spotify track ID
+        name: Animation name (key of TIMELINE_RENDERERS)
+        analysis: AnalysisIndex for the track
+        features: Track audio features dict (None for defaults)
+        fps: Timeline frame rate
+
+    Returns:
+        TrackTimeline: Packed frames covering the track
+    """
+    renderer = TIMELINE_RENDERERS[name]
+    count = int(math.ceil(_track_duration(analysis) * fps)) + 1
+    packed = np.empty((count, PAD_COUNT), dtype=np.uint32)
+    for start in range(0, count, _RENDER_CHUNK):
+        times = np.arange(start, min(count, start + _RENDER_CHUNK), dtype=np.float64) / fps
+        frames = renderer(analysis, features, times)
+        packed[start:start + len(times)] = pack_frame(quantize_frame(frames, apply_locks=False))
+    return TrackTimeline(track_id, name, packed, fps)
+
+
+class TimelineRenderer:
+    """Background worker rendering timelines on track change, LRU by track."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = None
+        self._timelines = collections.OrderedDict()  # track_id -> {name: TrackTimeline}
+        self._bytes = 0
+        self._thread = None
+        self.rendered = 0
+        self.evictions = 0
+
+    def submit(self, track_id, analysis, features=None):
+        """Queue rendering for a track; a newer submit replaces a queued one."""
+        if analysis is None or not track_id:
+            return
+        with self._lock:
+            if track_id in self._timelines:
+                self._timelines.move_to_end(track_id)
+                return
+            self._pending = (track_id, analysis, features)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name='timeline-renderer', daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def get(self, track_id, name):
+        """The rendered timeline for a track and animation, or None."""
+        with self._lock:
+            timelines = self._timelines.get(track_id)
+            if timelines is None:
+                return None
+            return timelines.get(name)
+
+    def clear(self):
+        """Drop every stored timeline."""
+        with self._lock:
+            self._timelines.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        """Stored tracks and memory use."""
+        with self._lock:
+            return {
+                'tracks': len(self._timelines),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'rendered': self.rendered,
+                'evictions': self.evictions,
+                'pending': self._pending[0] if self._pending else None,
+            }
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                while self._pending is None:
+                    self._wakeup.wait()
+                track_id, analysis, features = self._pending
+                self._pending = None
+
+            try:
+                timelines = {
+                    name: render_timeline(track_id, name, analysis, features)
+                    for name in TIMELINE_RENDERERS
+                }
+            except Exception as e:
+                print(f"⚠️ Could not render LED timeline: {e}")
+                continue
+            self._store(track_id, timelines)
+
+    def _store(self, track_id, timelines):
+        size = sum(timeline.nbytes for timeline in timelines.values())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._timelines.pop(track_id, None)
+            if previous is not None:
+                self._bytes -= sum(timeline.nbytes for timeline in previous.values())
+            self._timelines[track_id] = timelines
+            self._bytes += size
+            self.rendered += 1
+            while self._bytes > self.max_bytes:
+                _track, evicted = self._timelines.popitem(last=False)
+                self._bytes -= sum(timeline.nbytes for timeline in evicted.values())
+                self.evictions += 1
+
+
+def timeline_frame(audio_analyzer, name):
+    """Packed frame for the current playback position, or None.
+
+    None when the analyzer is live (no analysis), playback is paused or
+    unknown, or the track's timeline isn't rendered (yet).
+    """
+    if audio_analyzer is None or audio_analyzer.is_live:
+        return None
+    snapshot = playback_state.snapshot()
+    progress_ms = playback_state.progress_ms()
+    if snapshot is None or progress_ms is None:
+        return None
+    timeline = track_timelines.get(snapshot.track_id, name)
+    if timeline is None:
+        return None
+    return timeline.frame_at(progress_ms)
+
+
+def present_timeline_frame(midi_out, audio_analyzer, name):
+    """Show and present the timeline frame for ``name`` if there is one.
+
+    Returns:
+        bool: True if a frame was presented (the caller skips live rendering)
+    """
+    frame = timeline_frame(audio_analyzer, name)
+    if frame is None:
+        return False
+    show_frame(midi_out, frame)
+    present_frame(midi_out, 1.0 / TIMELINE_FPS)
+    return True
+
+
+# Global renderer shared by the audio analyzer and the animations
+track_timelines = TimelineRenderer()
@@ -3,7 +3,9 @@
 import time
 import math
 import numpy as np
-from scipy.fft import fft
+
+from ..hardware.launchpad import present_frame
+from .protocol import Animation
 
 
 # Equalizer configuration
@@ -17,126 +19,87 @@ EQUALIZER_CONFIG = {
 }
 
 
-def equalizer_animation_microphone(midi_out, should_run, current_animation):
-    """Equalizer animation using microphone input."""
-    from ..hardware.audio import initialize_audio
-
-    CHUNK = 2048
-    p, stream = initialize_audio()
-
-    if not stream:
-        return
-
-    # Keep previous levels for smoothing and decay
-    prev_levels = [0] * 8
-    peak_levels = [0] * 8
-    peak_hold_times = [0] * 8
-    current_colors = [[0, 0, 0] for _ in range(8 * 8)]  # Store current LED colors
-
-    try:
-        while current_animation() == 'equalizer_microphone':
-            try:
-                # Read audio data
-                data = np.frombuffer(stream.read(CHUNK, exception_on_overflow=False), dtype=np.float32)
-
-                # Perform FFT
-                fft_data = fft(data)
-                freq_magnitudes = np.abs(fft_data[:CHUNK//2])
-
-                # Adjust frequency range and scaling
-                freq_range = freq_magnitudes[:CHUNK//4]  # Focus on lower frequencies
-
-                # Apply bass boost to lower frequencies
-                freq_range[:len(freq_range)//4] *= EQUALIZER_CONFIG['bass_boost']
-
-                # Apply logarithmic scaling and normalization with sensitivity
-                freq_range = np.log10(freq_range + 1)
-                max_val = np.max(freq_range) if np.max(freq_range) > 0 else 1
-                freq_range = freq_range * (8 * EQUALIZER_CONFIG['sensitivity'] / max_val)
-
-                # Map to 8 bands with smoothing and decay
-                bands = np.array_split(freq_range, 8)
-                current_levels = []
-
-                for i, band in enumerate(bands):
-                    # Get new level
-                    new_level = np.mean(band)
-
-                    # Apply smoothing with previous frame
-                    smooth = EQUALIZER_CONFIG['smoothing']
-                    level = (new_level * (1 - smooth) + prev_levels[i] * smooth)
-
-                    # Apply decay if new level is lower
-                    if level < prev_levels[i]:
-                        level = max(level, prev_levels[i] * EQUALIZER_CONFIG['decay'])
-
-                    # Update peak
-                    if level > peak_levels[i]:
-                        peak_levels[i] = level
-                        peak_hold_times[i] = EQUALIZER_CONFIG['peak_hold']
-                    else:
-                        if peak_hold_times[i] > 0:
-                            peak_hold_times[i] -= 1
-                        else:
-                            peak_levels[i] *= EQUALIZER_CONFIG['decay']
-
-                    # Ensure minimum height and cap at 8
-                    level = max(EQUALIZER_CONFIG['min_height'], min(8, int(level)))
-                    current_levels.append(level)
-                    prev_levels[i] = level
-
-                # Update LEDs with enhanced colors and slower decay
-                for x, level in enumerate(current_levels):
-                    for y in range(8):
-                        current_idx = x * 8 + y
-
-                        if y < level:  # LED should be lit
-                            # Calculate target color
-                            intensity = (y + 1) / 8.0
-                            if intensity < 0.33:
-                                target_r = int(intensity * 3 * 255)
-                                target_g = 255
-                                target_b = 0
-                            elif intensity < 0.66:
-                                target_r = 255
-                                target_g = int((1 - (intensity - 0.33) * 3) * 255)
-                                target_b = 0
-                            else:
-                                target_r = 255
-                                target_g = 0
-                                target_b = int((intensity - 0.66) * 3 * 128)
-
-                            # Immediately set to target color
-                            current_colors[current_idx] = [target_r, target_g, target_b]
-                        else:  # LED should fade
-                            # Slowly decrease current color values
-                            current_colors[current_idx] = [
-                                int(max(0, c - (2 if c > 50 else 1)))  # Slower decay for dimmer colors
-                                for c in current_colors[current_idx]
-                            ]
-
-                        # Set the color
-                        r, g, b = current_colors[current_idx]
-                        from ..hardware.launchpad import set_color
-                        set_color(midi_out, x, y, r, g, b)
+# Bands below this get EQUALIZER_CONFIG['bass_boost']
+BASS_CUTOFF_HZ = 250.0
 
-                    # Draw peak dot with slower decay
-                    peak_y = min(7, int(peak_levels[x]))
-                    if peak_y >= level:
-                        from ..hardware.launchpad import set_color
-                        set_color(midi_out, x, peak_y, 255, 255, 255)
 
-                time.sleep(0.016)  # ~60fps
+def _bar_colors():
+    """Color of each lit row (green at the bottom, red, then magenta at the top)."""
+    colors = np.zeros((8, 3), dtype=np.int16)
+    for y in range(8):
+        intensity = (y + 1) / 8.0
+        if intensity < 0.33:
+            colors[y] = (int(intensity * 3 * 255), 255, 0)
+        elif intensity < 0.66:
+            colors[y] = (255, int((1 - (intensity - 0.33) * 3) * 255), 0)
+        else:
+            colors[y] = (255, 0, int((intensity - 0.66) * 3 * 128))
+    return colors
+
 
-            except Exception as e:
-                print(f"Equalizer error: {e}")
-                time.sleep(0.1)
+class MicrophoneEqualizer(Animation):
+    """Equalizer animation using microphone input."""
 
-    finally:
-        # Cleanup
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+    name = 'equalizer_microphone'
+    target_fps = 60
+    bands = 8
+
+    def __init__(self):
+        self.rows = np.arange(8)[:, None]
+        self.bar_colors = _bar_colors()[:, None, :]
+
+    def init(self, state):
+        from ..hardware.audio import audio_capture
+        from ..hardware.spectral import SpectralBandEngine, log_filterbank
+
+        # Shared capture thread; frames read its latest window without blocking
+        state.capture = audio_capture if audio_capture.acquire() else None
+        # Fold the bass boost into the filterbank (one matmul per frame)
+        _bank, centers = log_filterbank(self.bands, audio_capture.chunk, audio_capture.sample_rate)
+        gains = np.where(centers < BASS_CUTOFF_HZ, EQUALIZER_CONFIG['bass_boost'], 1.0)
+        state.spectrum = SpectralBandEngine(
+            self.bands,
+            fft_size=audio_capture.chunk,
+            sample_rate=audio_capture.sample_rate,
+            sensitivity=EQUALIZER_CONFIG['sensitivity'],
+            smoothing=EQUALIZER_CONFIG['smoothing'],
+            decay=EQUALIZER_CONFIG['decay'],
+            peak_hold=EQUALIZER_CONFIG['peak_hold'],
+            band_gains=gains,
+        )
+        # Current LED colors [y, x], kept so unlit pads fade out slowly
+        state.colors = np.zeros((8, self.bands, 3), dtype=np.int16)
+
+    def render(self, t, dt, state):
+        if state.capture is None:
+            return None
+
+        # Latest audio window (read-only view into the ring buffer)
+        samples = state.capture.latest(state.spectrum.fft_size)
+        if samples is not None:
+            state.spectrum.update(samples)
+        levels = np.maximum(EQUALIZER_CONFIG['min_height'], (state.spectrum.levels * 8).astype(int))
+        peaks = np.minimum(7, (state.spectrum.peaks * 8).astype(int))
+
+        # Lit pads take their row color; the rest fade (slower when dim)
+        colors = state.colors
+        faded = np.maximum(0, colors - np.where(colors > 50, 2, 1))
+        colors[:] = np.where((self.rows < levels)[..., None], self.bar_colors, faded)
+
+        frame = np.zeros((9, 9, 3), dtype=np.uint8)
+        frame[:8, :self.bands] = colors
+        # Peak dot above the bar
+        columns = np.flatnonzero(peaks >= levels)
+        frame[peaks[columns], columns] = 255
+        return frame
+
+    def close(self, state):
+        if getattr(state, 'capture', None) is not None:
+            state.capture.release()
+            state.capture = None
+
+
+equalizer_animation_microphone = MicrophoneEqualizer()
 
 
 def equalizer_animation(midi_out, should_run, current_animation):
@@ -158,7 +121,7 @@ def equalizer_animation(midi_out, should_run, current_animation):
                     for y in range(height):
                         from ..hardware.launchpad import set_color
                         set_color(midi_out, x, y, 0, 255, 100)
-                time.sleep(0.1)
+                present_frame(midi_out, 0.1)
                 continue
 
             current = spotify.current_playback()
@@ -171,7 +134,7 @@ def equalizer_animation(midi_out, should_run, current_animation):
                     for y in range(height):
                         from ..hardware.launchpad import set_color
                         set_color(midi_out, x, y, 0, 255, 100)
-                time.sleep(0.1)
+                present_frame(midi_out, 0.1)
                 continue
 
             track_id = current['item']['id']
@@ -233,8 +196,8 @@ def equalizer_animation(midi_out, should_run, current_animation):
                                 int(g * intensity),
                                 int(b * intensity))
 
-            time.sleep(0.05)  # Adjust for smoothness
+            present_frame(midi_out, 0.05)  # Adjust for smoothness
 
         except Exception as e:
             print(f"Equalizer error: {e}")
-            time.sleep(1)
+            present_frame(midi_out, 1)
@@ -24,7 +24,10 @@ from ..services.spotify_manager import (
     save_spotify_credentials,
     SECRET_FILE,
 )
+from ..services.device_registry import device_registry
+from ..services.playback_state import playback_state
 from ..utils.config_manager import config_manager
+from ..utils.latency import latency_tracker
 
 _API_DIR = Path(__file__).resolve().parent
 
@@ -195,6 +198,8 @@ def create_app(
         if app.spotify_manager and app.spotify_manager.spotify:
             try:
                 app.spotify_manager.spotify.transfer_playback(device_id)
+                device_registry.invalidate()
+                playback_state.request_refresh()
                 return jsonify({'success': True, 'message': f'Playback transferred to device {device_id}'})
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
@@ -309,6 +314,36 @@ def create_app(
             return False
         return False
 
+    @app.route('/api/latency', methods=['GET'])
+    def get_latency():
+        """Button-to-action latency histograms, split by button class."""
+        summary = latency_tracker.summary()
+        if midi_handler is not None:
+            summary['input'] = midi_handler.input_pipeline.get_stats()
+        return jsonify(summary)
+
+    @app.route('/api/latency', methods=['DELETE'])
+    def reset_latency():
+        """Clear collected latency samples."""
+        latency_tracker.reset()
+        return jsonify({'status': 'success'})
+
+    @app.route('/api/frames', methods=['GET'])
+    def get_frame_stats():
+        """Per-animation FPS, late / dropped frames, render budget and replay cache."""
+        from ..animations.frame_cache import frame_cache
+        from ..animations.timeline import track_timelines
+
+        if not app.animation_controller or not hasattr(app.animation_controller, 'get_frame_stats'):
+            return jsonify({'animations': {}, 'cache': frame_cache.get_stats(),
+                            'timelines': track_timelines.get_stats()})
+        return jsonify({
+            'current': app.animation_controller.current_animation,
+            'animations': app.animation_controller.get_frame_stats(),
+            'cache': frame_cache.get_stats(),
+            'timelines': track_timelines.get_stats(),
+        })
+
     @app.route('/api/app-settings', methods=['GET'])
     def get_app_settings():
         """Application settings for the Settings panel."""
@@ -405,29 +440,32 @@ def create_app(
             return jsonify(status)
 
         if app.spotify_manager and app.spotify_manager.spotify:
-            try:
-                current = app.spotify_manager.get_current_playback()
-                status['spotify_connected'] = True
-
-                if current and current.get('item'):
-                    track = current['item']
-                    artists = ", ".join([artist['name'] for artist in track['artists']])
-                    status['current_track'] = {
-                        'name': track['name'],
-                        'artists': artists,
-                        'duration_ms': track['duration_ms']
-                    }
-                    status['is_playing'] = current['is_playing']
-
-            except Exception as e:
-                if app.spotify_manager.handle_api_error(e):
-                    status['needs_reauth'] = True
-                else:
-                    print(f"Error getting Spotify status: {e}")
+            status['spotify_connected'] = True
+            # Latest shared snapshot; the web poll never reaches Spotify
+            snapshot = playback_state.snapshot()
+            if snapshot and snapshot.has_track:
+                track = snapshot.track
+                artists = ", ".join([artist['name'] for artist in track['artists']])
+                status['current_track'] = {
+                    'name': track['name'],
+                    'artists': artists,
+                    'duration_ms': track['duration_ms']
+                }
+                status['is_playing'] = snapshot.is_playing
+                status['progress_ms'] = snapshot.progress_at()
 
         return jsonify(status)
 
+    @app.route('/api/playback', methods=['GET'])
+    def get_playback_state():
+        """Shared playback snapshot (position extrapolated), poller and device-cache counters."""
+        stats = playback_state.get_stats()
+        stats['device_registry'] = device_registry.get_stats()
+        return jsonify(stats)
+
     def _spotify_playback_error(exc):
+        # The cached device may be gone; resolve it again on the next command
+        device_registry.invalidate()
         if app.spotify_manager and app.spotify_manager.handle_api_error(exc):
             return jsonify({
                 'error': str(exc),
@@ -447,6 +485,7 @@ def create_app(
                 )
                 if device_id:
                     app.spotify_manager.spotify.start_playback(device_id=device_id)
+                    playback_state.request_refresh()
                     return jsonify({'status': 'success'})
                 else:
                     err = {'error': 'No active device found'}
@@ -470,6 +509,7 @@ def create_app(
                 )
                 if device_id:
                     app.spotify_manager.spotify.pause_playback(device_id=device_id)
+                    playback_state.request_refresh()
                     return jsonify({'status': 'success'})
                 else:
                     err = {'error': 'No active device found'}
@@ -493,6 +533,7 @@ def create_app(
                 )
                 if device_id:
                     app.spotify_manager.spotify.next_track(device_id=device_id)
+                    playback_state.request_refresh()
                     return jsonify({'status': 'success'})
                 else:
                     err = {'error': 'No active device found'}
@@ -516,6 +557,7 @@ def create_app(
                 )
                 if device_id:
                     app.spotify_manager.spotify.previous_track(device_id=device_id)
+                    playback_state.request_refresh()
                     return jsonify({'status': 'success'})
                 else:
                     err = {'error': 'No active device found'}
@@ -0,0 +1,351 @@
+"""Animation benchmark against the virtual Launchpad.
+
+Runs every entry in ANIMATIONS (or the ones named) for a few seconds
+against a VirtualLaunchpad and reports, per animation:
+
+  * achieved FPS
+  * render time per frame (drawing, before commit) — p50 / p99
+  * CPU time per frame (thread CPU, drawing + diff + SysEx encoding)
+  * late and dropped frames against the frame clock (paced runs)
+  * switch latency: time from cancelling the run to the animation exiting
+  * SysEx messages, bytes and pads written per frame
+  * memory allocated per frame (tracemalloc peak) and net growth over
+    the run, in a separate shorter pass so tracing does not skew timings
+
+Usage:
+    python -m src.bench                       # all animations, 3 s each
+    python -m src.bench rainbow plasma_field -s 5
+    python -m src.bench --json bench.json     # save results (baseline)
+    python -m src.bench --baseline bench.json # exit 1 on regressions
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+from . import __version__
+from .animations import ANIMATIONS
+from .core.frame_clock import FrameClock
+from .hardware.launchpad import AnimationCancelled, LaunchpadFrameBuffer
+from .hardware.virtual import VirtualLaunchpad
+
+DEFAULT_SECONDS = 3.0
+# Allocation pass length (tracemalloc makes rendering several times slower)
+ALLOC_SECONDS = 1.0
+DEFAULT_TOLERANCE = 0.15
+# Timing differences below this are noise, whatever the ratio
+MIN_TIME_DELTA_MS = 0.05
+
+# Metrics checked against a baseline; True = higher is better
+REGRESSION_METRICS = {
+    'fps': True,
+    'render_p99_ms': False,
+    'cpu_ms_per_frame': False,
+    'bytes_per_frame': False,
+    'switch_ms': False,
+}
+
+
+class _BenchPad:
+    """Minimal LaunchpadManager stand-in: an open virtual port, no writer thread."""
+
+    def __init__(self, device):
+        self.device = device
+        self.midi_out, self.midi_in = device.create_clients()
+        self.midi_out.open_port(0)
+        self.midi_in.open_port(0)
+
+
+class BenchFrameBuffer(LaunchpadFrameBuffer):
+    """Frame buffer that times each frame between present_frame() calls."""
+
+    def __init__(self, launchpad, paced=True, trace_allocations=False):
+        super().__init__(launchpad)
+        self.paced = paced
+        self.trace_allocations = trace_allocations
+        self.render_times = []
+        self.cpu_times = []
+        self.alloc_peaks = []
+        self._frame_start = None
+        self._cpu_start = None
+        self._mem_start = 0
+
+    def begin_frame(self):
+        """Mark the start of drawing (call on the animation thread)."""
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+        self._cpu_start = time.thread_time()
+        self._frame_start = time.perf_counter()
+
+    def commit(self):
+        drawn = time.perf_counter()
+        sent = super().commit()
+        if self._frame_start is not None:
+            self.render_times.append(drawn - self._frame_start)
+            self.cpu_times.append(time.thread_time() - self._cpu_start)
+            if self.trace_allocations:
+                _current, peak = tracemalloc.get_traced_memory()
+                self.alloc_peaks.append(max(0, peak - self._mem_start))
+        return sent
+
+    def wait(self, delay):
+        if self.paced:
+            super().wait(delay)
+        self.begin_frame()
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def _run_animation(name, func, seconds, paced, trace_allocations=False):
+    """Run one animation on its own thread for ``seconds``.
+
+    The run is ended the way AnimationController switches animations: the
+    cancel token is set and current_animation() stops matching.
+
+    Returns:
+        tuple: (BenchFrameBuffer, VirtualLaunchpad, wall seconds, error or None,
+        net bytes, switch seconds or None)
+    """
+    device = VirtualLaunchpad()
+    frame_buffer = BenchFrameBuffer(_BenchPad(device), paced=paced, trace_allocations=trace_allocations)
+    if paced:
+        # Pace like AnimationController does
+        frame_buffer.clock = FrameClock(name, target_fps=ANIMATIONS.descriptor(name).target_fps)
+    frame_buffer.cancel_event = threading.Event()
+    running = True
+    error = []
+    finished = []
+
+    def should_run():
+        return running
+
+    def current_animation():
+        return name if running else None
+
+    def target():
+        if frame_buffer.clock is not None:
+            frame_buffer.clock.start()
+        frame_buffer.begin_frame()
+        try:
+            func(frame_buffer, should_run, current_animation)
+        except AnimationCancelled:
+            pass
+        except Exception as e:
+            error.append(f"{type(e).__name__}: {e}")
+        finally:
+            finished.append(time.perf_counter())
+
+    # Same random sequence every run so results are comparable
+    random.seed(0)
+    mem_before = tracemalloc.get_traced_memory()[0] if trace_allocations else 0
+    thread = threading.Thread(target=target, name=f'bench-{name}', daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    thread.join(seconds)
+    stop_requested = time.perf_counter()
+    running = False
+    frame_buffer.cancel_event.set()
+    thread.join(2.0)
+    elapsed = stop_requested - started
+    # Only meaningful if the animation was still running when cancelled
+    switch = finished[0] - stop_requested if finished and finished[0] >= stop_requested else None
+    net = (tracemalloc.get_traced_memory()[0] - mem_before) if trace_allocations else 0
+    if thread.is_alive():
+        error.append("did not stop within 2 s of should_run() turning False")
+    return frame_buffer, device, elapsed, (error[0] if error else None), net, switch
+
+
+def bench_animation(name, seconds=DEFAULT_SECONDS, paced=True, allocations=True):
+    """Benchmark one registered animation.
+
+    Args:
+        name: Key in ANIMATIONS
+        seconds: Timed run length
+        paced: Honor the animation's frame delays (False = run flat out)
+        allocations: Also run a short tracemalloc pass
+
+    Returns:
+        dict: Metrics for the animation
+    """
+    func = ANIMATIONS[name]
+    frame_buffer, device, elapsed, error, _net, switch = _run_animation(name, func, seconds, paced)
+
+    frames = len(frame_buffer.render_times)
+    stats = device.get_stats()
+    result = {
+        'frames': frames,
+        'seconds': round(elapsed, 3),
+        'fps': round(frames / elapsed, 2) if elapsed else 0.0,
+        'render_p50_ms': round(_percentile(frame_buffer.render_times, 0.5) * 1000, 4),
+        'render_p99_ms': round(_percentile(frame_buffer.render_times, 0.99) * 1000, 4),
+        'cpu_ms_per_frame': round(sum(frame_buffer.cpu_times) / frames * 1000, 4) if frames else 0.0,
+        'messages_per_frame': round(stats['messages_received'] / frames, 3) if frames else 0.0,
+        'bytes_per_frame': round(stats['bytes_received'] / frames, 2) if frames else 0.0,
+        'pads_per_frame': round(stats['leds_written'] / frames, 2) if frames else 0.0,
+    }
+    if switch is not None:
+        result['switch_ms'] = round(switch * 1000, 3)
+    if frame_buffer.clock is not None:
+        result['late_frames'] = frame_buffer.clock.late
+        result['dropped_frames'] = frame_buffer.clock.dropped
+
+    if allocations and error is None:
+        tracemalloc.start()
+        try:
+            alloc_fb, _device, _elapsed, _error, net, _switch = _run_animation(
+                name, func, min(seconds, ALLOC_SECONDS), paced, trace_allocations=True
+            )
+        finally:
+            tracemalloc.stop()
+        result['alloc_peak_kib_per_frame'] = round(_percentile(alloc_fb.alloc_peaks, 0.5) / 1024, 2)
+        result['alloc_net_kib'] = round(net / 1024, 2)
+
+    if error is None and frames == 0:
+        # Animation gave up on its own (e.g. no microphone)
+        error = 'no frames rendered'
+    if error:
+        result['error'] = error
+    return result
+
+
+def run_benchmarks(names=None, seconds=DEFAULT_SECONDS, paced=True, allocations=True, verbose=True):
+    """Benchmark several animations.
+
+    Returns:
+        dict: Run metadata plus {'results': {name: metrics}}
+    """
+    names = list(names or ANIMATIONS.keys())
+    results = {}
+    for name in names:
+        if verbose:
+            print(f"  {name:<24}", end='', flush=True)
+        results[name] = bench_animation(name, seconds=seconds, paced=paced, allocations=allocations)
+        if verbose:
+            r = results[name]
+            note = f"  ! {r['error']}" if 'error' in r else ''
+            print(f"{r['fps']:>7.1f} fps  {r['cpu_ms_per_frame']:>7.3f} ms cpu{note}")
+    return {
+        'version': __version__,
+        'python': platform.python_version(),
+        'seconds': seconds,
+        'paced': paced,
+        'results': results,
+    }
+
+
+def print_report(report):
+    """Print benchmark results as a table."""
+    print()
+    header = (
+        f"{'animation':<24} {'fps':>7} {'render p50':>11} {'p99':>9} {'cpu/frame':>10} "
+        f"{'late':>6} {'drop':>6} {'switch':>9} {'msg/frame':>10} {'B/frame':>9} {'pads':>6} {'alloc KiB':>10} {'net KiB':>8}"
+    )
+    print(header)
+    print('-' * len(header))
+    for name, r in report['results'].items():
+        print(
+            f"{name:<24} {r['fps']:>7.1f} {r['render_p50_ms']:>9.3f}ms {r['render_p99_ms']:>7.3f}ms "
+            f"{r['cpu_ms_per_frame']:>8.3f}ms {r.get('late_frames', 0):>6} {r.get('dropped_frames', 0):>6} "
+            f"{r.get('switch_ms', 0):>7.2f}ms "
+            f"{r['messages_per_frame']:>10.2f} {r['bytes_per_frame']:>9.1f} "
+            f"{r['pads_per_frame']:>6.1f} {r.get('alloc_peak_kib_per_frame', 0):>10.2f} "
+            f"{r.get('alloc_net_kib', 0):>8.1f}"
+        )
+        if 'error' in r:
+            print(f"    error: {r['error']}")
+
+
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """List metrics that got worse than the baseline by more than ``tolerance``.
+
+    Returns:
+        list[str]: Human-readable regressions (empty if none)
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        if 'error' in current and 'error' not in previous:
+            regressions.append(f"{name}: now fails ({current['error']})")
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            old = previous.get(metric)
+            new = current.get(metric)
+            if old is None or new is None:
+                continue
+            if metric.endswith('_ms') and abs(new - old) < MIN_TIME_DELTA_MS:
+                continue
+            if higher_is_better:
+                worse = new < old * (1 - tolerance)
+            else:
+                worse = new > old * (1 + tolerance)
+            if worse:
+                regressions.append(f"{name}: {metric} {old} -> {new}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark Launchpad animations against a virtual pad')
+    parser.add_argument('animations', nargs='*', help='Animation names (default: all)')
+    parser.add_argument('-s', '--seconds', type=float, default=DEFAULT_SECONDS,
+                        help=f'Run time per animation (default: {DEFAULT_SECONDS})')
+    parser.add_argument('--unpaced', action='store_true',
+                        help='Skip frame delays and render as fast as possible')
+    parser.add_argument('--no-alloc', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--json', metavar='PATH', help='Write results to a JSON file')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against a saved JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative regression (default: {DEFAULT_TOLERANCE})')
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.animations if name not in ANIMATIONS]
+    if unknown:
+        print(f"Unknown animation(s): {', '.join(unknown)}")
+        return 2
+
+    print(f"Benchmarking {len(args.animations) or len(ANIMATIONS)} animation(s), "
+          f"{args.seconds:g}s each{' (unpaced)' if args.unpaced else ''}...")
+    report = run_benchmarks(
+        args.animations or None,
+        seconds=args.seconds,
+        paced=not args.unpaced,
+        allocations=not args.no_alloc,
+    )
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"\nCould not read baseline {args.baseline}: {e}")
+            return 2
+        regressions = compare_to_baseline(report, baseline, tolerance=args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,17 @@
 """Animation controller for managing LED animations."""
 
 import threading
-import time
-from ..animations import ANIMATIONS
-from ..hardware.launchpad import LaunchpadManager
+from ..animations import (
+    ANIMATIONS,
+    DETECT_PERIOD,
+    AnimationState,
+    as_animation,
+    cached_animation,
+    run_animation,
+)
+from ..hardware.launchpad import AnimationCancelled, LaunchpadManager, LaunchpadFrameBuffer
+from .compositor import LedCompositor
+from .frame_clock import FrameClock
 
 
 class AnimationController:
@@ -22,6 +30,17 @@ class AnimationController:
 
     def __init__(self, audio_analyzer=None, spotify_manager=None):
         self.launchpad = LaunchpadManager()
+        # Animation layer, press effects, mode locks and auth lockout are
+        # blended here into one frame for the output thread
+        self.compositor = LedCompositor(self.launchpad.output)
+        # Animations draw here; each commit becomes the compositor's base layer
+        self.frame_buffer = LaunchpadFrameBuffer(self.launchpad, sink=self.compositor.set_base)
+        # Frame pacing and late/dropped counters, one clock per animation
+        self.frame_clocks = {}
+        # Cancel token of the running animation; set to stop it at its next frame
+        self._run_cancel = threading.Event()
+        # Wakes the idle worker when there is something to run
+        self._wake = threading.Event()
         self.current_animation = None
         self.last_animation = None
         self.should_run = True
@@ -45,6 +64,7 @@ class AnimationController:
         (web API, Spotify, CLI) can still start.
         """
         self.launchpad.initialize()
+        self.compositor.start()
 
         # Start animation worker thread
         self.animation_thread = threading.Thread(target=self._animation_worker, daemon=True)
@@ -57,19 +77,16 @@ class AnimationController:
         Args:
             enabled: True to force all LEDs red and pause animations
         """
-        from ..hardware.launchpad import fill_all, clear_all
-
         was_enabled = self.auth_lockout
         self.auth_lockout = bool(enabled)
 
         if enabled:
             self.current_animation = None
-            if self.launchpad.midi_out:
-                fill_all(self.launchpad.midi_out, 255, 0, 0, force=True)
-        elif was_enabled and self.launchpad.midi_out:
-            clear_all(self.launchpad.midi_out)
-            # Re-assert mode indicator if a pad mode is still on
-            self._apply_mode_leds()
+            self._cancel_run()
+            self.compositor.set_lockout((255, 0, 0))
+        elif was_enabled:
+            # Mode locks sit below the lockout layer, so they reappear as-is
+            self.compositor.set_lockout(None)
 
     def set_animation(self, animation_name):
         """Set the current animation.
@@ -85,12 +102,14 @@ class AnimationController:
             return False
 
         if animation_name in ANIMATIONS:
-            # Clear screen when switching animations
-            if self.current_animation != animation_name and self.launchpad.midi_out:
-                from ..hardware.launchpad import clear_all
-                clear_all(self.launchpad.midi_out)
-            
+            switching = self.current_animation != animation_name
             self.last_animation = self.current_animation = animation_name
+            if switching:
+                # Stop the old animation at its next frame, then clear the
+                # screen so none of its frames linger
+                self._cancel_run()
+                self.frame_buffer.clear()
+                self.frame_buffer.commit()
             return True
         return False
 
@@ -99,13 +118,18 @@ class AnimationController:
         if self.auth_lockout:
             return
 
-        # Clear screen when stopping
-        if self.launchpad.midi_out:
-            from ..hardware.launchpad import clear_all
-            clear_all(self.launchpad.midi_out)
-        
         self.current_animation = None
         self.last_animation = None
+        self._cancel_run()
+
+        # Clear screen when stopping
+        self.frame_buffer.clear()
+        self.frame_buffer.commit()
+
+    def _cancel_run(self):
+        """Stop the running animation at its next frame and wake the worker."""
+        self._run_cancel.set()
+        self._wake.set()
 
     def get_available_animations(self):
         """Get list of available animations.
@@ -115,25 +139,58 @@ class AnimationController:
         """
         return list(ANIMATIONS.keys())
 
+    def get_frame_stats(self):
+        """Frame pacing stats for every animation that has run.
+
+        Returns:
+            dict: {animation name: FrameClock.get_stats()}
+        """
+        return {name: clock.get_stats() for name, clock in list(self.frame_clocks.items())}
+
+    def _frame_clock_for(self, name, animation=None):
+        """Get (or create) the frame clock for an animation."""
+        clock = self.frame_clocks.get(name)
+        if clock is None:
+            from ..utils.config_manager import config_manager
+
+            descriptor = ANIMATIONS.descriptor(name)
+            default_fps = (descriptor and descriptor.target_fps) or getattr(animation, 'target_fps', None)
+            target_fps = config_manager.get_animation_target_fps(name, default_fps)
+            clock = self.frame_clocks[name] = FrameClock(name, target_fps=target_fps)
+        return clock
+
     def _clear_all_mode_leds(self):
         """Unlock all mode indicator pads."""
         from ..hardware.launchpad import unlock_pad
 
-        midi_out = self.launchpad.midi_out
         for pad, _color in self.MODE_LEDS.values():
-            unlock_pad(midi_out, pad[0], pad[1], clear=True)
+            unlock_pad(None, pad[0], pad[1])
+        self.compositor.refresh()
 
     def _apply_mode_leds(self):
         """Lock the active mode pad LED; unlock the others."""
         from ..hardware.launchpad import lock_pad, unlock_pad
 
-        midi_out = self.launchpad.midi_out
+        # The compositor's lock layer draws these; unlocked pads fall back to
+        # whatever the animation shows there
         for mode, (pad, color) in self.MODE_LEDS.items():
             x, y = pad
             if mode == self.active_mode:
-                lock_pad(midi_out, x, y, *color)
+                lock_pad(None, x, y, *color)
             else:
-                unlock_pad(midi_out, x, y, clear=True)
+                unlock_pad(None, x, y)
+        self.compositor.refresh()
+
+    def show_press_effect(self, x, y):
+        """Blend a button press explosion over the current frame."""
+        from ..effects.visual_effects import ExplosionOverlay
+        from ..utils.latency import latency_tracker
+
+        overlay = ExplosionOverlay(x, y)
+        trace = latency_tracker.current()
+        if trace is not None:
+            overlay.on_first_frame = lambda: trace.mark('first_led')
+        self.compositor.add_overlay(overlay)
 
     def set_active_mode(self, mode):
         """Set pad mode explicitly (None to clear).
@@ -199,7 +256,7 @@ class AnimationController:
         if 0 <= x < 8 and 0 <= y <= 7:
             # Calculate animation index
             index = (7 - y) * 8 + x
-            anim_list = sorted(list(ANIMATIONS.keys()))
+            anim_list = ANIMATIONS.grid_names()
 
             if index < len(anim_list):
                 selected_animation = anim_list[index]
@@ -212,68 +269,96 @@ class AnimationController:
         last_animation = None
         try:
             while self.should_run:
+                # New token per run; set_animation() / stop_animation() set it
+                cancel = threading.Event()
+                self._run_cancel = cancel
+                self._wake.clear()
+
                 if self.auth_lockout:
-                    # Keep the pad red even if button effects flash briefly
-                    if self.launchpad.midi_out:
-                        from ..hardware.launchpad import fill_all
-                        fill_all(self.launchpad.midi_out, 255, 0, 0, force=True)
+                    # The compositor's lockout layer keeps the pad red
                     last_animation = None
-                    time.sleep(0.5)
+                    self._wake.wait(0.5)
                     continue
 
-                if self.current_animation in ANIMATIONS:
-                    # Clear screen when animation changes
-                    if last_animation != self.current_animation and self.launchpad.midi_out:
-                        from ..hardware.launchpad import clear_all
-                        clear_all(self.launchpad.midi_out)
-                        last_animation = self.current_animation
-                    
-                    # Create wrapper functions for animation parameters
-                    should_run_func = lambda: self.should_run
-                    current_animation_func = lambda: self.current_animation
-
-                    # Check if animation supports audio features
-                    animation_func = ANIMATIONS[self.current_animation]
-
-                    # Try to call with audio analyzer if supported and enabled
+                name = self.current_animation
+                if name in ANIMATIONS:
+                    # Start each animation from a blank frame
+                    if last_animation != name:
+                        self.frame_buffer.clear()
+                        self.frame_buffer.commit()
+                        last_animation = name
+
+                    # First use imports the animation's module; loop-style
+                    # functions run through the legacy adapter
+                    descriptor = ANIMATIONS.descriptor(name)
                     try:
-                        if (self.current_animation.startswith(('spotify_', 'adaptive_', 'energy_', 'tempo_', 'auto_')) and
-                            self.audio_analyzer and self.audio_analyzer.is_enabled()):
-                            animation_func(
-                                self.launchpad.midi_out,
-                                should_run_func,
-                                current_animation_func,
-                                audio_analyzer=self.audio_analyzer,
-                                spotify_manager=self.spotify_manager
-                            )
-                        else:
-                            animation_func(
-                                self.launchpad.midi_out,
-                                should_run_func,
-                                current_animation_func
-                            )
-                    except TypeError:
-                        # Fallback to standard call if audio parameters not supported
-                        animation_func(
-                            self.launchpad.midi_out,
-                            should_run_func,
-                            current_animation_func
-                        )
+                        animation = as_animation(name, descriptor.load(), descriptor)
+                    except Exception as e:
+                        # Broken module or pack: the registry skips it from now on
+                        print(f"Error loading animation {name} "
+                              f"({descriptor.module if descriptor else '?'}): {e}")
+                        if self.current_animation == name:
+                            self.current_animation = None
+                        continue
+                    state = AnimationState(
+                        name,
+                        audio_analyzer=self.audio_analyzer,
+                        spotify_manager=self.spotify_manager,
+                        should_run=lambda: (
+                            self.should_run and not cancel.is_set() and self.current_animation == name
+                        ),
+                    )
+                    frame_buffer = self.frame_buffer
+
+                    # The frame clock paces each frame of this run and the
+                    # cancel token interrupts it
+                    clock = self._frame_clock_for(name, animation)
+                    # Periodic animations replay a cached cycle after the first
+                    animation = cached_animation(
+                        animation, detect=descriptor.period == DETECT_PERIOD, fps=clock.target_fps
+                    )
+                    # Live analysis only listens while an animation reads it
+                    analyzer = self.audio_analyzer if descriptor.needs_analyzer else None
+                    if analyzer is not None:
+                        analyzer.acquire()
+                    clock.start()
+                    frame_buffer.clock = clock
+                    frame_buffer.cancel_event = cancel
+                    try:
+                        run_animation(animation, frame_buffer, state)
+                    except AnimationCancelled:
+                        pass
+                    except Exception as e:
+                        print(f"Error in animation {name}: {e}")
+                    finally:
+                        frame_buffer.clock = None
+                        frame_buffer.cancel_event = None
+                        clock.stop()
+                        if analyzer is not None:
+                            analyzer.release()
+
+                    if cancel.is_set() or self.current_animation != name:
+                        # Switched: start the next one right away
+                        continue
                 else:
                     # Animation stopped or None - clear screen and wait
-                    if last_animation is not None and self.launchpad.midi_out:
-                        from ..hardware.launchpad import clear_all
-                        clear_all(self.launchpad.midi_out)
+                    if last_animation is not None:
+                        self.frame_buffer.clear()
+                        self.frame_buffer.commit()
                         last_animation = None
-                time.sleep(0.1)
+                self._wake.wait(0.1)
         finally:
-            if self.launchpad.midi_out:
-                from ..hardware.launchpad import clear_all
-                clear_all(self.launchpad.midi_out)
+            self.frame_buffer.clear()
+            self.frame_buffer.commit()
 
     def shutdown(self):
         """Shutdown the animation controller."""
         self.should_run = False
+        self._cancel_run()
         if self.animation_thread:
             self.animation_thread.join(timeout=1)
+        self.compositor.stop()
         self.launchpad.close()
+
+        from ..hardware.audio import audio_capture
+        audio_capture.stop()
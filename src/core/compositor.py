@@ -0,0 +1,188 @@
+"""Layered LED compositor: animation, effect overlays, mode locks, auth lockout."""
+
+import threading
+import time
+
+from ..hardware import launchpad as launchpad_hw
+from ..hardware.launchpad import GRID_SIZE, PAD_COUNT, pack_color
+
+# Overlay tick while any effect is running (~100 fps)
+OVERLAY_TICK = 0.01
+
+
+def _blend(base, r, g, b, alpha):
+    """Mix a 0-255 color over a packed 6-bit pad color."""
+    top = pack_color(r, g, b)
+    if alpha >= 1.0:
+        return top
+    inv = 1.0 - alpha
+    return (
+        (int((base >> 12) * inv + (top >> 12) * alpha) << 12)
+        | (int(((base >> 6) & 0x3F) * inv + ((top >> 6) & 0x3F) * alpha) << 6)
+        | int((base & 0x3F) * inv + (top & 0x3F) * alpha)
+    )
+
+
+class LedCompositor:
+    """Blends LED layers once per output frame and hands the result to the writer.
+
+    Layers, lowest to highest priority:
+      1. base — the running animation (set by LaunchpadFrameBuffer.commit)
+      2. overlays — transient effects such as button press ripples, blended
+         with per-pixel alpha and ordered by their ``priority`` attribute
+      3. locks — mode indicator pads from lock_pad(), rebuilt only when the
+         lock table changes
+      4. lockout — solid color over everything (Spotify auth required)
+
+    Composition runs on its own thread: immediately when a layer changes,
+    and every OVERLAY_TICK while an overlay is active.
+    """
+
+    def __init__(self, output):
+        """
+        Args:
+            output: MidiOutputWriter that receives composited frames
+        """
+        self.output = output
+        self._base = [0] * PAD_COUNT
+        self._overlays = []
+        self._unpresented = []  # overlays waiting for on_first_frame()
+        self._lockout = None  # packed color or None
+        self._lock_layer = []
+        self._lock_version = None
+        self._cond = threading.Condition()
+        self._dirty = True
+        self._running = False
+        self._thread = None
+        self.frames_composited = 0
+
+    def start(self):
+        """Start the composition thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='led-compositor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Compose any pending change, then stop the thread."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def set_base(self, packed):
+        """Replace the animation layer (81 packed colors, pad index order)."""
+        with self._cond:
+            self._base = packed
+            self._dirty = True
+            self._cond.notify()
+
+    def add_overlay(self, overlay):
+        """Add a transient effect.
+
+        ``overlay.pixels(now)`` returns ``(index, (r, g, b), alpha)`` tuples
+        for the current time, or None once the effect has finished. An
+        optional ``overlay.on_first_frame()`` is called once its first frame
+        has been handed to the output writer.
+        """
+        with self._cond:
+            self._overlays.append(overlay)
+            if getattr(overlay, 'on_first_frame', None):
+                self._unpresented.append(overlay)
+            self._overlays.sort(key=lambda o: getattr(o, 'priority', 0))
+            self._dirty = True
+            self._cond.notify()
+
+    def set_lockout(self, color):
+        """Cover the whole pad with ``color`` (r, g, b), or None to lift it."""
+        with self._cond:
+            self._lockout = pack_color(*color) if color else None
+            self._dirty = True
+            self._cond.notify()
+
+    def refresh(self):
+        """Recompose now (after lock changes or a reconnect)."""
+        with self._cond:
+            self._dirty = True
+            self._cond.notify()
+
+    def compose(self, now=None):
+        """Blend all layers into one frame.
+
+        Returns:
+            list: 81 packed colors in pad index order
+        """
+        now = time.monotonic() if now is None else now
+        with self._cond:
+            base = self._base
+            overlays = list(self._overlays)
+            lockout = self._lockout
+
+        if lockout is not None:
+            # Overlays are hidden, but finished ones still have to go
+            self._drop_finished([o for o in overlays if o.pixels(now) is None])
+            return [lockout] * PAD_COUNT
+
+        frame = list(base)
+        finished = []
+        for overlay in overlays:
+            pixels = overlay.pixels(now)
+            if pixels is None:
+                finished.append(overlay)
+                continue
+            for index, (r, g, b), alpha in pixels:
+                if alpha > 0:
+                    frame[index] = _blend(frame[index], r, g, b, alpha)
+        self._drop_finished(finished)
+
+        for index, packed in self._locks():
+            frame[index] = packed
+        return frame
+
+    def _drop_finished(self, finished):
+        if finished:
+            with self._cond:
+                self._overlays = [o for o in self._overlays if o not in finished]
+
+    def _locks(self):
+        """Lock layer as (index, packed) pairs, cached per lock table version."""
+        version = launchpad_hw._locks_version
+        if version != self._lock_version:
+            self._lock_layer = [
+                (y * GRID_SIZE + x, pack_color(r, g, b))
+                for (x, y), (r, g, b) in list(launchpad_hw._locked_pads.items())
+            ]
+            self._lock_version = version
+        return self._lock_layer
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # Overlays need ticks, except under the lockout which hides them
+                # (set_lockout(None) marks the frame dirty and resumes ticking)
+                while self._running and not self._dirty and (
+                        not self._overlays or self._lockout is not None):
+                    self._cond.wait()
+                if not self._running and not self._dirty:
+                    break
+                self._dirty = False
+                ticking = bool(self._overlays) and self._lockout is None
+                presented, self._unpresented = self._unpresented, []
+
+            try:
+                frame = self.compose()
+                if self.output.is_running():
+                    self.output.submit_frame(frame)
+                self.frames_composited += 1
+                for overlay in presented:
+                    overlay.on_first_frame()
+            except Exception as e:
+                print(f"LED compositor error: {e}")
+
+            if ticking:
+                with self._cond:
+                    if not self._dirty:
+                        self._cond.wait(OVERLAY_TICK)
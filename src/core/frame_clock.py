@@ -0,0 +1,207 @@
+"""Frame pacing for animations.
+
+Animations end every frame with present_frame(midi_out, delay). When the
+frame buffer carries a FrameClock, that delay is measured from the previous
+frame's *deadline* rather than from "now", so render cost no longer
+stretches the frame period. A frame that finishes after its deadline is
+counted late; if whole periods went by, those frames are counted dropped
+and the schedule skips ahead instead of bursting to catch up.
+"""
+
+import collections
+import threading
+import time
+
+# Requested delays at or above this are deliberate holds (a pause between
+# beats, a once-a-second check), not the animation's frame period
+HOLD_THRESHOLD = 0.25
+# Render times kept for percentiles
+RENDER_RING_SIZE = 240
+# An animation is over budget when more than this share of its frames
+# took longer to render than the frame period...
+OVER_BUDGET_RATIO = 0.05
+# ...measured over at least this many frames
+OVER_BUDGET_MIN_FRAMES = 20
+
+
+class FrameClock:
+    """Deadline-based frame pacing and timing counters for one animation."""
+
+    def __init__(self, name, target_fps=None):
+        """
+        Args:
+            name: Animation name (for reports)
+            target_fps: Frame rate to pace at; None = use the animation's own delays
+        """
+        self.name = name
+        self.target_fps = target_fps
+        self._lock = threading.Lock()
+        self._deadline = None
+        self._frame_start = None
+        self._run_started = None
+        self._active_time = 0.0
+        self._render_times = collections.deque(maxlen=RENDER_RING_SIZE)
+        self.frames = 0
+        self.late = 0
+        self.dropped = 0
+        self.overruns = 0
+        self.runs = 0
+        self.over_budget = False
+        self.last_period = None
+
+    def start(self):
+        """Begin a run: the first frame's deadline is measured from now."""
+        now = time.monotonic()
+        with self._lock:
+            self._deadline = now
+            self._frame_start = now
+            self._run_started = now
+            self.runs += 1
+
+    def stop(self):
+        """End a run (keeps the counters)."""
+        with self._lock:
+            if self._run_started is not None:
+                self._active_time += time.monotonic() - self._run_started
+            self._run_started = None
+            self._deadline = None
+            self._frame_start = None
+
+    def frame_time(self):
+        """Scheduled time of the current frame, in seconds since start().
+
+        Time-based animations render at this instead of "now", so their
+        motion follows the schedule (and jumps over dropped frames).
+        """
+        with self._lock:
+            if self._deadline is None or self._run_started is None:
+                return 0.0
+            return self._deadline - self._run_started
+
+    def period_for(self, delay):
+        """Frame period for a requested delay (target FPS unless it is a hold)."""
+        if self.target_fps and delay < HOLD_THRESHOLD:
+            return 1.0 / self.target_fps
+        return delay
+
+    def tick(self, delay, sleep=time.sleep):
+        """Account for the frame just presented and wait for the next deadline.
+
+        Args:
+            delay: Delay the animation asked for after this frame
+            sleep: Function used to wait (seconds)
+
+        Returns:
+            bool: True if the frame met its deadline
+        """
+        now = time.monotonic()
+        if self._deadline is None:
+            self.start()
+            now = time.monotonic()
+
+        period = self.period_for(delay)
+        render = now - self._frame_start
+        deadline = self._deadline + period
+
+        with self._lock:
+            self.frames += 1
+            self.last_period = period
+            self._render_times.append(render)
+            if period > 0 and render > period:
+                self.overruns += 1
+            on_time = now <= deadline
+            if on_time:
+                self._deadline = deadline
+            else:
+                self.late += 1
+                missed = int((now - deadline) // period) if period > 0 else 0
+                self.dropped += missed
+                # Skip ahead to the latest missed slot; the next frame is due
+                # within one period instead of bursting through the backlog
+                self._deadline = deadline + missed * period
+            self._check_budget()
+
+        if on_time and deadline > now:
+            sleep(deadline - now)
+        self._frame_start = time.monotonic()
+        return on_time
+
+    def _check_budget(self):
+        over = (
+            self.frames >= OVER_BUDGET_MIN_FRAMES
+            and self.overruns / self.frames > OVER_BUDGET_RATIO
+        )
+        if over and not self.over_budget:
+            budget_ms = (self.last_period or 0) * 1000
+            print(
+                f"⚠️ Animation '{self.name}' is over its frame budget "
+                f"({self.overruns}/{self.frames} frames slower than {budget_ms:.0f} ms)"
+            )
+        self.over_budget = over
+
+    def get_stats(self):
+        """Pacing counters and render-time percentiles.
+
+        Returns:
+            dict: frames, late, dropped, overruns, over_budget, fps,
+            target_fps, budget_ms, render_p50_ms, render_p99_ms, render_max_ms
+        """
+        with self._lock:
+            renders = sorted(self._render_times)
+            active = self._active_time
+            if self._run_started is not None:
+                active += time.monotonic() - self._run_started
+            stats = {
+                'frames': self.frames,
+                'late': self.late,
+                'dropped': self.dropped,
+                'overruns': self.overruns,
+                'over_budget': self.over_budget,
+                'runs': self.runs,
+                'fps': round(self.frames / active, 2) if active > 0 else 0.0,
+                'target_fps': self.target_fps,
+                'budget_ms': round(self.last_period * 1000, 2) if self.last_period else None,
+            }
+
+        def percentile(q):
+            if not renders:
+                return 0.0
+            return round(renders[min(len(renders) - 1, int(len(renders) * q))] * 1000, 3)
+
+        stats['render_p50_ms'] = percentile(0.5)
+        stats['render_p99_ms'] = percentile(0.99)
+        stats['render_max_ms'] = round(renders[-1] * 1000, 3) if renders else 0.0
+        return stats
+
+
+def print_frame_report(stats, cache_stats=None):
+    """Print per-animation frame pacing stats as a table (CLI 'fps' command).
+
+    Args:
+        stats: {animation name: FrameClock.get_stats()}
+        cache_stats: Optional FrameCache.get_stats() for a summary line
+    """
+    if not stats:
+        print("No animation frames yet — start an animation first.")
+        return
+
+    print("\n=== ANIMATION FRAMES ===")
+    print(
+        f"  {'animation':<22} {'fps':>6} {'target':>6} {'frames':>7} {'late':>6} "
+        f"{'dropped':>8} {'p99 ms':>8} {'budget':>7}"
+    )
+    for name, s in sorted(stats.items()):
+        target = f"{s['target_fps']:g}" if s['target_fps'] else '-'
+        budget = f"{s['budget_ms']:g}" if s['budget_ms'] else '-'
+        flag = '  ⚠️ over budget' if s['over_budget'] else ''
+        print(
+            f"  {name:<22} {s['fps']:>6.1f} {target:>6} {s['frames']:>7} {s['late']:>6} "
+            f"{s['dropped']:>8} {s['render_p99_ms']:>8.2f} {budget:>7}{flag}"
+        )
+    if cache_stats:
+        cycles = ', '.join(f"{name} ({frames})" for name, frames in cache_stats['cycles'].items()) or 'none'
+        print(
+            f"\n  Replay cache: {cache_stats['bytes'] / 1024:.0f} / {cache_stats['max_bytes'] / 1024:.0f} KiB, "
+            f"{cache_stats['hits']} hits, {cache_stats['misses']} misses — {cycles}"
+        )
+    print("========================")
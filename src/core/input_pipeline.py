@@ -0,0 +1,213 @@
+"""Non-blocking Launchpad input: callback -> dispatcher -> per-class workers."""
+
+import queue
+import threading
+import time
+
+from ..utils.latency import latency_tracker
+
+# Handler classes; each gets its own worker so a slow Spotify call in one
+# never delays another (or the LED feedback for the next press)
+HANDLER_CLASSES = ('session', 'control', 'playlist', 'user')
+
+# How long the dispatcher waits for a session handler (mode toggle, mapping
+# capture) before classifying the next press against the new mode
+SESSION_SETTLE_TIMEOUT = 0.5
+
+# An apparent MIDI delivery delay above this means the port's clock restarted
+# (reconnect); the delivery estimate is re-anchored instead of recorded
+DELIVERY_RESYNC_SECONDS = 1.0
+
+
+class _HandlerWorker:
+    """One thread running handlers of a single class in arrival order."""
+
+    def __init__(self, name):
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self.handled = 0
+        self.errors = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f'input-{self.name}', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, handler, done=None, trace=None):
+        self._queue.put((handler, done, trace, time.monotonic()))
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            handler, done, trace, submitted = item
+            previous = latency_tracker.activate(trace)
+            start = time.monotonic()
+            if trace is not None:
+                trace.record('queue_wait', submitted, start - submitted)
+            try:
+                handler()
+            except Exception as e:
+                self.errors += 1
+                print(f"Error handling {self.name} button: {e}")
+            finally:
+                self.handled += 1
+                if trace is not None:
+                    end = time.monotonic()
+                    trace.record('handler', start, end - start)
+                    trace.finish(end)
+                latency_tracker.activate(previous)
+                if done is not None:
+                    done.set()
+
+
+class InputPipeline:
+    """Moves button handling off rtmidi's callback thread.
+
+    push() is the only thing the callback does: timestamp the message and
+    put it on a lock-free SimpleQueue. A dispatcher thread decodes presses,
+    de-bounces them, triggers LED feedback right away and hands the actual
+    work to the worker for its handler class (see MidiHandler._route_press).
+    """
+
+    def __init__(self, midi_handler):
+        """
+        Args:
+            midi_handler: MidiHandler providing decode / routing / handlers
+        """
+        self.midi_handler = midi_handler
+        self._events = queue.SimpleQueue()
+        self._workers = {name: _HandlerWorker(name) for name in HANDLER_CLASSES}
+        self._thread = None
+        self._running = False
+        self.events_received = 0
+        self.presses_dispatched = 0
+        self._midi_clock = 0.0  # sum of rtmidi delta times
+        self._min_offset = None  # smallest (callback time - MIDI clock) seen
+
+    def start(self):
+        """Start the dispatcher and handler workers (idempotent)."""
+        if self._running:
+            return
+        self._running = True
+        for worker in self._workers.values():
+            worker.start()
+        self._thread = threading.Thread(target=self._dispatch_loop, name='input-dispatch', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop dispatching; handlers already queued still run."""
+        if not self._running:
+            return
+        self._running = False
+        self._events.put(None)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        for worker in self._workers.values():
+            worker.stop(timeout=timeout)
+
+    def is_running(self):
+        """True while the dispatcher accepts events."""
+        return self._running
+
+    def push(self, message):
+        """Queue a raw rtmidi message (safe to call from the MIDI callback).
+
+        Args:
+            message: rtmidi event, ([status, note, velocity], delta time)
+        """
+        received = time.monotonic()
+        self._events.put((received, message, self._delivery_delay(received, message)))
+        self.events_received += 1
+
+    def _delivery_delay(self, received, message):
+        """Estimated seconds between the MIDI backend timestamp and the callback.
+
+        rtmidi only reports the delta time since the previous message, so the
+        deltas are summed into a MIDI clock. The smallest callback-minus-clock
+        offset seen is taken as zero delay; each event's excess over it is its
+        delivery delay. Runs on the callback thread only.
+        """
+        try:
+            delta = float(message[1])
+        except (IndexError, TypeError, ValueError):
+            return None
+        self._midi_clock += delta
+        offset = received - self._midi_clock
+        if self._min_offset is None or offset < self._min_offset:
+            self._min_offset = offset
+        delay = offset - self._min_offset
+        if delay > DELIVERY_RESYNC_SECONDS:
+            self._min_offset = offset
+            return None
+        return delay
+
+    def get_stats(self):
+        """Queue depths and per-class counters for diagnostics."""
+        return {
+            'running': self._running,
+            'events_received': self.events_received,
+            'presses_dispatched': self.presses_dispatched,
+            'pending_events': self._events.qsize(),
+            'workers': {
+                name: {
+                    'pending': worker.pending(),
+                    'handled': worker.handled,
+                    'errors': worker.errors,
+                }
+                for name, worker in self._workers.items()
+            },
+        }
+
+    def _dispatch_loop(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                break
+            received, message, delivery = event
+            try:
+                self._dispatch(received, message, delivery)
+            except Exception as e:
+                print(f"Error dispatching MIDI input: {e}")
+
+    def _dispatch(self, received, message, delivery=None):
+        press = self.midi_handler._register_event(message)
+        if press is None:
+            return
+        x, y = press
+
+        kind, handler = self.midi_handler._route_press(x, y)
+        trace = latency_tracker.begin(kind or 'none', x, y, received)
+        if delivery is not None:
+            # Backend to callback; the other spans are measured from the callback
+            trace.record('midi_delivery', received - delivery, delivery)
+        previous = latency_tracker.activate(trace)
+        try:
+            # LED feedback first; the trace marks when its frame goes out
+            self.midi_handler._show_press_feedback(x, y)
+        finally:
+            latency_tracker.activate(previous)
+        trace.mark('dispatch')
+        if handler is None:
+            return
+        self.presses_dispatched += 1
+
+        if kind == 'session':
+            # Mode / mapping state decides how the next press is routed, so
+            # let it settle first (these handlers do no network I/O)
+            done = threading.Event()
+            self._workers[kind].submit(handler, done, trace)
+            done.wait(SESSION_SETTLE_TIMEOUT)
+        else:
+            self._workers[kind].submit(handler, trace=trace)
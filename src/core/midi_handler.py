@@ -1,10 +1,15 @@
 """MIDI message handler for Launchpad button presses."""
 
-import time
 import random
-from ..effects.visual_effects import create_explosion_effect
-from ..services.spotify_manager import get_active_or_default_device, format_track_info
+import time
+from functools import partial
+from ..services.spotify_manager import get_active_or_default_device
 from ..services.playlist_manager import get_playlist_id_by_name
+from ..services.playback_state import playback_state
+from .input_pipeline import InputPipeline
+
+# A "playing" snapshot younger than this decides play/pause without a request
+PLAY_STATE_FRESH_SECONDS = 2.0
 
 
 class MidiHandler:
@@ -30,13 +35,44 @@ class MidiHandler:
         self.pending_mapping = None
         self.last_mapping_message = None
         self.pending_confirmation = None
+        # Button work runs on dispatcher / worker threads, not in the callback
+        self.input_pipeline = InputPipeline(self)
+
+    def start(self):
+        """Start the input dispatcher and handler workers."""
+        self.input_pipeline.start()
+
+    def stop(self):
+        """Stop the input pipeline."""
+        self.input_pipeline.stop()
 
     def on_midi_message(self, message, time_stamp):
-        """Handle incoming MIDI messages.
+        """Handle incoming MIDI messages (rtmidi callback thread).
+
+        Only queues the message; see InputPipeline for the actual handling.
+
+        Args:
+            message: rtmidi event, ([status, note, velocity], delta time)
+            time_stamp: Callback data passed to set_callback (unused)
+        """
+        if self.input_pipeline.is_running():
+            self.input_pipeline.push(message)
+            return
+
+        # Pipeline not started: handle inline as before
+        press = self._register_event(message)
+        if press is not None:
+            self._show_press_feedback(*press)
+            self._handle_button_press(*press)
+
+    def _register_event(self, message):
+        """Decode a MIDI message and update button state.
 
         Args:
             message: MIDI message tuple (status, note, velocity)
-            time_stamp: Message timestamp
+
+        Returns:
+            tuple: (x, y) for a new button press, else None
         """
         status_byte, note, velocity = message[0]
 
@@ -57,84 +93,102 @@ class MidiHandler:
         if velocity > 0:  # Button press
             # Skip if button is already pressed
             if button_id in self.button_states and self.button_states[button_id]:
-                return
+                return None
 
             # Mark button as pressed
             self.button_states[button_id] = True
 
             print(f"Button pressed - x: {x}, y: {y}, velocity: {velocity}")
+            return x, y
 
-            # Create explosion effect
-            if self.animation_controller.launchpad.midi_out:
-                create_explosion_effect(self.animation_controller.launchpad.midi_out, x, y)
+        # Button release (velocity = 0)
+        self.button_states[button_id] = False
+        return None
 
-            self._handle_button_press(x, y)
-
-        else:  # Button release (velocity = 0)
-            # Mark button as released
-            self.button_states[button_id] = False
+    def _show_press_feedback(self, x, y):
+        """Explosion blended over the animation by the compositor."""
+        self.animation_controller.show_press_effect(x, y)
 
     def _handle_button_press(self, x, y):
-        """Handle specific button press logic.
+        """Handle specific button press logic synchronously.
 
         Args:
             x: X coordinate of pressed button
             y: Y coordinate of pressed button
         """
+        _kind, handler = self._route_press(x, y)
+        if handler:
+            handler()
+
+    def _route_press(self, x, y):
+        """Pick the handler for a button press.
+
+        Args:
+            x: X coordinate of pressed button
+            y: Y coordinate of pressed button
+
+        Returns:
+            tuple: (handler class, callable) — class is 'session', 'control',
+            'playlist' or 'user'; (None, None) if the press does nothing
+        """
         # Handle mapping mode first (highest priority)
         if self.mapping_mode:
-            self._handle_mapping_mode_button(x, y)
-            return
+            return 'session', partial(self._handle_mapping_mode_button, x, y)
 
         # Session button (4,8) - Toggle animation selection mode
         if x == 4 and y == 8:
-            mode = self.animation_controller.toggle_animation_select_mode()
-            if mode:
-                self._show_animation_selection_guide()
-            else:
-                print("Exited animation selection mode")
-            return
+            return 'session', self._toggle_session_mode
 
         # User 1 (5,8) / User 2 (6,8) - custom action modes
         if x == 5 and y == 8:
-            active = self.animation_controller.toggle_user_mode('user1')
-            print("Entered User 1 mode" if active else "Exited User 1 mode")
-            return
+            return 'session', partial(self._toggle_user_mode, 'user1')
 
         if x == 6 and y == 8:
-            active = self.animation_controller.toggle_user_mode('user2')
-            print("Entered User 2 mode" if active else "Exited User 2 mode")
-            return
+            return 'session', partial(self._toggle_user_mode, 'user2')
 
         # Play/Pause moved to right column (8,0)
         if x == 8 and y == 0:
-            self._toggle_play_pause()
-            return
+            return 'control', self._toggle_play_pause
 
         active_mode = self.animation_controller.active_mode
 
         # Handle animation selection mode
         if active_mode == 'session':
-            selected = self.animation_controller.select_animation_by_position(x, y)
-            if selected:
-                print(f"Selected animation: {selected}")
-            return
+            return 'session', partial(self._select_animation, x, y)
 
         # User action modes
         if active_mode in ('user1', 'user2'):
-            self._run_user_action(active_mode, x, y)
-            return
+            return 'user', partial(self._run_user_action, active_mode, x, y)
 
         # Mixer button (7,8) for random playlist
         if x == 7 and y == 8:
-            self._play_random_playlist()
-            return
+            return 'playlist', self._play_random_playlist
 
         # Control buttons (top row)
         if y == 8:
-            self._handle_control_button(x)
-        else:  # Regular playlist buttons
-            self._play_playlist_for_button(x, y)
+            return 'control', partial(self._handle_control_button, x)
+        # Regular playlist buttons
+        return 'playlist', partial(self._play_playlist_for_button, x, y)
+
+    def _toggle_session_mode(self):
+        """Session button: toggle animation selection mode."""
+        mode = self.animation_controller.toggle_animation_select_mode()
+        if mode:
+            self._show_animation_selection_guide()
+        else:
+            print("Exited animation selection mode")
+
+    def _toggle_user_mode(self, profile):
+        """User 1 / User 2 button: toggle that action mode."""
+        active = self.animation_controller.toggle_user_mode(profile)
+        label = 'User 1' if profile == 'user1' else 'User 2'
+        print(f"Entered {label} mode" if active else f"Exited {label} mode")
+
+    def _select_animation(self, x, y):
+        """Grid press in animation selection mode."""
+        selected = self.animation_controller.select_animation_by_position(x, y)
+        if selected:
+            print(f"Selected animation: {selected}")
 
     def _run_user_action(self, profile, x, y):
         """Run the mapped user action for a pad (grid only)."""
@@ -183,8 +237,7 @@ class MidiHandler:
                 print("No active device found")
                 return
 
-            current = sm.get_current_playback()
-            if current and current['is_playing']:
+            if self._is_playing(sm):
                 sm.api_call('pause_playback', device_id=device_id)
                 print("Playback paused")
                 self.animation_controller.stop_animation()
@@ -193,10 +246,62 @@ class MidiHandler:
                 print("Playback started")
                 if self.animation_controller.last_animation:
                     self.animation_controller.set_animation(self.animation_controller.last_animation)
+            playback_state.request_refresh()
         except Exception as e:
             if not sm.handle_api_error(e):
                 print(f"Error toggling playback: {e}")
 
+    def _change_volume(self, sm, step):
+        """Move the Spotify volume by ``step`` percent on the current device."""
+        label = 'up' if step > 0 else 'down'
+        try:
+            device_id = get_active_or_default_device(sm.spotify, sm)
+            if not device_id:
+                return
+            volume = self._current_volume(sm)
+            if volume is None:
+                print(f"Volume {label}: current volume unknown")
+                return
+            volume = max(0, min(100, volume + step))
+            sm.api_call('volume', volume, device_id=device_id)
+            # Presses before the next poll build on this volume
+            playback_state.update_local(volume_percent=volume)
+            print(f"Volume {label}: {volume}%")
+        except Exception as e:
+            if not sm.handle_api_error(e):
+                print(f"Error adjusting volume: {e}")
+
+    def _current_volume(self, sm):
+        """Volume from the shared snapshot, else from one playback request.
+
+        Returns:
+            int: Volume percent, or None if Spotify does not report one
+        """
+        snapshot = playback_state.snapshot()
+        if snapshot and snapshot.volume_percent is not None:
+            return snapshot.volume_percent
+        # No poll yet (start-up, poller stopped or suspended): ask directly
+        current = sm.get_current_playback()
+        device = (current or {}).get('device') or {}
+        return device.get('volume_percent')
+
+    def _is_playing(self, sm):
+        """Whether Spotify is playing, from a fresh snapshot or one playback request.
+
+        Only a recent "playing" snapshot is trusted: while the poller backs
+        off, waits for auth or has not polled yet, playback may have been
+        started from another client.
+        """
+        snapshot = playback_state.snapshot()
+        if (snapshot and snapshot.is_playing and
+                time.monotonic() - snapshot.fetched_at <= PLAY_STATE_FRESH_SECONDS):
+            return True
+        current = sm.get_current_playback()
+        if current is None:
+            # Nothing playing anywhere, or the request failed: go by the snapshot
+            return bool(snapshot and snapshot.is_playing)
+        return bool(current.get('is_playing'))
+
     def _handle_control_button(self, x):
         """Handle control button presses in top row.
 
@@ -209,40 +314,19 @@ class MidiHandler:
         sm = self.spotify_manager
 
         if x == 0:  # Volume Up
-            try:
-                device_id = get_active_or_default_device(sm.spotify, sm)
-                if device_id:
-                    current = sm.get_current_playback()
-                    if current and current['device']:
-                        volume = min(100, current['device']['volume_percent'] + 10)
-                        sm.api_call('volume', volume, device_id=device_id)
-                        print(f"Volume up: {volume}%")
-            except Exception as e:
-                if not sm.handle_api_error(e):
-                    print(f"Error adjusting volume: {e}")
+            self._change_volume(sm, 10)
 
         elif x == 1:  # Volume Down
-            try:
-                device_id = get_active_or_default_device(sm.spotify, sm)
-                if device_id:
-                    current = sm.get_current_playback()
-                    if current and current['device']:
-                        volume = max(0, current['device']['volume_percent'] - 10)
-                        sm.api_call('volume', volume, device_id=device_id)
-                        print(f"Volume down: {volume}%")
-            except Exception as e:
-                if not sm.handle_api_error(e):
-                    print(f"Error adjusting volume: {e}")
+            self._change_volume(sm, -10)
 
         elif x == 2:  # Previous Track
             try:
                 device_id = get_active_or_default_device(sm.spotify, sm)
                 if device_id:
                     sm.api_call('previous_track', device_id=device_id)
-                    time.sleep(0.1)
-                    current = sm.get_current_playback()
-                    if current and current['item']:
-                        print(f"Previous track: {format_track_info(current['item'], current['progress_ms'])}")
+                    print("Previous track")
+                    # The status monitor prints the new track once it is polled
+                    playback_state.request_refresh()
             except Exception as e:
                 if not sm.handle_api_error(e):
                     print(f"Error: {e}")
@@ -252,10 +336,9 @@ class MidiHandler:
                 device_id = get_active_or_default_device(sm.spotify, sm)
                 if device_id:
                     sm.api_call('next_track', device_id=device_id)
-                    time.sleep(0.1)
-                    current = sm.get_current_playback()
-                    if current and current['item']:
-                        print(f"Next track: {format_track_info(current['item'], current['progress_ms'])}")
+                    print("Next track")
+                    # The status monitor prints the new track once it is polled
+                    playback_state.request_refresh()
             except Exception as e:
                 if not sm.handle_api_error(e):
                     print(f"Error: {e}")
@@ -297,11 +380,7 @@ class MidiHandler:
                     device_id=device_id,
                     context_uri=f'spotify:playlist:{playlist_id}'
                 )
-                # Wait briefly for playback to start
-                time.sleep(0.1)
-                current = sm.get_current_playback()
-                if current and current['item']:
-                    print(f"Playing: {format_track_info(current['item'], current['progress_ms'])}")
+                playback_state.request_refresh()
                 print(f"Playing playlist: {playlist_name}")
             else:
                 print(f"Playlist not found: {playlist_name}")
@@ -338,11 +417,7 @@ class MidiHandler:
                         device_id=device_id,
                         context_uri=f'spotify:playlist:{playlist_id}'
                     )
-                    # Wait briefly for playback to start
-                    time.sleep(0.1)
-                    current = sm.get_current_playback()
-                    if current and current['item']:
-                        print(f"Playing: {format_track_info(current['item'], current['progress_ms'])}")
+                    playback_state.request_refresh()
                     print(f"Playing playlist: {random_playlist}")
 
                     # Update animation if specified
@@ -1,108 +1,94 @@
 """Spotify status monitoring for automatic animation changes."""
 
 import random
-import threading
-import time
 
 from ..animations import ANIMATIONS
+from ..services.playback_state import playback_state
 from ..services.spotify_manager import format_track_info, is_auth_failure
 
-# Never auto-pick these for "random song" fallback
-_RANDOM_ANIMATION_EXCLUDE = {
-    'equalizer_microphone',
-    # Spotify audio-features dependent (often 403 / disabled)
-    'spotify_spectrum',
-    'energy_bars',
-    'tempo_pulse',
-    'adaptive_rainbow',
-    'adaptive_pulse',
-    'adaptive_sparkle',
-    'adaptive_matrix',
-    'auto_select',
-}
+
+def _random_animation_candidates(audio_analyzer=None):
+    """Animations the "random song" fallback may pick.
+
+    The microphone equalizer is never auto-picked. Audio-reactive ones are
+    picked only with live analysis — Spotify audio features often 403.
+    """
+    live = bool(audio_analyzer and audio_analyzer.is_live and audio_analyzer.is_enabled())
+    return [
+        descriptor.name for descriptor in ANIMATIONS.descriptors()
+        if not descriptor.needs_audio and (live or not descriptor.needs_analyzer)
+    ]
 
 
 class StatusMonitor:
-    """Monitors Spotify playback status and updates animations accordingly."""
+    """Monitors Spotify playback status and updates animations accordingly.
 
-    def __init__(self, spotify_manager, animation_controller, playlist_manager):
+    Runs on the shared playback_state poller: each published snapshot is
+    handled in _on_playback().
+    """
+
+    def __init__(self, spotify_manager, animation_controller, playlist_manager, playback=None):
         self.spotify_manager = spotify_manager
         self.animation_controller = animation_controller
         self.playlist_manager = playlist_manager
-        self.should_run = True
-        self.monitor_thread = None
+        self.playback = playback if playback is not None else playback_state
+        self._unsubscribe = None
+        self._last_track_id = None
+        self._last_is_playing = None
+        self._last_playlist_id = object()  # sentinel so first context always "changes"
 
     def start(self):
-        """Start the status monitoring thread."""
-        self.should_run = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        """Start following playback snapshots."""
+        self.stop()
+        self._unsubscribe = self.playback.subscribe(self._on_playback)
+        self.playback.start(self.spotify_manager)
 
     def stop(self):
-        """Stop the status monitoring thread."""
-        self.should_run = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
-            self.monitor_thread = None
-
-    def _monitor_loop(self):
-        """Main monitoring loop."""
-        last_track_id = None
-        last_is_playing = None
-        last_playlist_id = object()  # sentinel so first context always "changes"
-
-        while self.should_run:
-            try:
-                # Wait quietly while auth is broken instead of spamming API errors
-                if (not self.spotify_manager or
-                        self.spotify_manager.needs_reauth or
-                        not self.spotify_manager.spotify):
-                    time.sleep(2)
-                    continue
-
-                current = self.spotify_manager.get_current_playback()
-
-                if current:
-                    track_id = current['item']['id'] if current.get('item') else None
-                    is_playing = bool(current.get('is_playing'))
-                    playlist_id = self._playlist_id_from_context(current.get('context'))
-
-                    track_changed = track_id != last_track_id
-                    play_state_changed = is_playing != last_is_playing
-                    context_changed = playlist_id != last_playlist_id
-
-                    if track_changed and current.get('item'):
-                        print(f"Now playing: {format_track_info(current['item'], current['progress_ms'])}")
-
-                    if play_state_changed:
-                        print(f"Playback {'resumed' if is_playing else 'paused'}")
-
-                    if not is_playing:
-                        if self.animation_controller.current_animation:
-                            self.animation_controller.stop_animation()
-                    else:
-                        self._sync_animation_for_playback(
-                            playlist_id=playlist_id,
-                            context_changed=context_changed,
-                            play_state_changed=play_state_changed,
-                        )
-
-                    last_track_id = track_id
-                    last_is_playing = is_playing
-                    last_playlist_id = playlist_id
-
-                time.sleep(1)  # Poll every second
-
-            except Exception as e:
-                from ..services.spotify_manager import is_transient_token_error
-                if is_auth_failure(e):
-                    self.spotify_manager.mark_auth_failed(e)
-                    continue
-                if is_transient_token_error(e):
-                    time.sleep(1)
-                    continue
-                print(f"Status monitor error: {e}")
-                time.sleep(5)  # Wait longer on error
+        """Stop following playback snapshots."""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _on_playback(self, snapshot, changes):
+        """React to one playback snapshot (called on the poller thread)."""
+        if not snapshot.active:
+            # Nothing playing anywhere: leave the current state alone
+            return
+
+        try:
+            track_id = snapshot.track_id
+            is_playing = snapshot.is_playing
+            playlist_id = self._playlist_id_from_context(snapshot.context)
+
+            track_changed = track_id != self._last_track_id
+            play_state_changed = is_playing != self._last_is_playing
+            context_changed = playlist_id != self._last_playlist_id
+
+            if track_changed and snapshot.track:
+                print(f"Now playing: {format_track_info(snapshot.track, snapshot.progress_ms)}")
+
+            if play_state_changed:
+                print(f"Playback {'resumed' if is_playing else 'paused'}")
+
+            if not is_playing:
+                if self.animation_controller.current_animation:
+                    self.animation_controller.stop_animation()
+            else:
+                self._sync_animation_for_playback(
+                    playlist_id=playlist_id,
+                    context_changed=context_changed,
+                    play_state_changed=play_state_changed,
+                )
+
+            self._last_track_id = track_id
+            self._last_is_playing = is_playing
+            self._last_playlist_id = playlist_id
+
+        except Exception as e:
+            if is_auth_failure(e):
+                self.spotify_manager.mark_auth_failed(e)
+                return
+            print(f"Status monitor error: {e}")
 
     def _playlist_id_from_context(self, context):
         """Return Spotify playlist id from playback context, or None."""
@@ -149,10 +135,7 @@ class StatusMonitor:
         if getattr(ac, 'auth_lockout', False):
             return
 
-        choices = [
-            name for name in ANIMATIONS.keys()
-            if name not in _RANDOM_ANIMATION_EXCLUDE
-        ]
+        choices = _random_animation_candidates(getattr(ac, 'audio_analyzer', None))
         if not choices:
             return
 
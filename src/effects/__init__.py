@@ -3,6 +3,6 @@
 This module contains effect functions like explosions, transitions, and other visual enhancements.
 """
 
-from .visual_effects import create_explosion_effect
+from .visual_effects import ExplosionOverlay, create_explosion_effect
 
-__all__ = ['create_explosion_effect']
+__all__ = ['ExplosionOverlay', 'create_explosion_effect']
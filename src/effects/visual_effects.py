@@ -39,3 +39,48 @@ def create_explosion_effect(midi_out, center_x, center_y, color=(255, 255, 255),
                     set_color(midi_out, x, y, r, g, b)
 
         time.sleep(0.01)
+
+
+class ExplosionOverlay:
+    """Compositor overlay version of create_explosion_effect.
+
+    Instead of drawing over the animation with its own MIDI writes, it is
+    blended on top of it by LedCompositor, fading out with distance and time.
+    """
+
+    priority = 10
+
+    def __init__(self, center_x, center_y, color=(255, 255, 255), duration=0.1, max_radius=3):
+        """
+        Args:
+            center_x: X coordinate of explosion center
+            center_y: Y coordinate of explosion center
+            color: RGB color tuple for explosion
+            duration: Duration of effect in seconds
+            max_radius: Maximum radius of explosion
+        """
+        self.center_x = center_x
+        self.center_y = center_y
+        self.color = color
+        self.duration = duration
+        self.max_radius = max_radius
+        self.start_time = time.monotonic()
+
+    def pixels(self, now):
+        """Return (index, color, alpha) tuples for ``now``, or None when finished."""
+        progress = (now - self.start_time) / self.duration
+        if progress >= 1.0:
+            return None
+        current_radius = progress * self.max_radius
+
+        pixels = []
+        for y in range(max(0, int(self.center_y - self.max_radius)), min(9, int(self.center_y + self.max_radius + 1))):
+            for x in range(max(0, int(self.center_x - self.max_radius)), min(9, int(self.center_x + self.max_radius + 1))):
+                dx = x - self.center_x
+                dy = y - self.center_y
+                distance = math.sqrt(dx*dx + dy*dy)
+
+                if distance <= current_radius:
+                    alpha = (1.0 - distance/self.max_radius) * (1.0 - progress)
+                    pixels.append((y * 9 + x, self.color, alpha))
+        return pixels
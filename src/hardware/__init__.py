@@ -7,15 +7,37 @@ from .launchpad import (
     initialize_launchpad,
     set_color,
     clear_all,
-    LaunchpadManager
+    fill_all,
+    fill_row,
+    fill_column,
+    present_frame,
+    AnimationCancelled,
+    LaunchpadManager,
+    LaunchpadFrameBuffer,
 )
 
-from .audio import initialize_audio
+from .virtual import VirtualLaunchpad, get_virtual_launchpad
+from .audio import AudioCaptureService, AudioRingBuffer, audio_capture, initialize_audio
+from .spectral import SpectralBandEngine, analysis_window, log_filterbank
 
 __all__ = [
     'initialize_launchpad',
     'set_color',
     'clear_all',
+    'fill_all',
+    'fill_row',
+    'fill_column',
+    'present_frame',
+    'AnimationCancelled',
     'LaunchpadManager',
-    'initialize_audio'
+    'LaunchpadFrameBuffer',
+    'VirtualLaunchpad',
+    'get_virtual_launchpad',
+    'AudioCaptureService',
+    'AudioRingBuffer',
+    'audio_capture',
+    'initialize_audio',
+    'SpectralBandEngine',
+    'analysis_window',
+    'log_filterbank'
 ]
@@ -1,7 +1,29 @@
-"""Audio input interface for microphone-based animations."""
+"""Audio input interface for microphone-based animations.
 
+One long-lived capture thread (audio_capture) reads the microphone into a
+preallocated float32 ring buffer. Animations acquire() the service and read
+the latest window with latest(), which returns a read-only view into the
+ring — no copy, no blocking — so frame timing never waits on audio buffer
+timing and any number of animations can share the input.
+"""
+
+import threading
+import time
+
+import numpy as np
 import pyaudio
 
+# Capture format
+SAMPLE_RATE = 44100
+CHUNK = 2048
+# Seconds of audio kept in the ring buffer
+RING_SECONDS = 2.0
+# Keep the stream open this long after the last consumer releases it, so
+# switching between microphone animations doesn't reopen the device
+IDLE_STOP_SECONDS = 10.0
+# PortAudio error code raised by a read after the input overflowed
+_INPUT_OVERFLOWED = -9981
+
 
 def initialize_audio():
     """Initialize audio input for microphone-based visualizations.
@@ -14,11 +36,244 @@ def initialize_audio():
         stream = p.open(
             format=pyaudio.paFloat32,
             channels=1,
-            rate=44100,
+            rate=SAMPLE_RATE,
             input=True,
-            frames_per_buffer=2048
+            frames_per_buffer=CHUNK
         )
         return p, stream
     except Exception as e:
         print(f"Error initializing audio: {e}")
         return None, None
+
+
+class AudioRingBuffer:
+    """Single-writer float32 ring buffer with zero-copy windows.
+
+    Every sample is stored twice, at ``i`` and ``i + capacity``, so the
+    newest ``n <= capacity`` samples are always one contiguous slice.
+    """
+
+    def __init__(self, capacity, sample_rate=SAMPLE_RATE):
+        """
+        Args:
+            capacity: Samples kept (older ones are overwritten)
+            sample_rate: Rate the samples are written at (Hz)
+        """
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self._data = np.zeros(2 * capacity, dtype=np.float32)
+        self._write_index = 0
+        # Total samples ever written; readers use it as a cursor
+        self.written = 0
+        # (written, time.monotonic()) after the latest write, set in one step
+        # so readers can map sample positions to time
+        self.last_write = None
+
+    def write(self, samples):
+        """Append samples (only the newest ``capacity`` are kept)."""
+        samples = samples[-self.capacity:]
+        n = len(samples)
+        if n == 0:
+            return
+        capacity = self.capacity
+        start = self._write_index
+        first = min(n, capacity - start)
+        data = self._data
+        data[start:start + first] = samples[:first]
+        data[start + capacity:start + capacity + first] = samples[:first]
+        if first < n:
+            rest = n - first
+            data[:rest] = samples[first:]
+            data[capacity:capacity + rest] = samples[first:]
+        self._write_index = (start + n) % capacity
+        # Publish after the samples are in place
+        self.written += n
+        self.last_write = (self.written, time.monotonic())
+
+    def latest(self, n):
+        """Read-only view of the newest ``n`` samples, or None until that many exist.
+
+        The view stays valid until the writer wraps around to it
+        (``capacity - n`` samples later); copy it to keep it longer.
+        """
+        return self.window(self.written, n)
+
+    def position_at(self, when):
+        """Estimated sample position being captured at time.monotonic() ``when``."""
+        last_write = self.last_write
+        if last_write is None:
+            return None
+        written, written_at = last_write
+        return written + (when - written_at) * self.sample_rate
+
+    def window(self, end, n):
+        """Read-only view of the ``n`` samples before absolute position ``end``.
+
+        Args:
+            end: Sample count the window ends at (e.g. a reader's cursor)
+            n: Window length
+
+        Returns:
+            np.ndarray | None: None if those samples aren't written yet or
+            were already overwritten
+        """
+        if n > self.capacity or end < n or end > self.written or self.written - (end - n) > self.capacity:
+            return None
+        stop = (end % self.capacity) + self.capacity
+        view = self._data[stop - n:stop]
+        view.flags.writeable = False
+        return view
+
+
+class AudioCaptureService:
+    """Shared microphone capture thread feeding an AudioRingBuffer."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, chunk=CHUNK, ring_seconds=RING_SECONDS,
+                 idle_stop_seconds=IDLE_STOP_SECONDS):
+        """
+        Args:
+            sample_rate: Capture rate in Hz
+            chunk: Samples per device read
+            ring_seconds: Length of the ring buffer
+            idle_stop_seconds: Close the device this long after the last release()
+        """
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.idle_stop_seconds = idle_stop_seconds
+        self.ring = AudioRingBuffer(max(chunk, int(sample_rate * ring_seconds)), sample_rate)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._open = False
+        self._consumers = 0
+        self._released_at = None
+        self.overflows = 0
+        self.read_errors = 0
+        self.last_error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._open
+
+    def acquire(self, timeout=2.0):
+        """Register a consumer, starting capture if needed.
+
+        Returns:
+            bool: True if the microphone is capturing
+        """
+        with self._lock:
+            self._consumers += 1
+            self._released_at = None
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._ready.clear()
+                self._open = False
+                self._thread = threading.Thread(target=self._capture_loop, name='audio-capture', daemon=True)
+                self._thread.start()
+        self._ready.wait(timeout)
+        if not self.running:
+            self.release()
+            return False
+        return True
+
+    def release(self):
+        """Unregister a consumer; capture stops after the idle delay."""
+        with self._lock:
+            self._consumers = max(0, self._consumers - 1)
+            if self._consumers == 0:
+                self._released_at = time.monotonic()
+
+    def latest(self, n=None):
+        """Newest ``n`` samples (default: one chunk) as a read-only view, or None."""
+        return self.ring.latest(n or self.chunk)
+
+    def stop(self, timeout=1.0):
+        """Stop capturing and close the device (application shutdown)."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+    def get_stats(self):
+        """Capture state and counters."""
+        return {
+            'running': self.running,
+            'consumers': self._consumers,
+            'sample_rate': self.sample_rate,
+            'chunk': self.chunk,
+            'ring_samples': self.ring.capacity,
+            'samples_captured': self.ring.written,
+            'overflows': self.overflows,
+            'read_errors': self.read_errors,
+            'last_error': self.last_error,
+        }
+
+    def _should_stop(self):
+        # Decided under the lock so a concurrent acquire() either keeps this
+        # thread or starts a new one
+        with self._lock:
+            idle = (
+                self._consumers == 0
+                and self._released_at is not None
+                and time.monotonic() - self._released_at >= self.idle_stop_seconds
+            )
+            if not (self._stop.is_set() or idle):
+                return False
+            if self._thread is threading.current_thread():
+                self._thread = None
+                self._open = False
+            return True
+
+    def _capture_loop(self):
+        p = stream = None
+        try:
+            p = pyaudio.PyAudio()
+            stream = p.open(
+                format=pyaudio.paFloat32,
+                channels=1,
+                rate=self.sample_rate,
+                input=True,
+                frames_per_buffer=self.chunk
+            )
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Error initializing audio: {e}")
+            if p is not None:
+                p.terminate()
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+            self._ready.set()
+            return
+
+        self._open = True
+        self._ready.set()
+        silence = np.zeros(self.chunk, dtype=np.float32)
+        try:
+            while not self._should_stop():
+                try:
+                    data = stream.read(self.chunk, exception_on_overflow=True)
+                except IOError as e:
+                    if getattr(e, 'errno', None) == _INPUT_OVERFLOWED:
+                        # PyAudio dropped the chunk it read; write silence in
+                        # its place so the ring's sample count (the live
+                        # analyzer's clock) stays continuous
+                        self.overflows += 1
+                        self.ring.write(silence)
+                        continue
+                    self.read_errors += 1
+                    self.last_error = str(e)
+                    time.sleep(0.05)
+                    continue
+                self.ring.write(np.frombuffer(data, dtype=np.float32))
+        finally:
+            try:
+                stream.stop_stream()
+                stream.close()
+            finally:
+                p.terminate()
+
+
+# Global capture service shared by microphone animations
+audio_capture = AudioCaptureService()
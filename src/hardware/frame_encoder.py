@@ -0,0 +1,137 @@
+"""Vectorized output path: (9, 9, 3) RGB arrays straight to Launchpad SysEx.
+
+Array-based animations build a whole frame as one ``numpy`` array indexed
+``frame[y, x] = (r, g, b)`` (y = 0 is the bottom row, same coordinates as
+set_color). Quantization, pad locks and note mapping are applied in one
+step here instead of per pixel.
+"""
+
+import numpy as np
+
+from .launchpad import (
+    GRID_SIZE,
+    MAX_LEDS_PER_SYSEX,
+    PAD_COUNT,
+    SYSEX_RGB_HEADER,
+    LaunchpadFrameBuffer,
+    _PAD_NOTES,
+    _locked_pads,
+    _track_direct_writes,
+)
+
+FRAME_SHAPE = (GRID_SIZE, GRID_SIZE, 3)
+
+# Note number per pad, in the same [y, x] order as a frame
+NOTE_GRID = np.array(_PAD_NOTES, dtype=np.uint8).reshape(GRID_SIZE, GRID_SIZE)
+
+_HEADER = bytes(SYSEX_RGB_HEADER)
+_FOOTER = b'\xf7'
+
+
+def new_frame():
+    """Return a black (9, 9, 3) uint8 frame."""
+    return np.zeros(FRAME_SHAPE, dtype=np.uint8)
+
+
+def quantize_frame(frame, apply_locks=True):
+    """Scale a 0-255 frame to the pad's 0-63 range and overlay locked pads.
+
+    Args:
+        frame: Array-like of shape (9, 9, 3), or a stack of them (..., 9, 9, 3);
+            ints or floats in 0-255
+        apply_locks: If True, locked pads keep their locked color
+
+    Returns:
+        np.ndarray: uint8 frame(s) of the same shape with 6-bit channels
+    """
+    frame = np.asarray(frame)
+    if frame.shape[-3:] != FRAME_SHAPE:
+        raise ValueError(f"Frame must have shape {FRAME_SHAPE}, got {frame.shape}")
+
+    if frame.dtype == np.uint8:
+        quantized = (frame.astype(np.uint16) * 63 // 255).astype(np.uint8)
+    else:
+        quantized = (np.clip(frame, 0, 255) * (63 / 255)).astype(np.uint8)
+
+    if apply_locks and _locked_pads:
+        for (x, y), (r, g, b) in list(_locked_pads.items()):
+            quantized[..., y, x, :] = (
+                min(63, int(r * 63 / 255)),
+                min(63, int(g * 63 / 255)),
+                min(63, int(b * 63 / 255)),
+            )
+    return quantized
+
+
+def pack_frame(quantized):
+    """Pack a quantized frame into 81 ints (6 bits per channel, pad index order).
+
+    A stack of frames (..., 9, 9, 3) packs to (..., 81).
+    """
+    q = quantized.reshape(quantized.shape[:-3] + (PAD_COUNT, 3)).astype(np.uint32)
+    return (q[..., 0] << 12) | (q[..., 1] << 6) | q[..., 2]
+
+
+def unpack_frame(packed):
+    """Expand 81 packed 6-bit colors back to a (9, 9, 3) uint8 frame in 0-255."""
+    packed = np.asarray(packed, dtype=np.uint32)
+    channels = np.stack(((packed >> 12) & 0x3F, (packed >> 6) & 0x3F, packed & 0x3F), axis=-1)
+    return (channels * 255 // 63).astype(np.uint8).reshape(FRAME_SHAPE)
+
+
+def encode_frame(frame, mask=None, apply_locks=True):
+    """Encode a frame as batched RGB SysEx messages.
+
+    Args:
+        frame: (9, 9, 3) array in 0-255
+        mask: Optional (9, 9) bool array; only pads where it is True are sent
+        apply_locks: If True, locked pads keep their locked color
+
+    Returns:
+        list[bytes]: Complete SysEx messages (header ... F7)
+    """
+    return _encode_quantized(quantize_frame(frame, apply_locks=apply_locks), mask)
+
+
+def _encode_quantized(quantized, mask=None):
+    # One (note, r, g, b) row per pad, laid out exactly like the SysEx payload
+    payload = np.empty((GRID_SIZE, GRID_SIZE, 4), dtype=np.uint8)
+    payload[..., 0] = NOTE_GRID
+    payload[..., 1:] = quantized
+    payload = payload.reshape(PAD_COUNT, 4)
+    if mask is not None:
+        payload = payload[np.asarray(mask, dtype=bool).reshape(PAD_COUNT)]
+
+    return [
+        _HEADER + payload[start:start + MAX_LEDS_PER_SYSEX].tobytes() + _FOOTER
+        for start in range(0, len(payload), MAX_LEDS_PER_SYSEX)
+    ]
+
+
+def send_frame(midi_out, frame, force=False):
+    """Show a whole (9, 9, 3) frame on the pad.
+
+    With a LaunchpadFrameBuffer the frame replaces the back buffer and goes
+    out on the next commit (diffed, locks applied there). With a plain MIDI
+    port the full frame is sent immediately in batched messages.
+
+    Args:
+        midi_out: MIDI output device or LaunchpadFrameBuffer
+        frame: (9, 9, 3) array in 0-255
+        force: If True, ignore pad locks (plain MIDI port only)
+    """
+    if not midi_out:
+        return
+
+    if isinstance(midi_out, LaunchpadFrameBuffer):
+        midi_out.set_packed(pack_frame(quantize_frame(frame, apply_locks=False)).tolist())
+        return
+
+    quantized = quantize_frame(frame, apply_locks=not force)
+    for message in _encode_quantized(quantized):
+        try:
+            midi_out.send_message(message)
+        except Exception:
+            # Device may have been unplugged mid-frame
+            return
+    _track_direct_writes(midi_out, list(enumerate(pack_frame(quantized).tolist())))
@@ -2,25 +2,59 @@
 
 import gc
 import sys
+import threading
 import time
+import weakref
 
 import rtmidi
 
 # Pads that keep a fixed color; animations / clear / fill cannot override them
 # unless set_color(..., force=True) is used (e.g. auth lockout).
 _locked_pads = {}  # {(x, y): (r, g, b)}
+_locks_version = 0  # bumped on every lock change (compositor caches the lock layer)
+
+# Frame buffers that mirror what is on the pad; direct set_color() writes
+# (button effects, health probe) update their committed state.
+_frame_buffers = weakref.WeakSet()
 
 LAUNCHPAD_PORT_HINTS = ('launchpad', 'focusrite', 'novation')
 
+GRID_SIZE = 9
+PAD_COUNT = GRID_SIZE * GRID_SIZE
+
+# "Set LEDs (RGB)" SysEx: header, then <note> <r> <g> <b> per pad, then F7.
+SYSEX_RGB_HEADER = (0xF0, 0x00, 0x20, 0x29, 0x02, 0x18, 0x0B)
+# The MK2 programmer's reference allows up to 80 LEDs per message.
+MAX_LEDS_PER_SYSEX = 80
+
+# Single-message bulk commands (palette color, not RGB)
+SYSEX_LIGHT_COLUMN = 0x0C
+SYSEX_LIGHT_ROW = 0x0D
+SYSEX_LIGHT_ALL = 0x0E
+
+# RGB colors with an equivalent entry in the MK2 128-color palette; only these
+# can use the bulk commands above.
+_PALETTE_INDEX = {
+    (0, 0, 0): 0,
+    (255, 255, 255): 3,
+    (255, 0, 0): 5,
+    (0, 255, 0): 21,
+    (0, 0, 255): 45,
+}
+
 
 class LaunchpadManager:
     """Manages Launchpad MK2 hardware communication."""
 
     def __init__(self):
+        from .midi_output import MidiOutputWriter
+
         self.midi_out = None
         self.midi_in = None
         self.port_name = None
         self._last_connected = None  # None unknown, True/False after checks
+        # All LED writes go through this thread once initialize() has run
+        self.output = MidiOutputWriter(self)
 
     def initialize(self):
         """Try to open Launchpad MIDI ports.
@@ -29,6 +63,7 @@ class LaunchpadManager:
         MidiHealthMonitor will reconnect when the device appears.
         """
         self.midi_out, self.midi_in, self.port_name = initialize_launchpad(fatal=False)
+        self.output.start()
         if self.midi_out:
             self._enter_programmer_mode()
             self._last_connected = True
@@ -43,33 +78,34 @@ class LaunchpadManager:
     def _enter_programmer_mode(self):
         if not self.midi_out:
             return
-        try:
-            self.midi_out.send_message([240, 0, 32, 41, 2, 24, 14, 1, 247])
-        except Exception:
-            pass
+        self.output.invalidate()
+        self.output.send_message([240, 0, 32, 41, 2, 24, 14, 1, 247])
 
     def close(self):
         """Close MIDI connections."""
         unlock_all_pads()
+        self.output.stop()
         self._close_ports_quietly()
         self.port_name = None
         self._last_connected = False
 
     def _close_ports_quietly(self):
-        if self.midi_out:
-            try:
-                if self.midi_out.is_port_open():
-                    try:
-                        clear_all(self.midi_out, force=True)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            _discard_midi_client(self.midi_out)
-            self.midi_out = None
-        if self.midi_in:
-            _discard_midi_client(self.midi_in)
-            self.midi_in = None
+        # Keep the output thread off the port while it is torn down
+        with self.output.port_lock:
+            if self.midi_out:
+                try:
+                    if self.midi_out.is_port_open():
+                        try:
+                            clear_all(self.midi_out, force=True)
+                        except Exception:
+                            pass
+                except Exception:
+                    pass
+                _discard_midi_client(self.midi_out)
+                self.midi_out = None
+            if self.midi_in:
+                _discard_midi_client(self.midi_in)
+                self.midi_in = None
 
     def is_connected(self):
         """Return cached connection flag (updated by check_connection)."""
@@ -91,28 +127,35 @@ class LaunchpadManager:
             return False
 
         try:
-            if hasattr(self.midi_out, 'is_port_open') and not self.midi_out.is_port_open():
+            with self.output.port_lock:
+                if hasattr(self.midi_out, 'is_port_open') and not self.midi_out.is_port_open():
+                    self._last_connected = False
+                    return False
+                if hasattr(self.midi_in, 'is_port_open') and not self.midi_in.is_port_open():
+                    self._last_connected = False
+                    return False
+
+                ports = list(self.midi_out.get_ports() or [])
+            if self.port_name and self.port_name not in ports:
                 self._last_connected = False
                 return False
-            if hasattr(self.midi_in, 'is_port_open') and not self.midi_in.is_port_open():
+            if not any(_looks_like_launchpad(p) for p in ports):
                 self._last_connected = False
                 return False
 
-            ports = list(self.midi_out.get_ports() or [])
-            if self.port_name and self.port_name not in ports:
-                self._last_connected = False
-                return False
-            if not any(_looks_like_launchpad(p) for p in ports):
+            # A write that failed since the last check means the device is gone
+            if self.output.last_send_failed():
                 self._last_connected = False
                 return False
 
             # Gentle write probe: re-assert a locked pad, or a no-op black on (8,8)
             # — never send layout/programmer SysEx here (it clears the pad).
+            # Queued on the output thread; a failure shows up on the next check.
             if _locked_pads:
                 (lx, ly), (lr, lg, lb) = next(iter(_locked_pads.items()))
-                set_color(self.midi_out, lx, ly, lr, lg, lb, force=True)
+                set_color(self.output, lx, ly, lr, lg, lb, force=True)
             else:
-                set_color(self.midi_out, 8, 8, 0, 0, 0, force=True)
+                set_color(self.output, 8, 8, 0, 0, 0, force=True)
             self._last_connected = True
             return True
         except Exception:
@@ -143,9 +186,10 @@ class LaunchpadManager:
             self._last_connected = False
             return False
 
-        self.midi_out = midi_out
-        self.midi_in = midi_in
-        self.port_name = port_name
+        with self.output.port_lock:
+            self.midi_out = midi_out
+            self.midi_in = midi_in
+            self.port_name = port_name
         self._enter_programmer_mode()
         self._last_connected = True
         return True
@@ -157,6 +201,7 @@ class LaunchpadManager:
         return {
             'connected': connected,
             'port_name': self.port_name if connected else None,
+            'output': self.output.get_stats(),
         }
 
 
@@ -225,7 +270,18 @@ def _find_matching_in_port(out_name, in_ports):
 
 
 def _new_midi_clients():
-    """Create MidiOut/MidiIn, preferring CoreMIDI on macOS."""
+    """Create MidiOut/MidiIn, preferring CoreMIDI on macOS.
+
+    Returns VirtualLaunchpad clients when the virtual pad is enabled
+    (LAUNCHPAD_VIRTUAL=1 / app setting), so the rest is unchanged.
+    """
+    from ..utils.config_manager import config_manager
+
+    if config_manager.is_virtual_launchpad_enabled():
+        from .virtual import get_virtual_launchpad
+        device = get_virtual_launchpad(config_manager.get_virtual_launchpad_bytes_per_second())
+        return device.create_clients()
+
     try:
         if rtmidi.API_MACOSX_CORE in (rtmidi.get_compiled_api() or []):
             return (
@@ -412,7 +468,9 @@ def lock_pad(midi_out, x, y, r, g, b):
         g: Green value (0-255)
         b: Blue value (0-255)
     """
+    global _locks_version
     _locked_pads[(x, y)] = (r, g, b)
+    _locks_version += 1
     if midi_out:
         set_color(midi_out, x, y, r, g, b, force=True)
 
@@ -426,29 +484,410 @@ def unlock_pad(midi_out, x, y, clear=True):
         y: Y coordinate (0-8)
         clear: If True and midi_out is set, turn the pad off after unlock
     """
+    global _locks_version
     _locked_pads.pop((x, y), None)
+    _locks_version += 1
     if clear and midi_out:
         set_color(midi_out, x, y, 0, 0, 0, force=True)
 
 
 def unlock_all_pads():
     """Remove all pad color locks."""
+    global _locks_version
     _locked_pads.clear()
+    _locks_version += 1
 
 
 def reassert_locked_pads(midi_out):
     """Force-write every locked pad color (call after bulk LED updates)."""
     if not midi_out or not _locked_pads:
         return
-    for (x, y), (r, g, b) in list(_locked_pads.items()):
-        set_color(midi_out, x, y, r, g, b, force=True)
+    pads = [
+        (y * GRID_SIZE + x, pack_color(r, g, b))
+        for (x, y), (r, g, b) in list(_locked_pads.items())
+    ]
+    if send_pad_batch(midi_out, pads):
+        _track_direct_writes(midi_out, pads)
+
+
+def pad_note(x, y):
+    """Return the programmer-mode MIDI note for pad (x, y)."""
+    if x == 8 and y == 8:
+        return 99
+    if y == 8:
+        return 104 + x
+    if x == 8:
+        return 19 + (y * 10)
+    return 11 + x + (y * 10)
+
+
+# Note number per pad index (y * 9 + x)
+_PAD_NOTES = [pad_note(i % GRID_SIZE, i // GRID_SIZE) for i in range(PAD_COUNT)]
+
+
+def _to_6bit(value):
+    """Scale a 0-255 channel to the pad's 0-63 range (same rounding as set_color)."""
+    value = int(value * 63 / 255)
+    if value < 0:
+        return 0
+    return 63 if value > 63 else value
+
+
+def pack_color(r, g, b):
+    """Quantize an RGB color and pack it into one int (6 bits per channel)."""
+    return (_to_6bit(r) << 12) | (_to_6bit(g) << 6) | _to_6bit(b)
+
+
+_PALETTE_BY_PACKED = {pack_color(*rgb): index for rgb, index in _PALETTE_INDEX.items()}
+
+
+_PACKED_BY_PALETTE = {index: packed for packed, index in _PALETTE_BY_PACKED.items()}
+_INDEX_BY_NOTE = {note: index for index, note in enumerate(_PAD_NOTES)}
+
+
+def decode_led_sysex(message):
+    """Decode the pad colors an LED SysEx message sets.
+
+    Understands RGB (0x0B), palette (0x0A), column (0x0C), row (0x0D) and
+    all-pads (0x0E) messages. Palette colors without an RGB equivalent in
+    this module decode as None (unknown).
+
+    Returns:
+        list: (pad index, packed color or None) pairs; empty for other messages
+    """
+    message = bytes(message)
+    if len(message) < 9 or message[:6] != bytes(SYSEX_RGB_HEADER[:6]) or message[-1] != 0xF7:
+        return []
+
+    command = message[6]
+    body = message[7:-1]
+    if command == 0x0B:
+        return [
+            (_INDEX_BY_NOTE[body[i]], (body[i + 1] << 12) | (body[i + 2] << 6) | body[i + 3])
+            for i in range(0, len(body) - 3, 4)
+            if body[i] in _INDEX_BY_NOTE
+        ]
+    if command == 0x0A:
+        return [
+            (_INDEX_BY_NOTE[body[i]], _PACKED_BY_PALETTE.get(body[i + 1]))
+            for i in range(0, len(body) - 1, 2)
+            if body[i] in _INDEX_BY_NOTE
+        ]
+    if command == SYSEX_LIGHT_ALL:
+        packed = _PACKED_BY_PALETTE.get(body[0])
+        return [(index, packed) for index in range(PAD_COUNT)]
+    if command == SYSEX_LIGHT_ROW and len(body) >= 2 and body[0] < GRID_SIZE:
+        packed = _PACKED_BY_PALETTE.get(body[1])
+        return [(index, packed) for index in _ROW_PADS[body[0]]]
+    if command == SYSEX_LIGHT_COLUMN and len(body) >= 2 and body[0] < GRID_SIZE:
+        packed = _PACKED_BY_PALETTE.get(body[1])
+        return [(index, packed) for index in _COLUMN_PADS[body[0]]]
+    return []
+
+
+def _track_direct_write(midi_out, index, packed):
+    """Keep frame buffers in sync with a pad written outside of commit()."""
+    for frame_buffer in list(_frame_buffers):
+        if frame_buffer._midi_out is midi_out:
+            frame_buffer._front[index] = packed
+
+
+def _track_direct_writes(midi_out, pads):
+    """Batch version of _track_direct_write for (index, packed) pairs."""
+    for frame_buffer in list(_frame_buffers):
+        if frame_buffer._midi_out is midi_out:
+            front = frame_buffer._front
+            for index, packed in pads:
+                front[index] = packed
+
+
+class SysexBatchEncoder:
+    """Packs many pad colors into as few RGB SysEx messages as possible.
+
+    One message carries up to ``max_leds`` note/r/g/b tuples behind a single
+    header, so a full 81-pad frame is 2 messages / 340 bytes instead of
+    81 messages / 972 bytes. Messages are built in a preallocated bytearray
+    that is reused for every send.
+    """
+
+    def __init__(self, max_leds=MAX_LEDS_PER_SYSEX):
+        self.max_leds = max_leds
+        header_len = len(SYSEX_RGB_HEADER)
+        self._buffer = bytearray(header_len + 4 * max_leds + 1)
+        self._buffer[:header_len] = bytes(SYSEX_RGB_HEADER)
+        self._view = memoryview(self._buffer)
+        self._header_len = header_len
+        self._lock = threading.Lock()
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    def send(self, midi_out, pads):
+        """Send (index, packed) pairs as batched SysEx messages.
+
+        Args:
+            midi_out: MIDI output device
+            pads: Iterable of (pad index, packed 6-bit color)
+
+        Returns:
+            bool: False if any message failed to send
+        """
+        buf = self._buffer
+        notes = _PAD_NOTES
+        limit = self._header_len + 4 * self.max_leds
+        ok = True
+        with self._lock:
+            pos = self._header_len
+            for index, packed in pads:
+                buf[pos] = notes[index]
+                buf[pos + 1] = packed >> 12
+                buf[pos + 2] = (packed >> 6) & 0x3F
+                buf[pos + 3] = packed & 0x3F
+                pos += 4
+                if pos == limit:
+                    ok = self._flush(midi_out, pos) and ok
+                    pos = self._header_len
+            if pos > self._header_len:
+                ok = self._flush(midi_out, pos) and ok
+        return ok
+
+    def _flush(self, midi_out, pos):
+        self._buffer[pos] = 0xF7
+        try:
+            # rtmidi copies the bytes, so the buffer can be reused right away
+            midi_out.send_message(self._view[:pos + 1])
+        except Exception:
+            # Device may have been unplugged mid-frame
+            return False
+        self.messages_sent += 1
+        self.bytes_sent += pos + 1
+        return True
+
+    def get_stats(self):
+        """Message / byte counters since startup."""
+        return {
+            'messages_sent': self.messages_sent,
+            'bytes_sent': self.bytes_sent,
+        }
+
+
+_batch_encoder = SysexBatchEncoder()
+
+
+def send_pad_batch(midi_out, pads):
+    """Send (index, packed) pad colors in as few SysEx messages as possible.
+
+    Returns:
+        bool: True if every message was sent
+    """
+    if not midi_out:
+        return False
+    return _batch_encoder.send(midi_out, pads)
+
+
+class AnimationCancelled(BaseException):
+    """Raised inside an animation when its run has been cancelled.
+
+    present_frame() raises it once the frame buffer's cancel event is set,
+    so the animation unwinds at its current frame instead of finishing a
+    sleep or an inner loop. Like asyncio.CancelledError it derives from
+    BaseException so ``except Exception`` blocks in animations don't
+    swallow it.
+    """
+
+
+class LaunchpadFrameBuffer:
+    """Double-buffered 9x9 LED state with diff-only MIDI output.
+
+    Animations draw into the back buffer by passing the frame buffer where
+    they would pass ``midi_out`` (set_color / clear_all / fill_all detect
+    it). commit() compares the back buffer with the last committed state and
+    sends only pads whose quantized 6-bit color changed, so a clear + redraw
+    no longer flickers and static frames cost no MIDI traffic. Pad locks are
+    applied once per commit instead of inside every set_color() call.
+
+    With a ``sink`` (e.g. LedCompositor.set_base) commit() hands the raw
+    back buffer to it instead; the sink owns locks and output.
+    """
+
+    def __init__(self, launchpad, sink=None):
+        """
+        Args:
+            launchpad: LaunchpadManager (its midi_out may change on reconnect)
+            sink: Optional callable taking 81 packed colors per commit
+        """
+        self.launchpad = launchpad
+        self.sink = sink
+        self._back = [0] * PAD_COUNT
+        self._front = [None] * PAD_COUNT  # None = unknown, always resend
+        self._midi_out = None
+        self._commit_lock = threading.Lock()
+        self.frames_committed = 0
+        self.pads_sent = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        # Optional FrameClock (set by AnimationController) that paces wait()
+        self.clock = None
+        # Optional threading.Event cancelling the current animation run
+        self.cancel_event = None
+        _frame_buffers.add(self)
+
+    def set(self, x, y, r, g, b):
+        """Draw one pad into the back buffer (no MIDI traffic)."""
+        # Some animations compute positions as floats
+        x = int(x)
+        y = int(y)
+        if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
+            self._back[y * GRID_SIZE + x] = pack_color(r, g, b)
+
+    def fill(self, r, g, b):
+        """Set every pad in the back buffer to the same color."""
+        packed = pack_color(r, g, b)
+        self._back[:] = [packed] * PAD_COUNT
+
+    def clear(self):
+        """Turn every pad in the back buffer off."""
+        self._back[:] = [0] * PAD_COUNT
+
+    def set_packed(self, values):
+        """Replace the back buffer with 81 packed colors (see pack_color)."""
+        self._back[:] = values
+
+    def invalidate(self):
+        """Forget the committed state so the next commit resends every pad."""
+        self._front[:] = [None] * PAD_COUNT
+
+    def commit(self):
+        """Send the pads that differ from the last committed frame.
+
+        Returns:
+            int: Number of pads written
+        """
+        if self.sink is not None:
+            self.sink(list(self._back))
+            self.frames_committed += 1
+            return PAD_COUNT
+
+        midi_out = getattr(self.launchpad, 'midi_out', None)
+        with self._commit_lock:
+            if midi_out is not self._midi_out:
+                # New port (startup / reconnect): hardware state is unknown
+                self._midi_out = midi_out
+                self.invalidate()
+            if not midi_out:
+                return 0
+
+            frame = list(self._back)
+            for (x, y), (r, g, b) in list(_locked_pads.items()):
+                frame[y * GRID_SIZE + x] = pack_color(r, g, b)
+
+            output = getattr(self.launchpad, 'output', None)
+            if output is not None and output.is_running():
+                # The output thread diffs against what the pad shows
+                output.submit_frame(frame)
+                self.frames_committed += 1
+                return PAD_COUNT
+
+            front = self._front
+            dirty = [
+                (index, frame[index])
+                for index in range(PAD_COUNT)
+                if front[index] != frame[index]
+            ]
+            sent = 0
+            if len(dirty) > GRID_SIZE and frame.count(frame[0]) == PAD_COUNT:
+                # Whole pad one palette color (typically a clear): one message
+                palette = _PALETTE_BY_PACKED.get(frame[0])
+                if palette is not None and _send_bulk(midi_out, SYSEX_LIGHT_ALL, palette):
+                    front[:] = frame
+                    self.messages_sent += 1
+                    self.bytes_sent += 9
+                    dirty = []
+                    sent = PAD_COUNT
+            if dirty:
+                messages_before = _batch_encoder.messages_sent
+                bytes_before = _batch_encoder.bytes_sent
+                if send_pad_batch(midi_out, dirty):
+                    for index, packed in dirty:
+                        front[index] = packed
+                    sent = len(dirty)
+                else:
+                    # Device may have been unplugged mid-frame; resend next commit
+                    for index, _packed in dirty:
+                        front[index] = None
+                self.messages_sent += _batch_encoder.messages_sent - messages_before
+                self.bytes_sent += _batch_encoder.bytes_sent - bytes_before
+
+            self.frames_committed += 1
+            self.pads_sent += sent
+            return sent
+
+    def wait(self, delay):
+        """Pause between frames (present_frame calls this after commit).
+
+        With a clock the delay counts from the previous frame's deadline, so
+        render time does not add to the frame period.
+        """
+        clock = self.clock
+        if clock is not None:
+            clock.tick(delay, sleep=self._sleep)
+        else:
+            self._sleep(delay)
+
+    def is_cancelled(self):
+        """True once the current run's cancel event is set."""
+        cancel = self.cancel_event
+        return cancel is not None and cancel.is_set()
+
+    def check_cancelled(self):
+        """Raise AnimationCancelled if the current run was cancelled."""
+        if self.is_cancelled():
+            raise AnimationCancelled()
+
+    def _sleep(self, seconds):
+        cancel = self.cancel_event
+        if cancel is None:
+            if seconds > 0:
+                time.sleep(seconds)
+        elif cancel.wait(seconds if seconds > 0 else 0):
+            # Woken by cancellation rather than the timeout
+            raise AnimationCancelled()
+
+    def get_stats(self):
+        """Traffic counters for diagnostics / benchmarks."""
+        frames = self.frames_committed
+        return {
+            'frames_committed': frames,
+            'pads_sent': self.pads_sent,
+            'messages_sent': self.messages_sent,
+            'bytes_sent': self.bytes_sent,
+            'pads_per_frame': self.pads_sent / frames if frames else 0.0,
+            'bytes_per_frame': self.bytes_sent / frames if frames else 0.0,
+        }
+
+
+def present_frame(midi_out, delay=0.0):
+    """Show the frame an animation just drew, then wait ``delay`` seconds.
+
+    Animations call this where a frame ends. With a LaunchpadFrameBuffer it
+    commits the changed pads; with a plain MIDI port it is just a sleep.
+
+    Raises:
+        AnimationCancelled: The frame buffer's run was cancelled (the frame
+            is dropped, not committed)
+    """
+    if isinstance(midi_out, LaunchpadFrameBuffer):
+        midi_out.check_cancelled()
+        midi_out.commit()
+        midi_out.wait(delay)
+    elif delay > 0:
+        time.sleep(delay)
 
 
 def set_color(midi_out, x, y, r, g, b, force=False):
     """Set color of a specific LED on the Launchpad.
 
     Args:
-        midi_out: MIDI output device
+        midi_out: MIDI output device or LaunchpadFrameBuffer
         x: X coordinate (0-8)
         y: Y coordinate (0-8)
         r: Red value (0-255)
@@ -459,6 +898,11 @@ def set_color(midi_out, x, y, r, g, b, force=False):
     if not midi_out:
         return
 
+    if isinstance(midi_out, LaunchpadFrameBuffer):
+        # Locks are applied by commit()
+        midi_out.set(x, y, r, g, b)
+        return
+
     # Locked pads always keep their color unless force=True (auth / unlock)
     if not force and (x, y) in _locked_pads:
         r, g, b = _locked_pads[(x, y)]
@@ -467,28 +911,120 @@ def set_color(midi_out, x, y, r, g, b, force=False):
     g = min(63, int(g * 63 / 255))
     b = min(63, int(b * 63 / 255))
 
-    if x == 8 and y == 8:
-        note = 99
-    elif y == 8:
-        note = 104 + x
-    elif x == 8:
-        note = 19 + (y * 10)
-    else:
-        note = 11 + x + (y * 10)
+    note = pad_note(x, y)
 
     sysex_msg = [0xF0, 0x00, 0x20, 0x29, 0x02, 0x18, 0x0B, note, r, g, b, 0xF7]
     try:
         midi_out.send_message(sysex_msg)
     except Exception:
         # Device may have been unplugged mid-frame
-        pass
+        return
+
+    if _frame_buffers:
+        _track_direct_write(midi_out, y * GRID_SIZE + x, (r << 12) | (g << 6) | b)
+
+
+def _palette_index(r, g, b):
+    """Return the palette index for (r, g, b), or None if it has no exact entry."""
+    return _PALETTE_INDEX.get((int(r), int(g), int(b)))
+
+
+def _send_bulk(midi_out, command, *args):
+    """Send one of the palette bulk commands (row / column / all)."""
+    try:
+        midi_out.send_message([0xF0, 0x00, 0x20, 0x29, 0x02, 0x18, command, *args, 0xF7])
+    except Exception:
+        # Device may have been unplugged mid-frame
+        return False
+    return True
+
+
+def _fill_pads(midi_out, indices, r, g, b, force, command=None, *args):
+    """Fill the given pad indices, using a bulk command when the color allows.
+
+    Args:
+        midi_out: MIDI output device
+        indices: Pad indices covered by the fill
+        r, g, b: Color (0-255)
+        force: If True, ignore pad locks
+        command: Bulk SysEx command covering exactly ``indices`` (optional)
+        args: Command arguments before the palette color
+    """
+    packed = pack_color(r, g, b)
+    palette = _palette_index(r, g, b) if command is not None else None
+    locked = {}
+    if not force:
+        for (x, y), color in list(_locked_pads.items()):
+            index = y * GRID_SIZE + x
+            if index in indices:
+                locked[index] = pack_color(*color)
+
+    if palette is not None:
+        if not _send_bulk(midi_out, command, *args, palette):
+            return
+        _track_direct_writes(midi_out, [(index, packed) for index in indices])
+        if locked:
+            # Bulk fill just overwrote the locks; put them back right away
+            pads = list(locked.items())
+            if send_pad_batch(midi_out, pads):
+                _track_direct_writes(midi_out, pads)
+        return
+
+    pads = [(index, locked.get(index, packed)) for index in indices]
+    if send_pad_batch(midi_out, pads):
+        _track_direct_writes(midi_out, pads)
+
+
+_ALL_PADS = range(PAD_COUNT)
+_ROW_PADS = [range(y * GRID_SIZE, (y + 1) * GRID_SIZE) for y in range(GRID_SIZE)]
+_COLUMN_PADS = [range(x, PAD_COUNT, GRID_SIZE) for x in range(GRID_SIZE)]
+
+
+def fill_row(midi_out, y, r, g, b, force=False):
+    """Set every LED in row y (0 = bottom, 8 = top control row).
+
+    Args:
+        midi_out: MIDI output device or LaunchpadFrameBuffer
+        y: Row (0-8)
+        r: Red value (0-255)
+        g: Green value (0-255)
+        b: Blue value (0-255)
+        force: If True, ignore pad locks
+    """
+    if not midi_out or not 0 <= y < GRID_SIZE:
+        return
+    if isinstance(midi_out, LaunchpadFrameBuffer):
+        for x in range(GRID_SIZE):
+            midi_out.set(x, y, r, g, b)
+        return
+    _fill_pads(midi_out, _ROW_PADS[y], r, g, b, force, SYSEX_LIGHT_ROW, y)
+
+
+def fill_column(midi_out, x, r, g, b, force=False):
+    """Set every LED in column x (8 = right-hand scene column).
+
+    Args:
+        midi_out: MIDI output device or LaunchpadFrameBuffer
+        x: Column (0-8)
+        r: Red value (0-255)
+        g: Green value (0-255)
+        b: Blue value (0-255)
+        force: If True, ignore pad locks
+    """
+    if not midi_out or not 0 <= x < GRID_SIZE:
+        return
+    if isinstance(midi_out, LaunchpadFrameBuffer):
+        for y in range(GRID_SIZE):
+            midi_out.set(x, y, r, g, b)
+        return
+    _fill_pads(midi_out, _COLUMN_PADS[x], r, g, b, force, SYSEX_LIGHT_COLUMN, x)
 
 
 def clear_all(midi_out, force=False):
     """Clear all LEDs on the Launchpad.
 
     Args:
-        midi_out: MIDI output device
+        midi_out: MIDI output device or LaunchpadFrameBuffer
         force: If True, also clear locked pads
     """
     fill_all(midi_out, 0, 0, 0, force=force)
@@ -498,7 +1034,7 @@ def fill_all(midi_out, r, g, b, force=False):
     """Set every Launchpad LED to the same color.
 
     Args:
-        midi_out: MIDI output device
+        midi_out: MIDI output device or LaunchpadFrameBuffer
         r: Red value (0-255)
         g: Green value (0-255)
         b: Blue value (0-255)
@@ -506,8 +1042,8 @@ def fill_all(midi_out, r, g, b, force=False):
     """
     if not midi_out:
         return
-    for y in range(9):
-        for x in range(9):
-            set_color(midi_out, x, y, r, g, b, force=force)
-    if not force:
-        reassert_locked_pads(midi_out)
+    if isinstance(midi_out, LaunchpadFrameBuffer):
+        midi_out.fill(r, g, b)
+        return
+    # Black / pure colors: one 9-byte "light all" message, then re-lock
+    _fill_pads(midi_out, _ALL_PADS, r, g, b, force, SYSEX_LIGHT_ALL)
@@ -0,0 +1,271 @@
+"""Single-writer MIDI output thread for the Launchpad.
+
+rtmidi ports are not thread-safe, and a slow USB write blocks whoever makes
+it. MidiOutputWriter is the only code that writes to ``midi_out`` once it is
+running: the animation thread, button effects and the health probe hand it
+frames or messages and return immediately.
+"""
+
+import collections
+import threading
+import time
+
+from .launchpad import (
+    GRID_SIZE,
+    PAD_COUNT,
+    SYSEX_LIGHT_ALL,
+    SysexBatchEncoder,
+    _PALETTE_BY_PACKED,
+    decode_led_sysex,
+)
+
+# Pending one-off messages (effects, locks, probes) before the oldest is dropped
+MAX_PENDING_MESSAGES = 256
+# Send-latency samples kept for percentiles
+LATENCY_SAMPLES = 512
+
+
+class MidiOutputWriter:
+    """Owns Launchpad LED output on a dedicated thread.
+
+    Two inputs:
+      * submit_frame(): a full 81-pad frame (packed 6-bit colors). Only the
+        newest one matters — if a frame is still waiting when another
+        arrives, the older one is dropped. The writer diffs it against what
+        the pad shows and sends only changed pads.
+      * send_message(): a raw SysEx / MIDI message, queued in order in a
+        bounded queue (oldest dropped when full). This duck-types rtmidi's
+        MidiOut, so set_color() / fill_all() / lock_pad() can be pointed at
+        the writer unchanged.
+
+    Producers never block on USB.
+    """
+
+    def __init__(self, launchpad, max_pending=MAX_PENDING_MESSAGES):
+        """
+        Args:
+            launchpad: LaunchpadManager whose midi_out this writer drives
+            max_pending: Bounded queue size for one-off messages
+        """
+        self.launchpad = launchpad
+        # Held for every port write; LaunchpadManager takes it to swap ports
+        self.port_lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._messages = collections.deque()
+        self._max_pending = max_pending
+        self._frame = None  # (submitted_at, packed list)
+        self._thread = None
+        self._running = False
+        self._port = None
+        self._front = [None] * PAD_COUNT  # what the pad currently shows
+        self._encoder = SysexBatchEncoder()
+        self._latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self._last_send_ok = True
+        self._busy = False
+
+        self.frames_submitted = 0
+        self.frames_sent = 0
+        self.dropped_frames = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.dropped_messages = 0
+        self.send_errors = 0
+        self.max_queue_depth = 0
+
+    def __bool__(self):
+        # Mirrors the old "if midi_out:" guards: falsy while no port is open
+        return self.launchpad.midi_out is not None
+
+    def start(self):
+        """Start the writer thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='midi-output', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Flush pending output and stop the writer thread."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def is_running(self):
+        """True while the writer thread is accepting work."""
+        return self._running and self._thread is not None
+
+    def invalidate(self):
+        """Forget what the pad shows so the next frame is sent in full."""
+        self._front = [None] * PAD_COUNT
+
+    def send_message(self, message):
+        """Queue one MIDI message (non-blocking, rtmidi MidiOut compatible)."""
+        if not self.is_running():
+            # Not started (startup / shutdown): write through on this thread
+            self._write(bytes(message))
+            return
+        with self._cond:
+            if len(self._messages) >= self._max_pending:
+                self._messages.popleft()
+                self.dropped_messages += 1
+            self._messages.append((time.monotonic(), bytes(message)))
+            self._note_depth()
+            self._cond.notify()
+
+    def submit_frame(self, packed):
+        """Hand over a full frame; replaces any frame not yet sent.
+
+        Args:
+            packed: 81 packed colors in pad index order (locks already applied)
+        """
+        with self._cond:
+            if self._frame is not None:
+                self.dropped_frames += 1
+            self._frame = (time.monotonic(), packed)
+            self.frames_submitted += 1
+            self._note_depth()
+            self._cond.notify()
+
+    def flush(self, timeout=1.0):
+        """Wait until everything queued so far has been written.
+
+        Returns:
+            bool: True if the queue drained before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                if not self._messages and self._frame is None and not self._busy:
+                    return True
+            time.sleep(0.005)
+        return False
+
+    def last_send_failed(self):
+        """True if the most recent write raised (device gone / port closed)."""
+        return not self._last_send_ok
+
+    def get_stats(self):
+        """Queue depth, drops and send latency for diagnostics."""
+        with self._cond:
+            depth = len(self._messages) + (1 if self._frame is not None else 0)
+            samples = sorted(self._latencies)
+        stats = {
+            'running': self.is_running(),
+            'queue_depth': depth,
+            'max_queue_depth': self.max_queue_depth,
+            'frames_submitted': self.frames_submitted,
+            'frames_sent': self.frames_sent,
+            'dropped_frames': self.dropped_frames,
+            'messages_sent': self.messages_sent + self._encoder.messages_sent,
+            'dropped_messages': self.dropped_messages,
+            'send_errors': self.send_errors,
+            'bytes_sent': self.bytes_sent + self._encoder.bytes_sent,
+        }
+        if samples:
+            stats['latency_ms'] = {
+                'p50': round(samples[len(samples) // 2] * 1000, 3),
+                'p99': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+                'max': round(samples[-1] * 1000, 3),
+            }
+        return stats
+
+    def _note_depth(self):
+        depth = len(self._messages) + (1 if self._frame is not None else 0)
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._messages and self._frame is None:
+                    self._cond.wait()
+                if not self._messages and self._frame is None:
+                    break  # stopped and drained
+                messages = list(self._messages)
+                self._messages.clear()
+                frame = self._frame
+                self._frame = None
+                self._busy = True
+
+            try:
+                for submitted, message in messages:
+                    if self._write(message):
+                        self._latencies.append(time.monotonic() - submitted)
+                if frame is not None:
+                    submitted, packed = frame
+                    if self._write_frame(packed):
+                        self._latencies.append(time.monotonic() - submitted)
+            except Exception as e:
+                print(f"MIDI output error: {e}")
+            finally:
+                self._busy = False
+
+    def _current_port(self):
+        """Return the open port, resetting pad state when it changed."""
+        midi_out = self.launchpad.midi_out
+        if midi_out is not self._port:
+            self._port = midi_out
+            self.invalidate()
+        return midi_out
+
+    def _write(self, message):
+        with self.port_lock:
+            midi_out = self._current_port()
+            if not midi_out:
+                return False
+            try:
+                midi_out.send_message(message)
+            except Exception:
+                # Device may have been unplugged; pad state is now unknown
+                self.send_errors += 1
+                self._last_send_ok = False
+                self.invalidate()
+                return False
+        self._last_send_ok = True
+        self.messages_sent += 1
+        self.bytes_sent += len(message)
+        front = self._front
+        for index, packed in decode_led_sysex(message):
+            front[index] = packed
+        return True
+
+    def _send_raw(self, midi_out, message):
+        try:
+            midi_out.send_message(message)
+        except Exception:
+            return False
+        self.messages_sent += 1
+        self.bytes_sent += len(message)
+        return True
+
+    def _write_frame(self, packed):
+        with self.port_lock:
+            midi_out = self._current_port()
+            if not midi_out:
+                return False
+            front = self._front
+            dirty = [
+                (index, packed[index])
+                for index in range(PAD_COUNT)
+                if front[index] != packed[index]
+            ]
+            if len(dirty) > GRID_SIZE and packed.count(packed[0]) == PAD_COUNT:
+                # Whole pad one palette color (typically a clear): one message
+                palette = _PALETTE_BY_PACKED.get(packed[0])
+                message = bytes([0xF0, 0x00, 0x20, 0x29, 0x02, 0x18, SYSEX_LIGHT_ALL, palette or 0, 0xF7])
+                if palette is not None and self._send_raw(midi_out, message):
+                    front[:] = packed
+                    dirty = []
+            if dirty and not self._encoder.send(midi_out, dirty):
+                self.send_errors += 1
+                self._last_send_ok = False
+                self.invalidate()
+                return False
+        self._last_send_ok = True
+        for index, value in dirty:
+            front[index] = value
+        self.frames_sent += 1
+        return True
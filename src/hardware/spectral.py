@@ -0,0 +1,133 @@
+"""Spectral band engine for audio-reactive animations.
+
+Turns a window of samples (e.g. audio_capture.latest()) into N band
+levels in 0-1: one real FFT with a cached window, one matrix multiply
+against a precomputed log-spaced filterbank, then smoothing, decay and
+peak-hold applied to all bands at once. N is whatever the animation
+draws — 8 or 9 columns, or 81 for a full-grid spectrogram.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .audio import CHUNK, SAMPLE_RATE
+
+# Lowest band edge (Hz)
+DEFAULT_F_MIN = 40.0
+
+
+@lru_cache(maxsize=None)
+def analysis_window(size):
+    """Hann window for ``size`` samples; cached, read-only."""
+    window = np.hanning(size).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=None)
+def log_filterbank(n_bands, fft_size, sample_rate=SAMPLE_RATE, f_min=DEFAULT_F_MIN, f_max=None):
+    """Matrix averaging rfft magnitudes into log-spaced bands; cached, read-only.
+
+    Band ``i`` covers ``edges[i] <= f < edges[i + 1]`` with edges spaced
+    geometrically from ``f_min`` to ``f_max`` (default: a quarter of the
+    sample rate). A band narrower than one FFT bin takes its nearest bin.
+
+    Returns:
+        tuple: ((n_bands, fft_size // 2 + 1) float32 matrix, (n_bands,) center frequencies)
+    """
+    f_max = f_max or sample_rate / 4
+    freqs = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+    edges = np.geomspace(f_min, f_max, n_bands + 1)
+    centers = np.sqrt(edges[:-1] * edges[1:])
+
+    bank = np.zeros((n_bands, len(freqs)), dtype=np.float32)
+    for band in range(n_bands):
+        bins = np.flatnonzero((freqs >= edges[band]) & (freqs < edges[band + 1]))
+        if len(bins) == 0:
+            bins = [np.argmin(np.abs(freqs - centers[band]))]
+        bank[band, bins] = 1.0 / len(bins)
+
+    bank.flags.writeable = False
+    centers.flags.writeable = False
+    return bank, centers
+
+
+class SpectralBandEngine:
+    """Band levels with smoothing, decay and peak-hold for one consumer."""
+
+    def __init__(self, n_bands=8, fft_size=CHUNK, sample_rate=SAMPLE_RATE, f_min=DEFAULT_F_MIN,
+                 f_max=None, sensitivity=1.0, smoothing=0.7, decay=0.1, peak_hold=3, band_gains=None):
+        """
+        Args:
+            n_bands: Number of output bands
+            fft_size: Samples per update() window
+            sample_rate: Sample rate of the input (Hz)
+            f_min: Lowest band edge (Hz)
+            f_max: Highest band edge (Hz); default sample_rate / 4
+            sensitivity: Level the loudest band is scaled to (levels clip at 1)
+            smoothing: Share of the previous level kept each update (0-1)
+            decay: Floor for a falling level, as a share of the previous one
+            peak_hold: Updates a peak is held before it starts to decay
+            band_gains: Optional per-band magnitude gains (e.g. bass boost)
+        """
+        bank, centers = log_filterbank(n_bands, fft_size, sample_rate, f_min, f_max)
+        if band_gains is not None:
+            bank = bank * np.asarray(band_gains, dtype=np.float32)[:, None]
+        self.filterbank = bank
+        self.centers = centers
+        self.window = analysis_window(fft_size)
+        self.fft_size = fft_size
+        self.sensitivity = sensitivity
+        self.smoothing = smoothing
+        self.decay = decay
+        self.peak_hold = peak_hold
+        self.levels = np.zeros(n_bands, dtype=np.float32)
+        self.peaks = np.zeros(n_bands, dtype=np.float32)
+        self._hold = np.zeros(n_bands, dtype=np.int32)
+
+    @property
+    def n_bands(self):
+        return len(self.levels)
+
+    def band_magnitudes(self, samples):
+        """Log-compressed magnitude per band for one window of samples.
+
+        Args:
+            samples: ``fft_size`` float samples
+
+        Returns:
+            np.ndarray: (n_bands,) float32
+        """
+        if len(samples) != self.fft_size:
+            raise ValueError(f"Expected {self.fft_size} samples, got {len(samples)}")
+        spectrum = np.abs(np.fft.rfft(samples * self.window)).astype(np.float32)
+        return np.log10(self.filterbank @ spectrum + 1)
+
+    def update(self, samples):
+        """Advance the band levels with a new window of samples.
+
+        Returns:
+            np.ndarray: (n_bands,) levels in 0-1 (also in ``self.levels``;
+            peaks are in ``self.peaks``)
+        """
+        bands = self.band_magnitudes(samples)
+        loudest = bands.max()
+        new = np.clip(bands * (self.sensitivity / loudest), 0.0, 1.0) if loudest > 0 else np.zeros_like(bands)
+
+        previous = self.levels
+        levels = new * (1 - self.smoothing) + previous * self.smoothing
+        levels = np.where(levels < previous, np.maximum(levels, previous * self.decay), levels)
+
+        rising = levels > self.peaks
+        held = self._hold > 0
+        self.peaks = np.where(rising, levels, np.where(held, self.peaks, self.peaks * self.decay))
+        self._hold = np.where(rising, self.peak_hold, np.maximum(self._hold - 1, 0))
+        self.levels = levels.astype(np.float32)
+        return self.levels
+
+    def reset(self):
+        """Drop all levels and peaks back to zero."""
+        self.levels[:] = 0
+        self.peaks = np.zeros_like(self.levels)
+        self._hold[:] = 0
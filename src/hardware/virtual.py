@@ -0,0 +1,244 @@
+"""Virtual Launchpad MK2 for headless runs, benchmarks and load tests.
+
+VirtualLaunchpad stands in for the USB device: its VirtualMidiOut /
+VirtualMidiIn clients implement the rtmidi surface LaunchpadManager uses
+(port listing, open/close, send_message, callbacks). LED SysEx is decoded
+into a 9x9 state, so what the app would have shown can be inspected.
+
+Enable it for the whole app with ``LAUNCHPAD_VIRTUAL=1`` (or
+``"virtual_launchpad": true`` in config/app_settings.json); open_launchpad_ports
+then finds the virtual pad instead of scanning real MIDI ports.
+"""
+
+import threading
+import time
+
+from .launchpad import GRID_SIZE, PAD_COUNT, _PAD_NOTES, decode_led_sysex
+
+VIRTUAL_PORT_NAME = 'Launchpad MK2 (virtual)'
+
+# MIDI status bytes the MK2 sends in programmer mode
+_NOTE_ON = 0x90
+_CONTROL_CHANGE = 0xB0
+
+
+class VirtualLaunchpad:
+    """In-memory Launchpad MK2.
+
+    Args:
+        bytes_per_second: Simulated USB-MIDI throughput; send_message()
+            blocks like a saturated port would. None = unlimited.
+    """
+
+    def __init__(self, bytes_per_second=None):
+        self.bytes_per_second = bytes_per_second
+        self.connected = True
+        self._lock = threading.Lock()
+        self._leds = [0] * PAD_COUNT  # packed 6-bit colors; None = unknown palette color
+        self._busy_until = 0.0
+        self._inputs = []
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.leds_written = 0
+        self.presses_injected = 0
+
+    def create_clients(self):
+        """Return a new (MidiOut, MidiIn) pair bound to this device."""
+        midi_in = VirtualMidiIn(self)
+        with self._lock:
+            self._inputs.append(midi_in)
+        return VirtualMidiOut(self), midi_in
+
+    def port_names(self):
+        """Ports visible to a client right now (empty while unplugged)."""
+        return [VIRTUAL_PORT_NAME] if self.connected else []
+
+    # --- LED state ---
+
+    def get_color(self, x, y):
+        """Return the 6-bit (r, g, b) a pad shows, or None if unknown."""
+        packed = self._leds[y * GRID_SIZE + x]
+        if packed is None:
+            return None
+        return (packed >> 12) & 0x3F, (packed >> 6) & 0x3F, packed & 0x3F
+
+    def get_frame(self):
+        """Return the pad as a [y][x] grid of 6-bit (r, g, b) tuples."""
+        return [
+            [self.get_color(x, y) or (0, 0, 0) for x in range(GRID_SIZE)]
+            for y in range(GRID_SIZE)
+        ]
+
+    def get_packed(self):
+        """Return a copy of the 81 packed pad colors (pad index order)."""
+        with self._lock:
+            return list(self._leds)
+
+    def get_stats(self):
+        """Traffic counters."""
+        return {
+            'connected': self.connected,
+            'messages_received': self.messages_received,
+            'bytes_received': self.bytes_received,
+            'leds_written': self.leds_written,
+            'presses_injected': self.presses_injected,
+        }
+
+    def reset_stats(self):
+        """Zero the traffic counters."""
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.leds_written = 0
+        self.presses_injected = 0
+
+    # --- Hot-plug ---
+
+    def unplug(self):
+        """Simulate pulling the USB cable: ports vanish and writes fail."""
+        self.connected = False
+
+    def replug(self):
+        """Simulate plugging back in; the pad powers up dark."""
+        with self._lock:
+            self._leds = [0] * PAD_COUNT
+        self.connected = True
+
+    # --- Input ---
+
+    def press(self, x, y, velocity=127):
+        """Inject a pad press into every open input with a callback."""
+        self.presses_injected += 1
+        self._emit(x, y, velocity)
+
+    def release(self, x, y):
+        """Inject a pad release."""
+        self._emit(x, y, 0)
+
+    def tap(self, x, y, hold=0.0):
+        """Press, optionally hold, then release a pad."""
+        self.press(x, y)
+        if hold:
+            time.sleep(hold)
+        self.release(x, y)
+
+    def _emit(self, x, y, velocity):
+        if not self.connected:
+            return
+        note = _PAD_NOTES[y * GRID_SIZE + x]
+        status = _CONTROL_CHANGE if y == GRID_SIZE - 1 and x < GRID_SIZE - 1 else _NOTE_ON
+        with self._lock:
+            inputs = list(self._inputs)
+        for midi_in in inputs:
+            midi_in._deliver([status, note, velocity])
+
+    # --- Output (called by VirtualMidiOut) ---
+
+    def _receive(self, message):
+        if self.bytes_per_second:
+            # Serialize like a real port: each write waits for the previous ones
+            now = time.monotonic()
+            with self._lock:
+                start = max(now, self._busy_until)
+                self._busy_until = start + len(message) / self.bytes_per_second
+                wait = self._busy_until - now
+            if wait > 0:
+                time.sleep(wait)
+
+        pads = decode_led_sysex(message)
+        with self._lock:
+            for index, packed in pads:
+                self._leds[index] = packed
+            self.messages_received += 1
+            self.bytes_received += len(message)
+            self.leds_written += len(pads)
+
+    def _forget_input(self, midi_in):
+        with self._lock:
+            if midi_in in self._inputs:
+                self._inputs.remove(midi_in)
+
+
+class _VirtualPort:
+    """Port bookkeeping shared by the virtual MidiOut / MidiIn."""
+
+    def __init__(self, device):
+        self.device = device
+        self._open = False
+
+    def get_ports(self):
+        return self.device.port_names()
+
+    def open_port(self, port=0, name=None):
+        if port >= len(self.device.port_names()):
+            raise OSError(f"Invalid virtual port number: {port}")
+        self._open = True
+
+    def is_port_open(self):
+        return self._open and self.device.connected
+
+    def close_port(self):
+        self._open = False
+
+    def delete(self):
+        self.close_port()
+
+
+class VirtualMidiOut(_VirtualPort):
+    """rtmidi.MidiOut stand-in that feeds a VirtualLaunchpad."""
+
+    def send_message(self, message):
+        if not self._open or not self.device.connected:
+            raise OSError("Virtual Launchpad is not connected")
+        self.device._receive(bytes(message))
+
+
+class VirtualMidiIn(_VirtualPort):
+    """rtmidi.MidiIn stand-in; presses come from VirtualLaunchpad.press()."""
+
+    def __init__(self, device):
+        super().__init__(device)
+        self._callback = None
+        self._data = None
+        self._last_event = None
+
+    def set_callback(self, func, data=None):
+        self._callback = func
+        self._data = data
+
+    def cancel_callback(self):
+        self._callback = None
+        self._data = None
+
+    def ignore_types(self, sysex=True, timing=True, active_sense=True):
+        pass
+
+    def delete(self):
+        super().delete()
+        self.device._forget_input(self)
+
+    def _deliver(self, message):
+        callback = self._callback
+        if not self._open or callback is None:
+            return
+        # rtmidi passes the delta time since the previous message
+        now = time.monotonic()
+        delta = 0.0 if self._last_event is None else now - self._last_event
+        self._last_event = now
+        callback((message, delta), self._data)
+
+
+_virtual_device = None
+_virtual_device_lock = threading.Lock()
+
+
+def get_virtual_launchpad(bytes_per_second=None):
+    """Return the process-wide VirtualLaunchpad, creating it on first use.
+
+    Args:
+        bytes_per_second: Throughput limit applied when the device is created
+    """
+    global _virtual_device
+    with _virtual_device_lock:
+        if _virtual_device is None:
+            _virtual_device = VirtualLaunchpad(bytes_per_second=bytes_per_second)
+        return _virtual_device
@@ -25,8 +25,11 @@ from .services.playlist_manager import (
 from .services.user_action_manager import UserActionManager
 from .services.action_executor import ActionExecutor
 from .services.audio_analyzer import create_audio_analyzer
+from .services.playback_state import playback_state
 from .utils.config_manager import config_manager
-from .animations import ANIMATIONS
+from .utils.latency import print_latency_report
+from .core.frame_clock import print_frame_report
+from .animations import ANIMATIONS, register_live_analysis_animations
 from .api.flask_app import create_app
 from .utils.helpers import print_available_animations, print_available_playlists
 from .utils.help_system import show_help, show_quick_status
@@ -61,7 +64,21 @@ class LaunchpadController:
             self.spotify_manager.spotify = spotify_client
             self.spotify_manager.needs_reauth = False
             print("Spotify initialized successfully")
+        else:
+            # Keep early logs quiet — AuthAlertService prints a loud banner
+            # at the end of startup and every 5s until the user runs 'auth'.
+            self.spotify_manager.needs_reauth = True
 
+        # One shared playback poller (waits quietly while auth is broken)
+        playback_state.start(self.spotify_manager)
+
+        if config_manager.get_audio_source() == 'microphone':
+            # Live microphone analysis needs no Spotify access; the mic only
+            # opens while an audio-reactive animation runs
+            self.audio_analyzer = create_audio_analyzer(self.spotify_manager, source='microphone')
+            register_live_analysis_animations()
+            print("🎤 Live audio analyzer ready (microphone)")
+        elif spotify_client:
             # Initialize audio analyzer for Spotify-powered features
             audio_enabled = (config_manager.is_audio_features_enabled() and
                            config_manager.should_auto_start_analysis())
@@ -73,9 +90,6 @@ class LaunchpadController:
                 print("🎵 Audio analyzer initialized but disabled")
                 print("   Use 'af enable' to enable Spotify audio features")
         else:
-            # Keep early logs quiet — AuthAlertService prints a loud banner
-            # at the end of startup and every 5s until the user runs 'auth'.
-            self.spotify_manager.needs_reauth = True
             self.audio_analyzer = create_audio_analyzer(self.spotify_manager, enabled=False)
 
         # Load playlist mappings
@@ -105,6 +119,7 @@ class LaunchpadController:
             user_action_manager=self.user_action_manager,
             action_executor=self.action_executor,
         )
+        self.midi_handler.start()
 
         # Set MIDI callback when ports are available (health monitor re-attaches later)
         if self.animation_controller.launchpad.midi_in:
@@ -156,8 +171,12 @@ class LaunchpadController:
             if self.animation_controller:
                 self.animation_controller.set_auth_lockout(False)
             self._start_status_monitor()
+            # Resume polling right away instead of at the next auth check
+            playback_state.request_refresh()
             # Keep audio features off unless explicitly enabled (Spotify 403 for most apps)
-            if self.audio_analyzer:
+            if self.audio_analyzer and self.audio_analyzer.is_live:
+                self.audio_analyzer.resume()
+            elif self.audio_analyzer:
                 self.audio_analyzer.pause()
                 if (config_manager.is_audio_features_enabled() and
                         config_manager.should_auto_start_analysis()):
@@ -326,6 +345,13 @@ class LaunchpadController:
                 elif cmd == 'af':
                     self._handle_audio_features_command()
 
+                elif cmd == 'lat':
+                    print_latency_report()
+
+                elif cmd == 'fps':
+                    from .animations.frame_cache import frame_cache
+                    print_frame_report(self.animation_controller.get_frame_stats(), frame_cache.get_stats())
+
                 elif cmd == 'q':
                     break
 
@@ -453,9 +479,14 @@ class LaunchpadController:
         if self.status_monitor:
             self.status_monitor.stop()
 
+        playback_state.stop()
+
         if self.audio_analyzer:
             self.audio_analyzer.stop_analysis()
 
+        if self.midi_handler:
+            self.midi_handler.stop()
+
         if self.animation_controller:
             self.animation_controller.shutdown()
 
@@ -19,6 +19,11 @@ from .playlist_manager import (
 )
 
 from .audio_analyzer import AudioAnalyzer, create_audio_analyzer
+from .analysis_index import AnalysisIndex, AnalysisCursor
+from .analysis_cache import AnalysisCache, analysis_cache
+from .device_registry import DeviceRegistry, device_registry
+from .playback_state import PlaybackSnapshot, PlaybackStateService, playback_state
+from .local_audio_analyzer import LocalAudioAnalyzer
 from .user_action_manager import UserActionManager
 from .action_executor import ActionExecutor
 
@@ -34,6 +39,16 @@ __all__ = [
     'show_playlist_animation_preview',
     'AudioAnalyzer',
     'create_audio_analyzer',
+    'AnalysisIndex',
+    'AnalysisCursor',
+    'AnalysisCache',
+    'analysis_cache',
+    'DeviceRegistry',
+    'device_registry',
+    'PlaybackSnapshot',
+    'PlaybackStateService',
+    'playback_state',
+    'LocalAudioAnalyzer',
     'UserActionManager',
     'ActionExecutor',
 ]
@@ -0,0 +1,250 @@
+"""Persistent cache of per-track audio features and analysis.
+
+Spotify's audio features and audio analysis never change for a track, so
+each one is downloaded once and kept:
+
+  * memory tier: the last few tracks' (features, AnalysisIndex), LRU
+  * disk tier: one compressed ``.npz`` of the index's columns per track,
+    named by a hash of the track ID (sharded by its first two hex digits),
+    evicted least recently used once the directory exceeds its size cap
+
+Entries older than ``performance.cache_duration`` days (config/
+audio_features.json) are downloaded again. Replaying a playlist, or a
+track prefetched from the playback queue, starts with its analysis ready.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .analysis_index import AnalysisIndex
+
+# Where cached tracks are stored
+DEFAULT_CACHE_DIR = os.path.join('cache', 'analysis')
+# Disk cap when config has no performance.analysis_cache_mb
+DEFAULT_MAX_MB = 64
+# Entry age limit (days) when config has no performance.cache_duration
+DEFAULT_MAX_AGE_DAYS = 30
+# Tracks kept in memory in front of the disk
+MEMORY_ITEMS = 8
+# Bump when the stored layout changes; old files are then never read
+CACHE_VERSION = 1
+
+
+class AnalysisCache:
+    """Two-tier (memory, disk) cache of (features, AnalysisIndex) by track ID."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=None, max_age=None,
+                 memory_items=MEMORY_ITEMS):
+        """
+        Args:
+            cache_dir: Directory for the .npz files
+            max_bytes: Disk cap (default: config, else DEFAULT_MAX_MB)
+            max_age: Seconds an entry stays valid (default: config, else
+                DEFAULT_MAX_AGE_DAYS)
+            memory_items: Tracks kept in the memory tier
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.memory_items = memory_items
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()  # track_id -> (features, index)
+        self._files = None  # path -> size, least recently used first
+        self._bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, track_id):
+        """(features, AnalysisIndex) for a track, or None if not cached."""
+        with self._lock:
+            entry = self._memory.get(track_id)
+            if entry is not None:
+                self._memory.move_to_end(track_id)
+                self.memory_hits += 1
+                return entry
+
+        entry = self._load(track_id)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(track_id, entry)
+        return entry
+
+    def contains(self, track_id):
+        """True if the track is cached (without loading it)."""
+        with self._lock:
+            if track_id in self._memory:
+                return True
+            self._scan()
+            return self._path(track_id) in self._files
+
+    def put(self, track_id, features, analysis):
+        """Store a track's features and AnalysisIndex in both tiers."""
+        if not track_id or analysis is None:
+            return
+        with self._lock:
+            self._remember(track_id, (features, analysis))
+
+        path = self._path(track_id)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    _meta=np.array(json.dumps({
+                        'version': CACHE_VERSION,
+                        'track_id': track_id,
+                        'cached_at': time.time(),
+                        'features': features,
+                        'track': analysis.track,
+                    })),
+                    **analysis.to_arrays(),
+                )
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"⚠️ Could not write analysis cache: {e}")
+            return
+
+        with self._lock:
+            self._scan()
+            self._bytes += size - self._files.pop(path, 0)
+            self._files[path] = size
+            self._evict()
+
+    def clear(self):
+        """Drop every cached track from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._scan()
+            for path in list(self._files):
+                self._remove(path)
+
+    def get_stats(self):
+        """Tier sizes and hit counters."""
+        with self._lock:
+            self._scan()
+            return {
+                'memory_tracks': len(self._memory),
+                'disk_tracks': len(self._files),
+                'disk_bytes': self._bytes,
+                'max_bytes': self._max_bytes(),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _path(self, track_id):
+        digest = hashlib.sha1(f'{CACHE_VERSION}:{track_id}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f'{digest}.npz')
+
+    def _load(self, track_id):
+        path = self._path(track_id)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['_meta']))
+                if meta.get('version') != CACHE_VERSION or meta.get('track_id') != track_id:
+                    return None
+                if time.time() - meta.get('cached_at', 0) > self._max_age():
+                    expired = True
+                else:
+                    expired = False
+                    arrays = {key: data[key] for key in data.files if key != '_meta'}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Dropping unreadable analysis cache entry: {e}")
+            expired = True
+
+        if expired:
+            with self._lock:
+                self._scan()
+                self._remove(path)
+            return None
+
+        try:
+            # Mark as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._scan()
+            if path in self._files:
+                self._files.move_to_end(path)
+        return meta.get('features'), AnalysisIndex.from_arrays(arrays, meta.get('track'))
+
+    def _remember(self, track_id, entry):
+        # Caller holds the lock
+        self._memory[track_id] = entry
+        self._memory.move_to_end(track_id)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _scan(self):
+        # Caller holds the lock; indexes the directory once, oldest first
+        if self._files is not None:
+            return
+        found = []
+        for root, _dirs, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.npz'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found.append((stat.st_mtime, path, stat.st_size))
+        found.sort()
+        self._files = collections.OrderedDict((path, size) for _mtime, path, size in found)
+        self._bytes = sum(self._files.values())
+        self._evict()
+
+    def _evict(self):
+        # Caller holds the lock
+        max_bytes = self._max_bytes()
+        while self._bytes > max_bytes and self._files:
+            self._remove(next(iter(self._files)))
+            self.evictions += 1
+
+    def _remove(self, path):
+        # Caller holds the lock
+        self._bytes -= self._files.pop(path, 0)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _max_bytes(self):
+        if self.max_bytes is not None:
+            return self.max_bytes
+        return int(_performance_setting('analysis_cache_mb', DEFAULT_MAX_MB) * 1024 * 1024)
+
+    def _max_age(self):
+        if self.max_age is not None:
+            return self.max_age
+        return float(_performance_setting('cache_duration', DEFAULT_MAX_AGE_DAYS)) * 86400
+
+
+def _performance_setting(name, default):
+    try:
+        from ..utils.config_manager import config_manager
+        value = config_manager.get_performance_setting(name, default)
+    except Exception:
+        return default
+    return default if value is None else value
+
+
+# Global cache shared by the audio analyzer and its prefetcher
+analysis_cache = AnalysisCache()
@@ -0,0 +1,225 @@
+"""Columnar, indexed form of a Spotify audio analysis.
+
+The audio-analysis JSON holds one dict per segment, beat, bar and tatum
+(thousands per track). AnalysisIndex converts it once per track into NumPy
+columns — start times, durations, loudness, (n, 12) pitch and timbre
+matrices — so a lookup by playback position is a searchsorted() instead of
+a scan, and the track costs a few hundred KiB less to keep around.
+AnalysisCursor follows playback and usually finds the next item in O(1).
+"""
+
+import numpy as np
+
+# Time-interval lists in the analysis, each with start / duration / confidence
+INTERVAL_KINDS = ('bars', 'beats', 'tatums', 'sections')
+# Items a cursor steps through before falling back to a binary search
+_CURSOR_SCAN_LIMIT = 4
+
+
+class IntervalColumns:
+    """Start, duration and confidence columns for one list of intervals."""
+
+    def __init__(self, items=()):
+        """
+        Args:
+            items: List of {'start', 'duration', 'confidence'} dicts
+        """
+        count = len(items)
+        self.start = np.fromiter((item.get('start', 0.0) for item in items), dtype=np.float64, count=count)
+        self.duration = np.fromiter((item.get('duration', 0.0) for item in items), dtype=np.float32, count=count)
+        self.confidence = np.fromiter((item.get('confidence', 0.0) for item in items), dtype=np.float32, count=count)
+
+    def __len__(self):
+        return len(self.start)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in vars(self).values() if isinstance(column, np.ndarray))
+
+    def columns(self):
+        """{column name: array} (see from_columns)."""
+        return {name: column for name, column in vars(self).items() if isinstance(column, np.ndarray)}
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Rebuild from the arrays returned by columns()."""
+        instance = cls.__new__(cls)
+        for name, column in columns.items():
+            setattr(instance, name, column)
+        return instance
+
+    def index_at(self, seconds):
+        """Index of the interval containing ``seconds``, or -1."""
+        index = int(np.searchsorted(self.start, seconds, side='right')) - 1
+        if index < 0 or seconds > self.start[index] + self.duration[index]:
+            return -1
+        return index
+
+    def indices_at(self, seconds):
+        """index_at() for an array of times (vectorized)."""
+        seconds = np.asarray(seconds, dtype=np.float64)
+        indices = np.searchsorted(self.start, seconds, side='right') - 1
+        if not len(self.start):
+            return np.full(seconds.shape, -1, dtype=np.intp)
+        clipped = np.maximum(indices, 0)
+        outside = (indices < 0) | (seconds > self.start[clipped] + self.duration[clipped])
+        return np.where(outside, -1, indices)
+
+    def phase_at(self, seconds):
+        """(index, position within the interval 0.0-1.0), or (-1, 0.0)."""
+        index = self.index_at(seconds)
+        if index < 0:
+            return -1, 0.0
+        duration = float(self.duration[index])
+        if duration <= 0:
+            return index, 0.0
+        return index, (seconds - float(self.start[index])) / duration
+
+
+class SegmentColumns(IntervalColumns):
+    """Segment intervals plus loudness, pitch and timbre."""
+
+    def __init__(self, segments=()):
+        super().__init__(segments)
+        count = len(segments)
+        self.loudness_start = np.fromiter(
+            (s.get('loudness_start', -60.0) for s in segments), dtype=np.float32, count=count
+        )
+        self.loudness_max = np.fromiter(
+            (s.get('loudness_max', -60.0) for s in segments), dtype=np.float32, count=count
+        )
+        self.pitches = _matrix(segments, 'pitches')
+        self.timbre = _matrix(segments, 'timbre')
+
+    def to_dict(self, index):
+        """Segment ``index`` in the shape of the Spotify JSON."""
+        return {
+            'start': float(self.start[index]),
+            'duration': float(self.duration[index]),
+            'confidence': float(self.confidence[index]),
+            'loudness_start': float(self.loudness_start[index]),
+            'loudness_max': float(self.loudness_max[index]),
+            'pitches': self.pitches[index].tolist(),
+            'timbre': self.timbre[index].tolist(),
+        }
+
+
+def _matrix(segments, key, width=12):
+    """(n, width) float32 matrix of a per-segment vector (missing = zeros)."""
+    matrix = np.zeros((len(segments), width), dtype=np.float32)
+    for row, segment in enumerate(segments):
+        values = segment.get(key)
+        if values:
+            values = values[:width]
+            matrix[row, :len(values)] = values
+    return matrix
+
+
+class AnalysisIndex:
+    """Columnar audio analysis for one track."""
+
+    def __init__(self, segments, intervals, track=None):
+        """
+        Args:
+            segments: SegmentColumns
+            intervals: {kind: IntervalColumns} for bars, beats, tatums, sections
+            track: Track-level summary (tempo, loudness, duration, ...)
+        """
+        self.segments = segments
+        self.intervals = intervals
+        self.track = track or {}
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        """Build the index from the audio-analysis JSON (None if there is none)."""
+        if not analysis:
+            return None
+        track = analysis.get('track') or {}
+        summary = {
+            key: track[key]
+            for key in ('duration', 'tempo', 'loudness', 'key', 'mode', 'time_signature')
+            if key in track
+        }
+        intervals = {kind: IntervalColumns(analysis.get(kind) or []) for kind in INTERVAL_KINDS}
+        return cls(SegmentColumns(analysis.get('segments') or []), intervals, summary)
+
+    def to_arrays(self):
+        """Flat {key: array} of every column, for np.savez (see from_arrays)."""
+        arrays = {f'segments.{name}': column for name, column in self.segments.columns().items()}
+        for kind, columns in self.intervals.items():
+            arrays.update({f'{kind}.{name}': column for name, column in columns.columns().items()})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, track=None):
+        """Rebuild an index from to_arrays() output (e.g. a loaded .npz)."""
+        grouped = {}
+        for key in arrays:
+            kind, _, name = key.partition('.')
+            if name:
+                grouped.setdefault(kind, {})[name] = np.asarray(arrays[key])
+        segments = SegmentColumns.from_columns(grouped.get('segments', SegmentColumns().columns()))
+        intervals = {
+            kind: IntervalColumns.from_columns(grouped.get(kind, IntervalColumns().columns()))
+            for kind in INTERVAL_KINDS
+        }
+        return cls(segments, intervals, track)
+
+    @property
+    def beats(self):
+        return self.intervals['beats']
+
+    @property
+    def bars(self):
+        return self.intervals['bars']
+
+    @property
+    def tatums(self):
+        return self.intervals['tatums']
+
+    @property
+    def sections(self):
+        return self.intervals['sections']
+
+    @property
+    def nbytes(self):
+        return self.segments.nbytes + sum(columns.nbytes for columns in self.intervals.values())
+
+    def segment_at(self, seconds):
+        """Index of the segment playing at ``seconds``, or -1."""
+        return self.segments.index_at(seconds)
+
+    def cursor(self, kind='segments'):
+        """AnalysisCursor over segments or one of INTERVAL_KINDS."""
+        columns = self.segments if kind == 'segments' else self.intervals[kind]
+        return AnalysisCursor(columns)
+
+
+class AnalysisCursor:
+    """Position in one column set that follows playback incrementally.
+
+    Playback moves forward a little between frames, so seek() first checks
+    the current and next few items and only binary-searches after a jump
+    (seek, skip, track restart).
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.index = -1
+
+    def seek(self, seconds):
+        """Move to the item containing ``seconds`` and return its index (-1 if none)."""
+        columns = self.columns
+        start = columns.start
+        index = self.index
+        count = len(start)
+        if 0 <= index < count and seconds >= start[index]:
+            for _ in range(_CURSOR_SCAN_LIMIT):
+                if index + 1 >= count or seconds < start[index + 1]:
+                    if seconds <= start[index] + columns.duration[index]:
+                        self.index = index
+                        return index
+                    break
+                index += 1
+        self.index = columns.index_at(seconds)
+        return self.index
@@ -4,22 +4,35 @@ import time
 import threading
 from typing import Dict, Optional, Tuple
 
+from .analysis_cache import analysis_cache
+from .analysis_index import AnalysisIndex
+from .playback_state import TRACK_CHANGED, playback_state
 from .spotify_manager import (
     is_auth_failure,
     is_audio_features_restricted,
     is_transient_token_error,
 )
 
+# Upcoming queue tracks whose analysis is fetched ahead of time
+PREFETCH_TRACKS = 2
+
 
 class AudioAnalyzer:
     """Analyzes Spotify audio features for dynamic animation control."""
 
+    # Features are per track (fetched from Spotify), not measured live
+    is_live = False
+
     def __init__(self, spotify_manager, enabled=True):
         self.spotify_manager = spotify_manager
         self.current_features = None
-        self.current_analysis = None
+        self.current_analysis = None  # AnalysisIndex for the current track
+        self._segment_cursor = None
         self.last_track_id = None
         self.analysis_thread = None
+        self._prefetch_thread = None
+        self._track_changed = threading.Event()
+        self._unsubscribe = None
         self.should_run = True
         self.enabled = enabled
         self._paused = False
@@ -28,16 +41,33 @@ class AudioAnalyzer:
     def start_analysis(self):
         """Start continuous audio analysis."""
         self.should_run = True
+        if self._unsubscribe is None and not self.is_live:
+            self._unsubscribe = playback_state.subscribe(self._on_playback)
         self.analysis_thread = threading.Thread(target=self._analysis_loop, daemon=True)
         self.analysis_thread.start()
 
     def stop_analysis(self):
         """Stop audio analysis."""
         self.should_run = False
+        self._track_changed.set()
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
         if self.analysis_thread:
             self.analysis_thread.join(timeout=1)
             self.analysis_thread = None
 
+    def _on_playback(self, snapshot, changes):
+        """Wake the analysis loop as soon as the shared poller sees a new track."""
+        if any(change.kind == TRACK_CHANGED for change in changes):
+            self._track_changed.set()
+
+    def acquire(self):
+        """Register an animation reading the analyzer (no-op for Spotify)."""
+
+    def release(self):
+        """Unregister an animation reading the analyzer (no-op for Spotify)."""
+
     def _analysis_loop(self):
         """Continuous analysis loop."""
         while self.should_run:
@@ -49,7 +79,9 @@ class AudioAnalyzer:
 
                 if self.enabled and not self._paused and not self._restricted:
                     self._update_analysis()
-                time.sleep(2)  # Update every 2 seconds
+                # Re-check every 2 seconds, or right away on a track change
+                self._track_changed.wait(2)
+                self._track_changed.clear()
             except Exception as e:
                 if is_audio_features_restricted(e):
                     self._disable_due_to_restriction(e)
@@ -90,42 +122,33 @@ class AudioAnalyzer:
             return
 
         try:
-            current = self.spotify_manager.get_current_playback()
-            if not current or not current['item']:
+            # Read from the shared poller; no request of our own
+            snapshot = playback_state.snapshot()
+            if snapshot is None or not snapshot.has_track:
                 return
 
-            track_id = current['item']['id']
+            track_id = snapshot.track_id
 
             # Only fetch new data if track changed
             if track_id != self.last_track_id:
                 self.last_track_id = track_id
+                # Never use the previous track's analysis or features
+                self.current_analysis = None
+                self.current_features = None
 
-                try:
-                    features = self.spotify_manager.api_call(
-                        'audio_features', [track_id], quiet=False
-                    )
-                    if features and features[0]:
-                        self.current_features = features[0]
-                except Exception as e:
-                    if is_audio_features_restricted(e):
-                        self._disable_due_to_restriction(e)
-                        return
-                    raise
-
-                # Get audio analysis (detailed) — also often 403 now
-                try:
-                    analysis = self.spotify_manager.api_call(
-                        'audio_analysis', track_id, quiet=False
-                    )
-                    self.current_analysis = analysis
-                except Exception as e:
-                    if is_audio_features_restricted(e):
-                        self._disable_due_to_restriction(e)
-                        return
-                    if is_auth_failure(e):
-                        self.spotify_manager.mark_auth_failed(e)
-                    else:
-                        print(f"Could not get audio analysis: {e}")
+                cached = analysis_cache.get(track_id)
+                if cached is not None:
+                    self.current_features, self.current_analysis = cached
+                else:
+                    self._fetch_track(track_id)
+
+                if self.current_analysis is not None:
+                    # Pre-render the analysis-driven animations for this track
+                    from ..animations.timeline import track_timelines
+                    track_timelines.submit(track_id, self.current_analysis, self.current_features)
+
+                # Have the next tracks' analysis ready before they start
+                self._start_prefetch()
 
         except Exception as e:
             if is_audio_features_restricted(e):
@@ -137,12 +160,81 @@ class AudioAnalyzer:
             else:
                 print(f"Error updating audio analysis: {e}")
 
+    def _fetch_track(self, track_id):
+        """Download features and analysis for the current track and cache them."""
+        track_features = None
+        try:
+            features = self.spotify_manager.api_call(
+                'audio_features', [track_id], quiet=False
+            )
+            if features and features[0]:
+                track_features = self.current_features = features[0]
+        except Exception as e:
+            if is_audio_features_restricted(e):
+                self._disable_due_to_restriction(e)
+                return
+            raise
+
+        # Get audio analysis (detailed) — also often 403 now
+        try:
+            analysis = self.spotify_manager.api_call(
+                'audio_analysis', track_id, quiet=False
+            )
+            # Keep only the columnar index, not the JSON
+            self.current_analysis = AnalysisIndex.from_analysis(analysis)
+            analysis_cache.put(track_id, track_features, self.current_analysis)
+        except Exception as e:
+            if is_audio_features_restricted(e):
+                self._disable_due_to_restriction(e)
+                return
+            if is_auth_failure(e):
+                self.spotify_manager.mark_auth_failed(e)
+            else:
+                print(f"Could not get audio analysis: {e}")
+
+    def _start_prefetch(self):
+        """Fetch upcoming queue tracks in the background (one prefetch at a time)."""
+        if self._restricted or not self.enabled:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        self._prefetch_thread = threading.Thread(target=self._prefetch_queue, name='analysis-prefetch', daemon=True)
+        self._prefetch_thread.start()
+
+    def _prefetch_queue(self):
+        """Cache features and analysis for the next PREFETCH_TRACKS queued tracks."""
+        try:
+            queue = self.spotify_manager.api_call('queue', quiet=True) or {}
+            upcoming = [
+                item['id'] for item in (queue.get('queue') or [])[:PREFETCH_TRACKS]
+                if item and item.get('type', 'track') == 'track' and item.get('id')
+            ]
+            missing = [track_id for track_id in dict.fromkeys(upcoming) if not analysis_cache.contains(track_id)]
+            if not missing:
+                return
+
+            # One request for all the features
+            features = self.spotify_manager.api_call('audio_features', missing, quiet=True) or []
+            features_by_id = {item['id']: item for item in features if item}
+            for track_id in missing:
+                if not self.should_run or not self.enabled or self._restricted:
+                    return
+                analysis = self.spotify_manager.api_call('audio_analysis', track_id, quiet=True)
+                index = AnalysisIndex.from_analysis(analysis)
+                if index is not None:
+                    analysis_cache.put(track_id, features_by_id.get(track_id), index)
+        except Exception as e:
+            if is_audio_features_restricted(e):
+                self._disable_due_to_restriction(e)
+            elif not is_transient_token_error(e):
+                print(f"⚠️ Could not prefetch audio analysis: {e}")
+
     def get_current_features(self) -> Optional[Dict]:
         """Get current track's audio features."""
         return self.current_features
 
-    def get_current_analysis(self) -> Optional[Dict]:
-        """Get current track's detailed audio analysis."""
+    def get_current_analysis(self) -> Optional[AnalysisIndex]:
+        """Get current track's detailed audio analysis as an AnalysisIndex."""
         return self.current_analysis
 
     def get_energy_level(self) -> float:
@@ -157,6 +249,12 @@ class AudioAnalyzer:
             return 120.0
         return self.current_features.get('tempo', 120.0)
 
+    def get_beat_phase(self, now=None) -> float:
+        """Position within the current beat (0.0-1.0), from the tempo alone."""
+        beat_duration = 60.0 / self.get_tempo()
+        now = time.time() if now is None else now
+        return (now % beat_duration) / beat_duration
+
     def get_danceability(self) -> float:
         """Get danceability (0.0-1.0)."""
         if not self.current_features:
@@ -270,44 +368,41 @@ class AudioAnalyzer:
             'danceability': danceability
         }
 
+    def _current_segment_index(self, progress_ms):
+        """(index, segment columns) for the playback position, or (-1, None)."""
+        analysis = self.current_analysis
+        if not analysis or not progress_ms:
+            return -1, None
+
+        cursor = self._segment_cursor
+        if cursor is None or cursor.columns is not analysis.segments:
+            # New track: start a fresh cursor over its segments
+            cursor = self._segment_cursor = analysis.cursor('segments')
+        return cursor.seek(progress_ms / 1000.0), analysis.segments
+
     def get_current_segments(self, progress_ms: int) -> Tuple[Optional[Dict], list]:
         """Get current and upcoming audio segments."""
-        if not self.current_analysis or not progress_ms:
+        index, segments = self._current_segment_index(progress_ms)
+        if index < 0:
             return None, []
 
-        progress_sec = progress_ms / 1000.0
-        segments = self.current_analysis.get('segments', [])
-
-        current_segment = None
-        upcoming_segments = []
-
-        for i, segment in enumerate(segments):
-            start = segment['start']
-            duration = segment['duration']
-            end = start + duration
-
-            if start <= progress_sec <= end:
-                current_segment = segment
-                # Get next few segments for prediction
-                upcoming_segments = segments[i+1:i+4]
-                break
-
-        return current_segment, upcoming_segments
+        # Next few segments for prediction
+        upcoming = range(index + 1, min(index + 4, len(segments)))
+        return segments.to_dict(index), [segments.to_dict(i) for i in upcoming]
 
     def get_spectrum_data(self, progress_ms: int) -> Optional[Dict]:
         """Get spectrum data for current position."""
-        current_segment, upcoming = self.get_current_segments(progress_ms)
-
-        if not current_segment:
+        index, segments = self._current_segment_index(progress_ms)
+        if index < 0:
             return None
 
-        # Extract useful data for visualization
+        # Extract useful data for visualization (pitches/timbre are array rows)
         return {
-            'loudness_max': current_segment.get('loudness_max', -30),
-            'loudness_start': current_segment.get('loudness_start', -30),
-            'pitches': current_segment.get('pitches', [0] * 12),  # 12-tone chroma
-            'timbre': current_segment.get('timbre', [0] * 12),    # Spectral characteristics
-            'confidence': current_segment.get('confidence', 0.5)
+            'loudness_max': float(segments.loudness_max[index]),
+            'loudness_start': float(segments.loudness_start[index]),
+            'pitches': segments.pitches[index],  # 12-tone chroma
+            'timbre': segments.timbre[index],    # Spectral characteristics
+            'confidence': float(segments.confidence[index])
         }
 
 
@@ -350,9 +445,19 @@ class AudioAnalyzer:
             return "active"
 
 
-def create_audio_analyzer(spotify_manager, enabled=True):
-    """Factory function to create audio analyzer."""
-    analyzer = AudioAnalyzer(spotify_manager, enabled=enabled)
+def create_audio_analyzer(spotify_manager, enabled=True, source='spotify'):
+    """Factory function to create audio analyzer.
+
+    Args:
+        spotify_manager: SpotifyManager instance
+        enabled: Start enabled
+        source: 'spotify' (track audio features) or 'microphone' (live analysis)
+    """
+    if source == 'microphone':
+        from .local_audio_analyzer import LocalAudioAnalyzer
+        analyzer = LocalAudioAnalyzer(spotify_manager, enabled=enabled)
+    else:
+        analyzer = AudioAnalyzer(spotify_manager, enabled=enabled)
     if enabled:
         analyzer.start_analysis()
     return analyzer
@@ -0,0 +1,111 @@
+"""Cached resolution of the Spotify Connect device to send commands to.
+
+Every pad press used to list devices() before its command. DeviceRegistry
+remembers the device playback is on, kept fresh by the playback-state
+poller (see playback_state) and by cold resolutions, so a press while
+something is playing needs no extra request. The entry expires after
+DEVICE_TTL seconds without confirmation and is dropped as soon as a
+command aimed at it fails.
+"""
+
+import threading
+import time
+
+# Seconds a device stays trusted without being seen again
+DEVICE_TTL = 30.0
+# Seconds between readiness checks after activating a device
+ACTIVATION_POLL_INTERVAL = 0.2
+# Give up waiting for a device to become active after this long
+ACTIVATION_TIMEOUT = 3.0
+
+
+class DeviceRegistry:
+    """The current Spotify Connect device, with a time-to-live."""
+
+    def __init__(self, ttl=DEVICE_TTL):
+        """
+        Args:
+            ttl: Seconds a remembered device is used without a devices() call
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._device = None
+        self._seen_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.activations = 0
+        self.activation_failures = 0
+        self.last_activation_s = None
+
+    def device_id(self, now=None):
+        """ID of the remembered device while it is fresh, else None."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._device is not None and now - self._seen_at <= self.ttl:
+                self.hits += 1
+                return self._device.get('id')
+            self.misses += 1
+            return None
+
+    def device(self):
+        """Remembered device dict (possibly expired), or None."""
+        return self._device
+
+    def remember(self, device, now=None):
+        """Record ``device`` (a Spotify device dict) as the one to use."""
+        if not device or not device.get('id'):
+            return
+        with self._lock:
+            self._device = device
+            self._seen_at = time.monotonic() if now is None else now
+
+    def invalidate(self, device_id=None):
+        """Forget the device (only if it is ``device_id``, when given)."""
+        with self._lock:
+            if self._device is None:
+                return
+            if device_id is not None and self._device.get('id') != device_id:
+                return
+            self._device = None
+            self.invalidations += 1
+
+    def observe(self, snapshot):
+        """Update from a PlaybackSnapshot (called by the playback poller)."""
+        if snapshot.device_id:
+            self.remember(snapshot.device, snapshot.fetched_at)
+        elif not snapshot.active:
+            # Playback is gone from every device; the next press lists devices
+            self.invalidate()
+
+    def record_activation(self, seconds, ready):
+        """Count one device activation and how long it took to confirm."""
+        with self._lock:
+            self.activations += 1
+            if ready:
+                self.last_activation_s = seconds
+            else:
+                self.activation_failures += 1
+
+    def get_stats(self):
+        """Cached device, its age and hit counters."""
+        with self._lock:
+            device = self._device
+            return {
+                'device_id': device.get('id') if device else None,
+                'device_name': device.get('name') if device else None,
+                'age_s': round(time.monotonic() - self._seen_at, 3) if device else None,
+                'ttl_s': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'activations': self.activations,
+                'activation_failures': self.activation_failures,
+                'last_activation_s': (
+                    round(self.last_activation_s, 3) if self.last_activation_s is not None else None
+                ),
+            }
+
+
+# Global registry shared by button handlers, the web API and the poller
+device_registry = DeviceRegistry()
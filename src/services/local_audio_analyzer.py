@@ -0,0 +1,407 @@
+"""Live audio analysis from the microphone.
+
+Drop-in replacement for the Spotify audio-features analyzer, which most
+apps can no longer use (403). Every hop (~12 ms) of the shared capture
+ring is turned into:
+
+  * RMS energy and loudness
+  * spectral flux over log-spaced bands, with adaptive-threshold onsets
+  * a BPM estimate from the autocorrelation of the flux envelope
+  * a beat phase locked to the onsets near each predicted beat
+
+The results are published as a Spotify-style ``current_features`` dict, so
+get_energy_level(), get_tempo(), get_animation_parameters() and the other
+AudioAnalyzer getters work unchanged — tens of milliseconds behind the
+room instead of one network round-trip per track.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..hardware.audio import audio_capture
+from ..hardware.spectral import analysis_window, log_filterbank
+from .audio_analyzer import AudioAnalyzer
+
+# Analysis window and hop (samples)
+FFT_SIZE = 1024
+HOP_SIZE = 512
+# Bands the spectral flux is summed over
+FLUX_BANDS = 24
+# Bands reported as 'pitches' by get_spectrum_data()
+SPECTRUM_BANDS = 12
+# Seconds of flux envelope kept for tempo estimation
+ENVELOPE_SECONDS = 6.0
+# Onset threshold: local mean flux * ratio + delta, over this many seconds
+ONSET_WINDOW_SECONDS = 0.5
+ONSET_RATIO = 1.5
+ONSET_DELTA = 0.05
+# Shortest gap between two onsets
+MIN_ONSET_INTERVAL = 0.1
+# Tempo search range and how often it is re-estimated
+MIN_BPM = 60.0
+MAX_BPM = 180.0
+TEMPO_UPDATE_SECONDS = 0.5
+# Weight of the beat-phase correction applied by each on-beat onset
+PHASE_CORRECTION = 0.2
+# Loudness (dBFS) mapped to energy 0 and 1
+SILENCE_DB = -50.0
+FULL_SCALE_DB = -6.0
+# Energy smoothing per hop (0 = none)
+ENERGY_SMOOTHING = 0.8
+# Most hops processed per wake-up after a stall; older audio is skipped
+MAX_HOPS_PER_UPDATE = 64
+# Retry opening the microphone this often after a failure
+CAPTURE_RETRY_SECONDS = 5.0
+
+
+class LocalAudioAnalyzer(AudioAnalyzer):
+    """Onset, tempo, beat-phase and energy tracking on the capture ring."""
+
+    # Features follow the room in real time (no Spotify round-trips)
+    is_live = True
+
+    def __init__(self, spotify_manager=None, enabled=True, capture=None):
+        """
+        Args:
+            spotify_manager: Kept for the AudioAnalyzer interface (unused)
+            enabled: Start enabled
+            capture: AudioCaptureService (default: the shared audio_capture)
+        """
+        super().__init__(spotify_manager, enabled=enabled)
+        self.capture = capture or audio_capture
+        self.sample_rate = self.capture.sample_rate
+        self.frame_rate = self.sample_rate / HOP_SIZE
+        self._window = analysis_window(FFT_SIZE)
+        self._flux_bank, _ = log_filterbank(FLUX_BANDS, FFT_SIZE, self.sample_rate)
+        self._spectrum_bank, _ = log_filterbank(SPECTRUM_BANDS, FFT_SIZE, self.sample_rate)
+        self._freqs = np.fft.rfftfreq(FFT_SIZE, 1.0 / self.sample_rate)
+
+        self._lock = threading.Lock()
+        self._consumers = 0
+        self._capturing = False
+        self._capture_failed_at = None
+        self._reset_tracking()
+
+    def _reset_tracking(self):
+        envelope_size = int(ENVELOPE_SECONDS * self.frame_rate)
+        self._cursor = None
+        self._envelope = np.zeros(envelope_size, dtype=np.float32)
+        self._frames = 0
+        self._previous_bands = None
+        self._energy = 0.0
+        self._loudness = SILENCE_DB
+        self._brightness = 0.5
+        self._spectrum = np.zeros(SPECTRUM_BANDS, dtype=np.float32)
+        self._spectrum_levels = self._spectrum
+        self._onset_strength = 0.0
+        self._last_onset = None
+        self._last_onset_sample = None
+        self._onsets = 0
+        self._tempo = 120.0
+        self._tempo_confidence = 0.0
+        self._tempo_candidate = None
+        self._tempo_updated = 0
+        self._beat_sample = None
+        self.current_features = None
+
+    # Consumers ---------------------------------------------------------
+
+    def acquire(self):
+        """Register an animation reading the analyzer (opens the microphone)."""
+        with self._lock:
+            self._consumers += 1
+
+    def release(self):
+        """Unregister an animation; capture stops when none are left."""
+        with self._lock:
+            self._consumers = max(0, self._consumers - 1)
+
+    def start_analysis(self):
+        """Start the analysis thread (capture starts with the first consumer)."""
+        if self.analysis_thread and self.analysis_thread.is_alive():
+            return
+        super().start_analysis()
+
+    def stop_analysis(self):
+        """Stop analysis and release the microphone."""
+        super().stop_analysis()
+        self._stop_capture()
+
+    # Analysis loop -----------------------------------------------------
+
+    def _analysis_loop(self):
+        hop_seconds = HOP_SIZE / self.sample_rate
+        while self.should_run:
+            try:
+                with self._lock:
+                    wanted = self._consumers > 0
+                if not wanted or not self.is_enabled():
+                    self._stop_capture()
+                    time.sleep(0.1)
+                    continue
+                if not self._capturing and not self._start_capture():
+                    time.sleep(0.1)
+                    continue
+                self._process_new_samples()
+                time.sleep(hop_seconds)
+            except Exception as e:
+                print(f"Live audio analysis error: {e}")
+                time.sleep(1)
+        self._stop_capture()
+
+    def _start_capture(self):
+        failed_at = self._capture_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < CAPTURE_RETRY_SECONDS:
+            return False
+        if not self.capture.acquire():
+            if failed_at is None:
+                print("⚠️ Live audio analysis: microphone unavailable; animations use default values")
+            self._capture_failed_at = time.monotonic()
+            return False
+        self._capture_failed_at = None
+        self._capturing = True
+        self._reset_tracking()
+        return True
+
+    def _stop_capture(self):
+        if self._capturing:
+            self._capturing = False
+            self.capture.release()
+
+    def _process_new_samples(self):
+        ring = self.capture.ring
+        written = ring.written
+        if self._cursor is None:
+            # Start at the newest full window
+            if written < FFT_SIZE:
+                return
+            self._cursor = written - HOP_SIZE
+        # After a stall only the newest hops are worth analysing
+        self._cursor = max(self._cursor, written - MAX_HOPS_PER_UPDATE * HOP_SIZE)
+
+        processed = False
+        while self._cursor + HOP_SIZE <= written:
+            self._cursor += HOP_SIZE
+            window = ring.window(self._cursor, FFT_SIZE)
+            if window is None:
+                continue
+            self._process_hop(window, self._cursor)
+            processed = True
+        if processed:
+            self._publish()
+
+    def _process_hop(self, window, hop_end):
+        # Times are sample positions (hop_end = the hop's last sample + 1),
+        # so tracking follows the audio clock, not the thread's wake-ups
+        hop = window[-HOP_SIZE:]
+        rms = float(np.sqrt(np.mean(np.square(hop, dtype=np.float32))))
+        loudness = 20 * math.log10(rms + 1e-9)
+        energy = min(1.0, max(0.0, (loudness - SILENCE_DB) / (FULL_SCALE_DB - SILENCE_DB)))
+        self._loudness = ENERGY_SMOOTHING * self._loudness + (1 - ENERGY_SMOOTHING) * loudness
+        self._energy = ENERGY_SMOOTHING * self._energy + (1 - ENERGY_SMOOTHING) * energy
+
+        magnitudes = np.abs(np.fft.rfft(window * self._window)).astype(np.float32)
+        bands = np.log1p(self._flux_bank @ magnitudes)
+        spectrum = np.log1p(self._spectrum_bank @ magnitudes)
+        self._spectrum = 0.5 * self._spectrum + 0.5 * spectrum
+        total = magnitudes.sum()
+        if total > 0:
+            centroid = float(self._freqs @ magnitudes / total)
+            brightness = min(1.0, centroid / 4000.0)
+            self._brightness = 0.95 * self._brightness + 0.05 * brightness
+
+        # Spectral flux: total rise across bands since the previous hop
+        previous = self._previous_bands
+        flux = float(np.maximum(bands - previous, 0).sum()) if previous is not None else 0.0
+        self._previous_bands = bands
+
+        envelope = self._envelope
+        size = len(envelope)
+        index = self._frames % size
+        envelope[index] = flux
+        self._frames += 1
+        self._detect_onset(flux, hop_end)
+
+        if hop_end - self._tempo_updated >= TEMPO_UPDATE_SECONDS * self.sample_rate and self._frames >= size // 2:
+            self._tempo_updated = hop_end
+            self._estimate_tempo()
+
+    def _detect_onset(self, flux, hop_end):
+        count = min(self._frames, int(ONSET_WINDOW_SECONDS * self.frame_rate))
+        recent = self._recent_envelope(count)
+        threshold = float(recent.mean()) * ONSET_RATIO + ONSET_DELTA if count else ONSET_DELTA
+        self._onset_strength = max(0.0, flux - threshold)
+        if flux <= threshold:
+            return
+        last = self._last_onset_sample
+        if last is not None and hop_end - last < MIN_ONSET_INTERVAL * self.sample_rate:
+            return
+        # The onset is somewhere in the newest hop; take its middle
+        onset = hop_end - HOP_SIZE / 2
+        self._last_onset_sample = hop_end
+        self._last_onset = time.monotonic()
+        self._onsets += 1
+        self._lock_phase(onset)
+
+    def _lock_phase(self, onset):
+        period = self.sample_rate * 60.0 / self._tempo
+        if self._beat_sample is None:
+            self._beat_sample = onset
+            return
+        # Distance from the nearest predicted beat, in periods (-0.5 .. 0.5)
+        offset = (onset - self._beat_sample) / period
+        error = offset - round(offset)
+        if abs(error) < 0.25:
+            self._beat_sample += error * period * PHASE_CORRECTION
+        elif self._tempo_confidence < 0.1:
+            # No steady beat yet; follow the onsets
+            self._beat_sample = onset
+
+    def _recent_envelope(self, count):
+        """Last ``count`` envelope values, oldest first."""
+        if count <= 0:
+            return self._envelope[:0]
+        size = len(self._envelope)
+        end = self._frames % size
+        indices = np.arange(end - count, end) % size
+        return self._envelope[indices]
+
+    def _estimate_tempo(self):
+        envelope = self._recent_envelope(min(self._frames, len(self._envelope)))
+        envelope = envelope - envelope.mean()
+        n = len(envelope)
+        spectrum = np.fft.rfft(envelope, 2 * n)
+        autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+        if autocorr[0] <= 0:
+            return
+
+        min_lag = int(self.frame_rate * 60.0 / MAX_BPM)
+        max_lag = min(n - 2, int(self.frame_rate * 60.0 / MIN_BPM) + 1)
+        if max_lag <= min_lag:
+            return
+        lags = np.arange(min_lag, max_lag + 1)
+        # Prefer tempos near 120 BPM (log-Gaussian prior, as beat trackers do)
+        bpm = 60.0 * self.frame_rate / lags
+        prior = np.exp(-0.5 * (np.log2(bpm / 120.0) / 1.0) ** 2)
+        scores = autocorr[lags] * prior
+        best = int(np.argmax(scores))
+        lag = float(lags[best])
+        # Parabolic interpolation around the peak for sub-frame precision
+        if 0 < best < len(lags) - 1:
+            a, b, c = autocorr[lags[best] - 1], autocorr[lags[best]], autocorr[lags[best] + 1]
+            denominator = a - 2 * b + c
+            if denominator != 0:
+                lag += 0.5 * (a - c) / denominator
+
+        confidence = float(max(0.0, autocorr[lags[best]] / autocorr[0]))
+        self._tempo_confidence = confidence
+        if confidence < 0.05:
+            return
+        tempo = float(60.0 * self.frame_rate / lag)
+        if abs(tempo - self._tempo) / self._tempo > 0.1:
+            # Jump to a new tempo only once two estimates agree
+            candidate = self._tempo_candidate
+            if candidate is not None and abs(tempo - candidate) / candidate < 0.05:
+                self._tempo = tempo
+                self._tempo_candidate = None
+            else:
+                self._tempo_candidate = tempo
+        else:
+            self._tempo = 0.7 * self._tempo + 0.3 * tempo
+            self._tempo_candidate = None
+
+    def _publish(self):
+        # Band levels relative to the quietest and loudest band
+        spectrum = self._spectrum
+        floor = float(spectrum.min())
+        span = float(spectrum.max()) - floor
+        self._spectrum_levels = (spectrum - floor) / span if span > 0 else np.zeros_like(spectrum)
+        # Spotify-style features: energy, loudness and tempo are measured;
+        # danceability follows beat steadiness and valence brightness
+        self.current_features = {
+            'energy': round(self._energy, 3),
+            'loudness': round(self._loudness, 1),
+            'tempo': round(self._tempo, 1),
+            'danceability': round(min(1.0, self._tempo_confidence * 2), 3),
+            'valence': round(self._brightness, 3),
+            'acousticness': 0.5,
+            'instrumentalness': 0.5,
+        }
+
+    # Live getters ------------------------------------------------------
+
+    def get_beat_phase(self, now=None) -> float:
+        """Position within the current beat (0.0 on the beat, rising to 1.0)."""
+        beat_sample = self._beat_sample
+        position = self.capture.ring.position_at(time.monotonic() if now is None else now)
+        if beat_sample is None or position is None:
+            return super().get_beat_phase(now)
+        period = self.sample_rate * 60.0 / self._tempo
+        return ((position - beat_sample) / period) % 1.0
+
+    def get_onset_strength(self) -> float:
+        """Flux above the onset threshold at the latest hop (0 = no onset)."""
+        return self._onset_strength
+
+    def get_last_onset_time(self) -> Optional[float]:
+        """time.monotonic() of the latest onset, or None."""
+        return self._last_onset
+
+    def get_rms_energy(self) -> float:
+        """Smoothed RMS energy (0.0-1.0) — same as get_energy_level() while live."""
+        return self._energy
+
+    def get_spectrum_data(self, progress_ms: int = None) -> Optional[Dict]:
+        """Live spectrum in the shape of Spotify's segment data.
+
+        ``pitches`` are 12 log-spaced band levels (0-1); ``timbre`` is the
+        same scaled to Spotify's coefficient range.
+        """
+        if self.current_features is None:
+            return None
+        levels = self._spectrum_levels
+        return {
+            'loudness_max': float(self._loudness),
+            'loudness_start': float(self._loudness),
+            'pitches': levels.tolist(),
+            'timbre': (levels * 100).tolist(),
+            'confidence': float(self._tempo_confidence),
+        }
+
+    def get_stats(self) -> Dict:
+        """Tracking counters for status output."""
+        return {
+            'capturing': self._capturing,
+            'consumers': self._consumers,
+            'onsets': self._onsets,
+            'tempo': round(self._tempo, 1),
+            'tempo_confidence': round(self._tempo_confidence, 3),
+            'energy': round(self._energy, 3),
+            'loudness_db': round(self._loudness, 1),
+        }
+
+    def enable(self):
+        """Enable live analysis."""
+        self.enabled = True
+        print("🎵 Live audio analysis enabled")
+
+    def disable(self):
+        """Disable live analysis."""
+        self.enabled = False
+        print("🔇 Live audio analysis disabled")
+
+    def get_status(self) -> str:
+        """Get current status of the analyzer."""
+        if not self.enabled:
+            return "disabled"
+        if self._paused:
+            return "paused"
+        if not self._capturing:
+            return "idle"
+        if self.current_features is None:
+            return "waiting"
+        return "active"
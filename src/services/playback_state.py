@@ -0,0 +1,448 @@
+"""Shared Spotify playback state.
+
+One thread polls ``current_playback`` and publishes the result as an
+immutable PlaybackSnapshot; the status monitor, audio analyzer, animations,
+MIDI handler and web panel all read the latest snapshot instead of making
+their own (lock-serialized) API calls. The playback position is
+extrapolated locally from ``time.monotonic()`` between polls, so per-frame
+readers never touch the network.
+
+Listeners registered with subscribe() are called on the poller thread after
+every poll with the new snapshot and the PlaybackChange events it produced
+(track, play state, context, device, volume).
+
+How often it polls is decided by PollScheduler: densely just before the
+extrapolated end of the track and right after playback commands, every few
+seconds mid-track, backing off exponentially while paused or without an
+active device, and not at all while Spotify needs re-authentication.
+"""
+
+import collections
+import threading
+import time
+
+from .device_registry import device_registry
+
+# Mid-track poll interval; the position is extrapolated in between
+PLAYING_INTERVAL = 3.0
+# Poll interval around track ends and right after playback commands
+DENSE_INTERVAL = 0.25
+# Dense polling starts this long before the extrapolated end of the track...
+TRACK_END_LEAD = 1.0
+# ...and gives up this long after it (stalled playback, end not reached)
+TRACK_END_GRACE = 5.0
+# Dense polling after a playback command (ends early once a change is seen)
+COMMAND_BURST_SECONDS = 3.0
+# Paused / no active device: interval doubles from min to max while nothing changes
+IDLE_MIN_INTERVAL = 1.0
+IDLE_MAX_INTERVAL = 20.0
+# Wait between (local) checks while Spotify needs re-authentication
+AUTH_WAIT_INTERVAL = 2.0
+# Back-off after an unexpected poll error
+ERROR_RETRY_INTERVAL = 5.0
+# Stop extrapolating the position this long after the last successful poll
+STALE_SECONDS = 10.0
+# Window for the requests-per-minute metric
+RATE_WINDOW_SECONDS = 60.0
+# Track-change detection latencies kept per cause
+LATENCY_SAMPLES = 100
+
+# Change kinds reported by PlaybackChange
+TRACK_CHANGED = 'track'
+PLAY_STATE_CHANGED = 'play_state'
+CONTEXT_CHANGED = 'context'
+DEVICE_CHANGED = 'device'
+VOLUME_CHANGED = 'volume'
+CHANGE_KINDS = (TRACK_CHANGED, PLAY_STATE_CHANGED, CONTEXT_CHANGED, DEVICE_CHANGED, VOLUME_CHANGED)
+
+
+class PlaybackSnapshot:
+    """Immutable view of one ``current_playback`` response."""
+
+    __slots__ = ('active', 'track', 'track_id', 'is_playing', 'progress_ms', 'duration_ms',
+                 'context', 'context_uri', 'device', 'device_id', 'volume_percent', 'fetched_at')
+
+    def __init__(self, playback, fetched_at):
+        """
+        Args:
+            playback: ``current_playback`` dict, or None when nothing is playing
+            fetched_at: time.monotonic() when the response arrived
+        """
+        playback = playback or {}
+        track = playback.get('item') or None
+        device = playback.get('device') or None
+        context = playback.get('context') or None
+        values = {
+            'active': bool(playback),
+            'track': track,
+            'track_id': track.get('id') if track else None,
+            'is_playing': bool(playback.get('is_playing')),
+            'progress_ms': playback.get('progress_ms'),
+            'duration_ms': track.get('duration_ms') if track else None,
+            'context': context,
+            'context_uri': context.get('uri') if context else None,
+            'device': device,
+            'device_id': device.get('id') if device else None,
+            'volume_percent': device.get('volume_percent') if device else None,
+            'fetched_at': fetched_at,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('PlaybackSnapshot is immutable')
+
+    def replace(self, **changes):
+        """Copy with some fields changed (for optimistic local updates)."""
+        snapshot = PlaybackSnapshot.__new__(PlaybackSnapshot)
+        for name in self.__slots__:
+            object.__setattr__(snapshot, name, changes.get(name, getattr(self, name)))
+        return snapshot
+
+    @property
+    def has_track(self):
+        return self.track is not None
+
+    def seconds_to_end(self, now=None):
+        """Seconds until the extrapolated end of the track (negative once past it)."""
+        if not self.is_playing or self.progress_ms is None or not self.duration_ms:
+            return None
+        now = time.monotonic() if now is None else now
+        return (self.duration_ms - self.progress_ms) / 1000.0 - (now - self.fetched_at)
+
+    def progress_at(self, now=None):
+        """Position in ms at monotonic time ``now``, extrapolated while playing."""
+        if self.progress_ms is None:
+            return None
+        if not self.is_playing:
+            return self.progress_ms
+        now = time.monotonic() if now is None else now
+        progress = self.progress_ms + (now - self.fetched_at) * 1000.0
+        if self.duration_ms:
+            progress = min(progress, self.duration_ms)
+        return progress
+
+    def to_dict(self, now=None):
+        """JSON-friendly summary (position extrapolated to ``now``)."""
+        track = self.track or {}
+        return {
+            'track_id': self.track_id,
+            'name': track.get('name'),
+            'artists': ", ".join(artist['name'] for artist in track.get('artists') or []),
+            'is_playing': self.is_playing,
+            'progress_ms': self.progress_at(now),
+            'duration_ms': self.duration_ms,
+            'context_uri': self.context_uri,
+            'device_id': self.device_id,
+            'volume_percent': self.volume_percent,
+        }
+
+
+class PlaybackChange:
+    """One difference between consecutive snapshots."""
+
+    __slots__ = ('kind', 'previous', 'current')
+
+    def __init__(self, kind, previous, current):
+        """
+        Args:
+            kind: One of CHANGE_KINDS
+            previous: Previous value (None on the first snapshot)
+            current: New value
+        """
+        self.kind = kind
+        self.previous = previous
+        self.current = current
+
+    def __repr__(self):
+        return f"PlaybackChange({self.kind!r}, {self.previous!r} -> {self.current!r})"
+
+
+def diff_snapshots(previous, current):
+    """PlaybackChange list between two snapshots (previous may be None)."""
+    fields = (
+        (TRACK_CHANGED, 'track_id'),
+        (PLAY_STATE_CHANGED, 'is_playing'),
+        (CONTEXT_CHANGED, 'context_uri'),
+        (DEVICE_CHANGED, 'device_id'),
+        (VOLUME_CHANGED, 'volume_percent'),
+    )
+    changes = []
+    for kind, name in fields:
+        before = getattr(previous, name) if previous is not None else None
+        after = getattr(current, name)
+        if previous is None or before != after:
+            changes.append(PlaybackChange(kind, before, after))
+    return changes
+
+
+class PollScheduler:
+    """Decides the delay before the next playback poll."""
+
+    def __init__(self):
+        self.mode = 'starting'
+        self._idle_interval = IDLE_MIN_INTERVAL
+        self._burst_until = 0.0
+
+    def command(self, now):
+        """A playback command was sent: poll densely for a moment."""
+        self._burst_until = now + COMMAND_BURST_SECONDS
+        self._idle_interval = IDLE_MIN_INTERVAL
+
+    def observe(self, changes):
+        """Feed the changes of a poll (any change resets the idle back-off)."""
+        if changes:
+            self._idle_interval = IDLE_MIN_INTERVAL
+            # The command took effect; no need to keep polling densely
+            self._burst_until = 0.0
+
+    def suspend(self):
+        self.mode = 'suspended'
+
+    def next_delay(self, snapshot, now):
+        """Seconds to wait before polling again after ``snapshot``."""
+        if now < self._burst_until:
+            self.mode = 'command'
+            return DENSE_INTERVAL
+
+        if snapshot is None or not snapshot.is_playing or snapshot.device_id is None:
+            self.mode = 'idle'
+            delay = self._idle_interval
+            self._idle_interval = min(IDLE_MAX_INTERVAL, delay * 2)
+            return delay
+        self._idle_interval = IDLE_MIN_INTERVAL
+
+        remaining = snapshot.seconds_to_end(now)
+        if remaining is None or remaining < -TRACK_END_GRACE:
+            self.mode = 'playing'
+            return PLAYING_INTERVAL
+        if remaining > TRACK_END_LEAD:
+            # Wake up just in time for the end of the track
+            self.mode = 'playing'
+            return min(PLAYING_INTERVAL, remaining - TRACK_END_LEAD)
+        self.mode = 'track_end'
+        return DENSE_INTERVAL
+
+
+class PlaybackStateService:
+    """Polls Spotify playback once for the whole application."""
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler or PollScheduler()
+        self.spotify_manager = None
+        self.interval = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._wakeup = threading.Event()
+        self._should_run = False
+        self._thread = None
+        self._last_command_at = None
+        self._poll_times = collections.deque()
+        self._change_latencies = {
+            'track_end': collections.deque(maxlen=LATENCY_SAMPLES),
+            'command': collections.deque(maxlen=LATENCY_SAMPLES),
+        }
+        self.polls_by_mode = collections.Counter()
+        self.polls = 0
+        self.errors = 0
+
+    def start(self, spotify_manager):
+        """Start polling for ``spotify_manager`` (no-op if already running)."""
+        self.spotify_manager = spotify_manager
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._should_run = True
+        self._thread = threading.Thread(target=self._poll_loop, name='playback-state', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling (the last snapshot stays readable)."""
+        self._should_run = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self):
+        """Latest PlaybackSnapshot, or None before the first poll."""
+        return self._snapshot
+
+    def progress_ms(self, now=None):
+        """Extrapolated position of the playing track, or None.
+
+        None while paused, with nothing playing, or once the last poll is
+        older than STALE_SECONDS.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.is_playing:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - snapshot.fetched_at > STALE_SECONDS:
+            return None
+        return snapshot.progress_at(now)
+
+    def subscribe(self, listener):
+        """Call ``listener(snapshot, changes)`` after every poll.
+
+        Returns:
+            callable: Removes the listener again
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def request_refresh(self):
+        """Poll now and densely for a moment (call right after a playback command)."""
+        now = time.monotonic()
+        self._last_command_at = now
+        self.scheduler.command(now)
+        self._wakeup.set()
+
+    def update_local(self, **changes):
+        """Apply a change we caused ourselves before the next poll confirms it.
+
+        Args:
+            **changes: PlaybackSnapshot fields, e.g. volume_percent=60
+        """
+        with self._lock:
+            previous = self._snapshot
+            if previous is None:
+                return
+            self._snapshot = previous.replace(**changes)
+
+    def _poll_loop(self):
+        from .spotify_manager import is_auth_failure, is_transient_token_error
+
+        while self._should_run:
+            manager = self.spotify_manager
+            if not manager or manager.needs_reauth or not manager.spotify:
+                # No requests at all until auth is back (checked locally)
+                self.scheduler.suspend()
+                self.interval = None
+                self._sleep(AUTH_WAIT_INTERVAL)
+                continue
+            # A refresh requested while polling triggers another poll at once
+            self._wakeup.clear()
+            try:
+                self.poll()
+            except Exception as e:
+                self.errors += 1
+                if is_auth_failure(e):
+                    manager.mark_auth_failed(e)
+                    continue
+                if is_transient_token_error(e):
+                    self._sleep(1)
+                    continue
+                print(f"⚠️ Playback state poll error: {e}")
+                self._sleep(ERROR_RETRY_INTERVAL)
+                continue
+            self.interval = self.scheduler.next_delay(self._snapshot, time.monotonic())
+            self._sleep(self.interval)
+
+    def _sleep(self, seconds):
+        self._wakeup.wait(seconds)
+
+    def poll(self):
+        """Fetch playback once, publish the snapshot and notify listeners.
+
+        Returns:
+            PlaybackSnapshot: The new snapshot (None if auth failed meanwhile)
+        """
+        mode = self.scheduler.mode
+        playback = self.spotify_manager.api_call('current_playback')
+        now = time.monotonic()
+        self._count_request(mode, now)
+        if self.spotify_manager.needs_reauth:
+            # api_call swallowed an auth failure; nothing to publish
+            return None
+        snapshot = PlaybackSnapshot(playback, now)
+        with self._lock:
+            previous = self._snapshot
+            self._snapshot = snapshot
+            listeners = list(self._listeners)
+        self.polls += 1
+
+        device_registry.observe(snapshot)
+        changes = diff_snapshots(previous, snapshot)
+        self.scheduler.observe(changes)
+        if any(change.kind == TRACK_CHANGED for change in changes):
+            self._record_track_change(previous, snapshot)
+        for listener in listeners:
+            try:
+                listener(snapshot, changes)
+            except Exception as e:
+                print(f"⚠️ Playback listener error: {e}")
+        return snapshot
+
+    def _count_request(self, mode, now):
+        self.polls_by_mode[mode] += 1
+        times = self._poll_times
+        times.append(now)
+        while times and now - times[0] > RATE_WINDOW_SECONDS:
+            times.popleft()
+
+    def _record_track_change(self, previous, snapshot):
+        """Time from the change's cause (command or track end) to seeing it."""
+        if previous is None or not previous.has_track:
+            return
+        command_at = self._last_command_at
+        if command_at is not None and command_at >= previous.fetched_at:
+            cause, since = 'command', command_at
+        else:
+            remaining = previous.seconds_to_end(previous.fetched_at)
+            if remaining is None:
+                return
+            cause, since = 'track_end', previous.fetched_at + remaining
+        latency = snapshot.fetched_at - since
+        if 0 <= latency <= RATE_WINDOW_SECONDS:
+            self._change_latencies[cause].append(latency)
+
+    def get_stats(self):
+        """Poll scheduling, request volume, detection latency and the snapshot."""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        recent = sum(1 for at in list(self._poll_times) if now - at <= RATE_WINDOW_SECONDS)
+        return {
+            'running': self.running,
+            'mode': self.scheduler.mode,
+            'interval_s': round(self.interval, 3) if self.interval is not None else None,
+            'polls': self.polls,
+            'errors': self.errors,
+            'requests_per_minute': round(recent * 60.0 / RATE_WINDOW_SECONDS, 1),
+            'polls_by_mode': dict(self.polls_by_mode),
+            'track_change_latency_ms': {
+                cause: _latency_summary(samples) for cause, samples in self._change_latencies.items()
+            },
+            'age_s': round(now - snapshot.fetched_at, 3) if snapshot else None,
+            'playback': snapshot.to_dict() if snapshot else None,
+        }
+
+
+def _latency_summary(samples):
+    """Count / mean / p50 / p95 / max in ms for latency samples in seconds."""
+    values = sorted(samples)
+    if not values:
+        return {'count': 0}
+    count = len(values)
+    return {
+        'count': count,
+        'mean': round(sum(values) / count * 1000, 1),
+        'p50': round(values[count // 2] * 1000, 1),
+        'p95': round(values[min(count - 1, int(count * 0.95))] * 1000, 1),
+        'max': round(values[-1] * 1000, 1),
+    }
+
+
+# Global playback state shared by every reader
+playback_state = PlaybackStateService()
@@ -11,6 +11,8 @@ from rich.console import Console
 from rich.table import Table
 from rich.text import Text
 
+from ..utils.latency import timed
+
 
 def load_playlist_mappings():
     """Load playlist mappings from configuration file.
@@ -237,6 +239,7 @@ def randomize_animations(animations_dict):
         print(f"Error randomizing animations: {e}")
 
 
+@timed('get_playlist_id_by_name')
 def get_playlist_id_by_name(playlist_name):
     """Get playlist ID by name from the playlists file.
 
@@ -11,6 +11,9 @@ import webbrowser
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 
+from ..utils.latency import latency_tracker, timed
+from .device_registry import ACTIVATION_POLL_INTERVAL, ACTIVATION_TIMEOUT, device_registry
+
 
 class _SuppressTransientSpotipyLogs(logging.Filter):
     """Hide Spotipy's noisy logs for brief token races (controller still works)."""
@@ -183,6 +186,7 @@ class SpotifyManager:
         """
         self.needs_reauth = True
         self.spotify = None
+        device_registry.invalidate()
         if not self._auth_failure_reported:
             self._auth_failure_reported = True
             detail = f" ({exc})" if exc else ""
@@ -396,7 +400,8 @@ class SpotifyManager:
             quiet: If True, suppress non-auth error prints and return None on error
             retry_transient: Retry once on brief 'access token missing' races
         """
-        with self._api_lock:
+        # Timed including the lock wait, when called for a button press
+        with latency_tracker.span(f'api_call:{method_name}'), self._api_lock:
             if self.needs_reauth or not self.spotify:
                 return None
             method = getattr(self.spotify, method_name, None)
@@ -414,6 +419,9 @@ class SpotifyManager:
                         return method(*args, **kwargs)
                     except Exception as e2:
                         e = e2
+                if kwargs.get('device_id'):
+                    # Device gone or not usable: resolve it again next time
+                    device_registry.invalidate(kwargs['device_id'])
                 if self.handle_api_error(e):
                     return None
                 if quiet:
@@ -865,9 +873,45 @@ def _maybe_auto_launch_spotify(_call, devices_payload):
     return devices_payload
 
 
+def _wait_for_device_activation(_call, device_id, timeout=ACTIVATION_TIMEOUT):
+    """Poll devices() until ``device_id`` is active, instead of a fixed sleep.
+
+    Args:
+        _call: Spotify API caller
+        device_id: Device playback was just started on
+        timeout: Seconds to wait at most
+
+    Returns:
+        dict: The active device, or None if it was not confirmed in time
+    """
+    started = time.monotonic()
+    while True:
+        try:
+            devices = _call('devices')
+        except Exception as e:
+            if is_auth_failure(e):
+                raise
+            devices = None
+        for device in (devices or {}).get('devices') or []:
+            if device.get('id') == device_id and device.get('is_active'):
+                device_registry.record_activation(time.monotonic() - started, True)
+                return device
+        if time.monotonic() - started >= timeout:
+            device_registry.record_activation(timeout, False)
+            print("Device did not report active yet; sending the command anyway")
+            return None
+        time.sleep(ACTIVATION_POLL_INTERVAL)
+
+
+@timed('get_active_or_default_device')
 def get_active_or_default_device(spotify, manager=None):
     """Get active device, default device, or first available device.
 
+    The device playback is on is cached in device_registry (refreshed by the
+    playback poller), so a press while something is playing makes no API
+    call. Otherwise devices are listed, and a device that has to be started
+    is polled until it reports active.
+
     Args:
         spotify: Spotify client instance
         manager: Optional SpotifyManager for auth-failure handling
@@ -885,6 +929,10 @@ def get_active_or_default_device(spotify, manager=None):
         print("Spotify not initialized")
         return None
 
+    device_id = device_registry.device_id()
+    if device_id:
+        return device_id
+
     def _call(name, *args, **kwargs):
         if manager is not None:
             return manager.api_call(name, *args, quiet=False, **kwargs)
@@ -904,6 +952,7 @@ def get_active_or_default_device(spotify, manager=None):
         for device in devices['devices']:
             if device['is_active']:
                 device_id = device['id']
+                device_registry.remember(device)
                 print(f"Using active device: {device['name']}")
                 break
 
@@ -914,7 +963,7 @@ def get_active_or_default_device(spotify, manager=None):
                 if default_device_id:
                     print(f"Using default device from .secret")
                     _call('start_playback', device_id=default_device_id)
-                    time.sleep(1)  # Wait for device activation
+                    device_registry.remember(_wait_for_device_activation(_call, default_device_id))
                     device_id = default_device_id
             except Exception as e:
                 if manager and manager.handle_api_error(e):
@@ -927,11 +976,12 @@ def get_active_or_default_device(spotify, manager=None):
             device_id = first_device['id']
             print(f"No active or default device found. Using first available device: {first_device['name']}")
             _call('start_playback', device_id=device_id)
-            time.sleep(2)  # Wait for device activation
+            device_registry.remember(_wait_for_device_activation(_call, device_id))
 
         return device_id
 
     except Exception as e:
+        device_registry.invalidate()
         if manager and manager.handle_api_error(e):
             return None
         if is_auth_failure(e):
@@ -56,7 +56,10 @@ class ConfigManager:
         """Get default audio features configuration."""
         # Off by default: Spotify deprecated audio-features/audio-analysis for
         # most apps (403). Enabling only helps apps that still have access.
+        # "source": "microphone" opts into live audio analysis instead (no
+        # Spotify access needed)
         return {
+            "source": "spotify",
             "enabled": False,
             "auto_start": False,
             "update_interval": 2.0,
@@ -67,7 +70,9 @@ class ConfigManager:
                 "spectrum_visualization": True
             },
             "performance": {
+                # Days a downloaded track analysis stays in the disk cache
                 "cache_duration": 30,
+                "analysis_cache_mb": 64,
                 "api_timeout": 5.0,
                 "max_retries": 3
             },
@@ -83,6 +88,10 @@ class ConfigManager:
         """Check if audio features are enabled."""
         return self.audio_features_config.get("enabled", False)
 
+    def get_audio_source(self) -> str:
+        """Where audio features come from: 'spotify' (default) or 'microphone' (live)."""
+        return self.audio_features_config.get("source", "spotify")
+
     def should_auto_start_analysis(self) -> bool:
         """Check if audio analysis should auto-start."""
         return self.audio_features_config.get("auto_start", False)
@@ -151,6 +160,7 @@ class ConfigManager:
 🎵 **Audio Features Status: {status}**
 
 **Core Settings:**
+- Source: {self.get_audio_source()}
 - Auto-start: {self.should_auto_start_analysis()}
 - Update interval: {self.get_update_interval()}s
 
@@ -164,7 +174,8 @@ class ConfigManager:
 - Spectrum visualization: {self.is_feature_enabled('spectrum_visualization')}
 
 **Performance:**
-- Cache duration: {self.get_performance_setting('cache_duration', 30)}s
+- Cache duration: {self.get_performance_setting('cache_duration', 30)} days
+- Analysis cache size: {self.get_performance_setting('analysis_cache_mb', 64)} MB
 - API timeout: {self.get_performance_setting('api_timeout', 5.0)}s
 - Max retries: {self.get_performance_setting('max_retries', 3)}
 
@@ -181,6 +192,9 @@ class ConfigManager:
         """Default application settings."""
         return {
             "auto_launch_spotify": False,
+            "virtual_launchpad": False,
+            "virtual_launchpad_bytes_per_second": None,
+            "animation_fps": {},
         }
 
     def load_app_settings(self) -> Dict[str, Any]:
@@ -226,6 +240,50 @@ class ConfigManager:
         status = "enabled" if enabled else "disabled"
         print(f"🎧 Auto-launch Spotify {status}")
 
+    def is_virtual_launchpad_enabled(self) -> bool:
+        """Whether to use the in-memory Launchpad instead of MIDI ports.
+
+        LAUNCHPAD_VIRTUAL=1 in the environment overrides the saved setting.
+        """
+        env = os.environ.get("LAUNCHPAD_VIRTUAL")
+        if env is not None:
+            return env.strip().lower() in ("1", "true", "yes", "on")
+        if self.app_settings is None:
+            self.load_app_settings()
+        return bool(self.app_settings.get("virtual_launchpad", False))
+
+    def get_virtual_launchpad_bytes_per_second(self):
+        """Simulated USB-MIDI throughput for the virtual pad (None = unlimited).
+
+        LAUNCHPAD_VIRTUAL_BPS in the environment overrides the saved setting.
+        """
+        value = os.environ.get("LAUNCHPAD_VIRTUAL_BPS")
+        if value is None:
+            if self.app_settings is None:
+                self.load_app_settings()
+            value = self.app_settings.get("virtual_launchpad_bytes_per_second")
+        try:
+            value = float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+        return value if value and value > 0 else None
+
+    def get_animation_target_fps(self, name, default=None):
+        """Target frame rate for an animation (None = follow its own delays).
+
+        "animation_fps" in app settings maps animation names to FPS and
+        overrides ``default``.
+        """
+        if self.app_settings is None:
+            self.load_app_settings()
+        overrides = self.app_settings.get("animation_fps") or {}
+        value = overrides.get(name, default) if isinstance(overrides, dict) else default
+        try:
+            value = float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return default
+        return value if value and value > 0 else None
+
 
 # Global instance
 config_manager = ConfigManager()
@@ -53,6 +53,8 @@ def show_help():
     system_table.add_column("Description", style="white")
 
     system_table.add_row("h", "❓ Show this help screen")
+    system_table.add_row("lat", "⏱️ Button-to-action latency report")
+    system_table.add_row("fps", "🎞️ Animation frame rate / late frames report")
     system_table.add_row("q", "🚪 Quit application")
 
     # Layout tables in columns
@@ -106,6 +108,8 @@ def show_help():
 • [link]http://localhost:5125/devices[/link] - Spotify devices (JSON)
 • [link]http://localhost:5125/auth/reauth[/link] - Re-authenticate Spotify (POST)
 • [link]http://127.0.0.1:5125/callback[/link] - Spotify OAuth welcome / callback page
+• [link]http://localhost:5125/api/latency[/link] - Button latency histograms (JSON)
+• [link]http://localhost:5125/api/frames[/link] - Animation frame pacing stats (JSON)
 
 [yellow]Features:[/yellow]
 • 📱 Simple control panel for basic operations
@@ -155,23 +159,16 @@ def show_quick_status(playlist_manager, animation_controller, spotify_manager):
     if spotify_manager and getattr(spotify_manager, 'needs_reauth', False):
         spotify_status = "🔐 Needs re-auth (type 'auth')"
     elif spotify_manager and spotify_manager.spotify:
-        try:
-            current = spotify_manager.get_current_playback()
-            if current and current['item']:
-                spotify_status = "✅ Connected"
-                track_name = current['item']['name'][:30]
-                if len(current['item']['name']) > 30:
-                    track_name += "..."
-                current_track = track_name
-            else:
-                spotify_status = "⏸️ Not Playing"
-        except Exception as e:
-            from ..services.spotify_manager import is_auth_failure
-            if is_auth_failure(e):
-                spotify_manager.mark_auth_failed(e)
-                spotify_status = "🔐 Needs re-auth (type 'auth')"
-            else:
-                spotify_status = "⚠️ Error"
+        from ..services.playback_state import playback_state
+        snapshot = playback_state.snapshot()
+        if snapshot and snapshot.has_track:
+            spotify_status = "✅ Connected"
+            track_name = snapshot.track['name'][:30]
+            if len(snapshot.track['name']) > 30:
+                track_name += "..."
+            current_track = track_name
+        else:
+            spotify_status = "⏸️ Not Playing"
 
     status_table = Table(title="📊 Quick Status", show_header=True, header_style="bold cyan")
     status_table.add_column("Item", style="yellow", width=20)
@@ -0,0 +1,196 @@
+"""Button-to-action latency tracing.
+
+Every Launchpad press gets a LatencyTrace, opened when the MIDI callback
+queues the message. The dispatcher and the handler worker make it the
+*current* trace for their thread, so instrumented calls further down
+(@timed functions, latency_tracker.span blocks) add spans to it without
+the trace being passed around. Span durations go straight into per-button-
+class ring buffers that can be summarized as histograms from the CLI
+('lat') or GET /api/latency.
+"""
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+# Samples kept per (button class, span)
+RING_SIZE = 512
+# Recent traces kept for inspection
+RECENT_TRACES = 20
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyTrace:
+    """Timeline of one button press, relative to when it was received."""
+
+    def __init__(self, tracker, button_class, x, y, received):
+        self.tracker = tracker
+        self.button_class = button_class
+        self.x = x
+        self.y = y
+        self.received = received  # time.monotonic() in the MIDI callback
+        self.spans = []  # (name, start offset s, duration s)
+        self.finished = False
+
+    def record(self, name, start, duration):
+        """Add a span that started at ``start`` (monotonic) and took ``duration`` s."""
+        self.spans.append((name, start - self.received, duration))
+        self.tracker._add_sample(self.button_class, name, duration)
+
+    def mark(self, name, now=None):
+        """Add a milestone measured from when the press was received."""
+        now = time.monotonic() if now is None else now
+        self.record(name, self.received, now - self.received)
+
+    def finish(self, now=None):
+        """Record the end-to-end handler time (once)."""
+        if self.finished:
+            return
+        self.finished = True
+        self.mark('total', now)
+
+    def to_dict(self):
+        return {
+            'class': self.button_class,
+            'button': [self.x, self.y],
+            'spans': [
+                {'name': name, 'start_ms': round(start * 1000, 3), 'ms': round(duration * 1000, 3)}
+                for name, start, duration in list(self.spans)
+            ],
+        }
+
+
+class LatencyTracker:
+    """In-process store of latency samples, split by button class."""
+
+    def __init__(self, ring_size=RING_SIZE):
+        self._ring_size = ring_size
+        self._lock = threading.Lock()
+        self._samples = {}  # {(button_class, span): deque of seconds}
+        self._recent = collections.deque(maxlen=RECENT_TRACES)
+        self._local = threading.local()
+
+    def begin(self, button_class, x, y, received):
+        """Open a trace for a press received at ``received`` (monotonic)."""
+        trace = LatencyTrace(self, button_class, x, y, received)
+        with self._lock:
+            self._recent.append(trace)
+        return trace
+
+    def current(self):
+        """The trace active on this thread, or None."""
+        return getattr(self._local, 'trace', None)
+
+    def activate(self, trace):
+        """Make ``trace`` current on this thread (returns the previous one)."""
+        previous = self.current()
+        self._local.trace = trace
+        return previous
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Time a block as a span of the current trace (no-op without one)."""
+        trace = self.current()
+        if trace is None:
+            yield
+            return
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            trace.record(name, start, time.monotonic() - start)
+
+    def reset(self):
+        """Drop all samples and recent traces."""
+        with self._lock:
+            self._samples.clear()
+            self._recent.clear()
+
+    def summary(self):
+        """Percentiles and histogram per button class and span.
+
+        Returns:
+            dict: {button_class: {span: {count, p50_ms, p90_ms, p99_ms,
+            max_ms, histogram}}} plus 'recent' (latest traces) and 'buckets_ms'
+        """
+        with self._lock:
+            samples = {key: sorted(ring) for key, ring in self._samples.items()}
+            recent = list(self._recent)
+
+        classes = {}
+        for (button_class, name), values in sorted(samples.items()):
+            classes.setdefault(button_class, {})[name] = _describe(values)
+        return {
+            'classes': classes,
+            'buckets_ms': list(BUCKETS_MS),
+            'recent': [trace.to_dict() for trace in reversed(recent)],
+        }
+
+    def _add_sample(self, button_class, name, duration):
+        with self._lock:
+            ring = self._samples.get((button_class, name))
+            if ring is None:
+                ring = self._samples[(button_class, name)] = collections.deque(maxlen=self._ring_size)
+            ring.append(duration)
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def _describe(values):
+    histogram = [0] * (len(BUCKETS_MS) + 1)
+    for value in values:
+        ms = value * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                histogram[i] += 1
+                break
+        else:
+            histogram[-1] += 1
+    return {
+        'count': len(values),
+        'p50_ms': round(_percentile(values, 0.5) * 1000, 3),
+        'p90_ms': round(_percentile(values, 0.9) * 1000, 3),
+        'p99_ms': round(_percentile(values, 0.99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3),
+        'histogram': histogram,
+    }
+
+
+def timed(name):
+    """Decorator: record calls as a span of the current trace."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with latency_tracker.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def print_latency_report(tracker=None):
+    """Print the latency summary as a table (CLI 'lat' command)."""
+    summary = (tracker or latency_tracker).summary()
+    classes = summary['classes']
+    if not classes:
+        print("No button latency samples yet — press a few pads first.")
+        return
+
+    print("\n=== BUTTON LATENCY (ms) ===")
+    for button_class, spans in classes.items():
+        print(f"\n[{button_class}]")
+        print(f"  {'span':<34} {'n':>5} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+        for name, stats in sorted(spans.items(), key=lambda item: item[1]['p50_ms']):
+            print(
+                f"  {name:<34} {stats['count']:>5} {stats['p50_ms']:>9.1f} "
+                f"{stats['p90_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+            )
+    print("===========================")
+
+
+# Global tracker instance
+latency_tracker = LatencyTracker()